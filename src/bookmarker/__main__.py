@@ -1,3 +1,17 @@
-from .cli.main import app
+import sys
 
-app()
+
+def main() -> None:
+    from .cli.client import forward
+
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from .cli.main import main as run_cli
+
+    run_cli()
+
+
+if __name__ == "__main__":
+    main()
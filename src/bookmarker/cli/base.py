@@ -1,22 +1,29 @@
-from typing import Annotated
+import shlex
+from itertools import islice
+from typing import Annotated, Iterable
 
 import typer
 from rich.table import Table
 
+from ..core.enums import ArtifactTypeEnum
 from ..core.exceptions import (
     ArtifactNotFoundError,
+    InvalidCursorError,
+    InvalidTagExpressionError,
 )
-from ..services.base import (
-    ArtifactTypeEnum,
-    get_or_create_artifact,
-    update_tags,
-)
+from ..core.pagination import SortKey, cursor_for
 from .fetchers import run_fetch_logic
-from .helpers import generate_panel, get_config
+from .helpers import AppConfig, complete_tag, generate_panel, get_config
 from .summarizers import run_summarize_logic
 
 app = typer.Typer()
 
+# 0 shows every match, as list and search did before pagination
+DEFAULT_PAGE_SIZE = 0
+TAG_FILTER_HELP = (
+    "Filter by tag name or expression, e.g. 'python & (perf | db) & !draft'"
+)
+
 
 @app.command(name="add")
 def add_artifact(
@@ -29,6 +36,8 @@ def add_artifact(
     auto: Annotated[bool, typer.Option(help="Auto fetch and summarize content")] = True,
 ):
     """Add an artifact with a title and URL."""
+    from ..services.base import get_or_create_artifact
+
     config = get_config(ctx)
     artifact = get_or_create_artifact(
         config.repo, title=title, url=url, artifact_type=artifact_type
@@ -59,11 +68,57 @@ def delete_artifact(
         raise typer.Exit(code=1)
 
 
+def _take_page[T](rows: Iterable[T], limit: int) -> tuple[list[T], bool]:
+    """Take up to `limit` rows (all if 0) and report whether more rows follow."""
+    if limit <= 0:
+        return list(rows), False
+    page = list(islice(rows, limit + 1))
+    return page[:limit], len(page) > limit
+
+
+def _print_next_page_hint(
+    config: AppConfig, command: str, sort: SortKey, last_row: object
+) -> None:
+    cursor = cursor_for(sort, last_row)
+    config.console.print(
+        f"More results available. Run `{command} --sort={sort} --after {cursor}`.",
+        style="dim",
+        soft_wrap=True,
+    )
+
+
 @app.command(name="list")
-def list_artifacts(ctx: typer.Context):
+def list_artifacts(
+    ctx: typer.Context,
+    tag: Annotated[
+        str | None, typer.Option(help=TAG_FILTER_HELP, autocompletion=complete_tag)
+    ] = None,
+    limit: Annotated[
+        int, typer.Option(help="Maximum number of artifacts to show (0 for all)")
+    ] = DEFAULT_PAGE_SIZE,
+    after: Annotated[
+        str | None, typer.Option(help="Cursor printed at the end of a previous page")
+    ] = None,
+    sort: Annotated[
+        SortKey, typer.Option(help="Sort order (a leading - sorts descending)")
+    ] = SortKey.CREATED,
+):
     """List all artifacts."""
     config = get_config(ctx)
-    artifacts = config.repo.list()
+    if sort is SortKey.RANK:
+        config.error_console.print("Sort by rank is only available for search.")
+        raise typer.Exit(code=1)
+    try:
+        artifacts, has_more = _take_page(
+            config.repo.iter_list_items(tag, sort=sort, after=after), limit
+        )
+    except InvalidCursorError:
+        config.error_console.print(f"Invalid cursor: {after}")
+        raise typer.Exit(code=1)
+    except InvalidTagExpressionError as e:
+        config.error_console.print(str(e))
+        raise typer.Exit(code=1)
+
     if artifacts:
         table = Table(title="Artifacts")
         table.add_column("ID")
@@ -77,11 +132,16 @@ def list_artifacts(ctx: typer.Context):
                 str(artifact.id),
                 artifact.title,
                 artifact.artifact_type.value,
-                ":white_heavy_check_mark:" if artifact.content_raw else ":x:",
-                ":white_heavy_check_mark:" if artifact.content_summary else ":x:",
+                ":white_heavy_check_mark:" if artifact.is_fetched else ":x:",
+                ":white_heavy_check_mark:" if artifact.is_summarized else ":x:",
                 artifact.url,
             )
         config.console.print(table)
+        if has_more:
+            command = "bookmarker list"
+            if tag is not None:
+                command += f" --tag {shlex.quote(tag)}"
+            _print_next_page_hint(config, command, sort, artifacts[-1])
     else:
         config.error_console.print("No artifacts found.")
 
@@ -107,19 +167,74 @@ def search(
     ctx: typer.Context,
     term: Annotated[
         str,
-        typer.Argument(help="Text to search title and URL of artifacts"),
+        typer.Argument(help="Text to search title, URL and content of artifacts"),
     ],
-    tag: Annotated[str | None, typer.Option(help="Filter results by tag name")] = None,
+    tag: Annotated[
+        str | None, typer.Option(help=TAG_FILTER_HELP, autocompletion=complete_tag)
+    ] = None,
+    limit: Annotated[
+        int, typer.Option(help="Maximum number of artifacts to show (0 for all)")
+    ] = DEFAULT_PAGE_SIZE,
+    after: Annotated[
+        str | None, typer.Option(help="Cursor printed at the end of a previous page")
+    ] = None,
+    sort: Annotated[
+        SortKey, typer.Option(help="Sort order (a leading - sorts descending)")
+    ] = SortKey.RANK,
+    fuzzy: Annotated[
+        bool,
+        typer.Option(
+            "--fuzzy", help="Tolerate typos; match words of titles, tags and summaries"
+        ),
+    ] = False,
 ):
-    """Search for artifacts by title, URL, and tag"""
+    """Search for artifacts by title, URL, content, and tag"""
     config = get_config(ctx)
-    results = config.repo.search(term, tag_name=tag)
+    if fuzzy and (after is not None or sort is not SortKey.RANK):
+        config.error_console.print(
+            "Fuzzy results are ranked by closeness; --after and --sort do not apply."
+        )
+        raise typer.Exit(code=1)
+    try:
+        if fuzzy:
+            results, has_more = _take_page(
+                config.repo.search_fuzzy(
+                    term, tag_name=tag, limit=limit + 1 if limit > 0 else None
+                ),
+                limit,
+            )
+        else:
+            results, has_more = _take_page(
+                config.repo.iter_search(term, tag_name=tag, sort=sort, after=after),
+                limit,
+            )
+    except InvalidCursorError:
+        config.error_console.print(f"Invalid cursor: {after}")
+        raise typer.Exit(code=1)
+    except InvalidTagExpressionError as e:
+        config.error_console.print(str(e))
+        raise typer.Exit(code=1)
+
     if results:
-        msg = f"Found {len(results):,} artifact{'s' if len(results) != 1 else ''}."
+        plural = "s" if len(results) != 1 else ""
+        if has_more:
+            msg = f"Showing {len(results):,} artifact{plural}; more match."
+        else:
+            msg = f"Found {len(results):,} artifact{plural}."
         config.console.print(msg)
-        for artifact in results:
-            panel = generate_panel(artifact)
+        for hit in results:
+            panel = generate_panel(hit.artifact, snippet=hit.snippet)
             config.console.print(panel)
+        if has_more and fuzzy:
+            config.console.print(
+                f"Showing the {limit} closest matches; raise --limit to see more.",
+                style="dim",
+            )
+        elif has_more:
+            command = f"bookmarker search {shlex.quote(term)}"
+            if tag is not None:
+                command += f" --tag {shlex.quote(tag)}"
+            _print_next_page_hint(config, command, sort, results[-1])
     else:
         config.error_console.print("No artifacts found matching the search criteria.")
 
@@ -134,6 +249,8 @@ def tag_artifact(
     ] = False,
 ):
     """Add or remove tags from an artifact."""
+    from ..services.base import update_tags
+
     config = get_config(ctx)
     try:
         artifact = update_tags(config.repo, artifact_id, tags, remove=remove)
@@ -145,3 +262,72 @@ def tag_artifact(
     except ArtifactNotFoundError:
         config.error_console.print(f"Artifact with ID {artifact_id} not found.")
         raise typer.Exit(code=1)
+
+
+@app.command(name="tags")
+def list_tags(
+    ctx: typer.Context,
+    prefix: Annotated[
+        str | None, typer.Argument(help="Only list tags starting with this text")
+    ] = None,
+):
+    """List tags with the number of artifacts carrying each."""
+    config = get_config(ctx)
+    tags = config.repo.list_tags(prefix)
+    if not tags:
+        config.error_console.print("No tags found.")
+        return
+
+    table = Table(title="Tags")
+    table.add_column("Tag")
+    table.add_column("Artifacts", justify="right")
+    for tag in tags:
+        table.add_row(tag.name, f"{tag.artifact_count:,}")
+    config.console.print(table)
+
+
+@app.command(name="tag-many")
+def tag_artifacts_many(
+    ctx: typer.Context,
+    artifact_ids: Annotated[
+        list[int] | None,
+        typer.Argument(help="The IDs of artifacts to update (e.g. `1 2 3`)"),
+    ] = None,
+    add: Annotated[
+        list[str] | None, typer.Option("--add", help="Tag to add (repeatable)")
+    ] = None,
+    remove: Annotated[
+        list[str] | None, typer.Option("--remove", help="Tag to remove (repeatable)")
+    ] = None,
+    search: Annotated[
+        str | None,
+        typer.Option(help="Only update artifacts matching this search text"),
+    ] = None,
+    tag: Annotated[
+        str | None,
+        typer.Option(
+            help="Only update artifacts matching this tag expression",
+            autocompletion=complete_tag,
+        ),
+    ] = None,
+):
+    """Add or remove tags on many artifacts at once, by ID or search filter."""
+    from ..services.base import update_tags_many
+
+    config = get_config(ctx)
+    if not add and not remove:
+        config.error_console.print("Pass at least one --add or --remove tag.")
+        raise typer.Exit(code=1)
+    try:
+        count = update_tags_many(
+            config.repo,
+            artifact_ids or None,
+            term=search,
+            tag_name=tag,
+            add=add,
+            remove=remove,
+        )
+    except (ValueError, InvalidTagExpressionError) as e:
+        config.error_console.print(str(e))
+        raise typer.Exit(code=1)
+    config.console.print(f"[green]Updated tags on {count} artifacts.[/]")
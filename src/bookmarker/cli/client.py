@@ -0,0 +1,105 @@
+"""Thin client forwarding commands to a running `bookmarker serve` daemon.
+
+Only the standard library is imported here, so a forwarded command costs an
+interpreter start and a socket round trip, not the CLI's import graph.
+"""
+
+import json
+import os
+import shutil
+import socket
+import sys
+from pathlib import Path
+from typing import Sequence
+
+# commands answered by the daemon; the rest always run in-process
+FORWARDED_COMMANDS = frozenset(
+    {
+        "add",
+        "delete",
+        "list",
+        "show",
+        "search",
+        "tag",
+        "tag-many",
+        "tags",
+        "fetch",
+        "fetch-many",
+        "summarize",
+        "summarize-many",
+    }
+)
+
+# seconds to wait for the daemon to accept a connection
+CONNECT_TIMEOUT = 1.0
+# seconds to wait for a forwarded command's output; $BOOKMARKER_DAEMON_TIMEOUT
+DEFAULT_RESPONSE_TIMEOUT = 300.0
+
+
+def get_socket_path() -> Path:
+    """Socket of the daemon: $BOOKMARKER_SOCKET, else one per BOOKMARKER_ENV."""
+    if path := os.getenv("BOOKMARKER_SOCKET"):
+        return Path(path)
+    env = os.getenv("BOOKMARKER_ENV", "prod")
+    name = "daemon.sock" if env == "prod" else f"daemon-{env}.sock"
+    return Path.home() / ".bookmarker" / name
+
+
+def get_response_timeout() -> float:
+    return float(os.getenv("BOOKMARKER_DAEMON_TIMEOUT", DEFAULT_RESPONSE_TIMEOUT))
+
+
+def daemon_running(socket_path: Path) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(CONNECT_TIMEOUT)
+            client.connect(str(socket_path))
+    except OSError:
+        return False
+    return True
+
+
+def forward(argv: Sequence[str]) -> int | None:
+    """Run a command on the daemon and print its output.
+
+    Returns:
+        int | None: the command's exit code, or None when it should run
+            in-process because it is not forwarded or no daemon is listening
+    """
+    if (
+        not argv
+        or argv[0] not in FORWARDED_COMMANDS
+        or "_BOOKMARKER_COMPLETE" in os.environ
+    ):
+        return None
+    request = {
+        "argv": list(argv),
+        "columns": shutil.get_terminal_size().columns,
+        "color": sys.stdout.isatty(),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CONNECT_TIMEOUT)
+        try:
+            client.connect(str(get_socket_path()))
+        except OSError:
+            return None
+        client.settimeout(get_response_timeout())
+        try:
+            client.sendall(json.dumps(request).encode() + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline()
+        except TimeoutError:
+            print(
+                "The bookmarker daemon did not answer in time; "
+                "set BOOKMARKER_DAEMON_TIMEOUT to wait longer.",
+                file=sys.stderr,
+            )
+            return 1
+    if not line:
+        # the command may have run already, so it is not retried in-process
+        print("The bookmarker daemon closed the connection.", file=sys.stderr)
+        return 1
+    response = json.loads(line)
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
@@ -0,0 +1,155 @@
+import io
+import json
+import logging
+import os
+import signal
+import socketserver
+import sys
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator
+
+import click
+import typer
+
+from .client import FORWARDED_COMMANDS, daemon_running, get_socket_path
+from .helpers import AppConfig, get_config
+
+logger = logging.getLogger(__name__)
+
+app = typer.Typer()
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    server: "CommandServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:  # a liveness probe from `daemon_running`
+            return
+        request = json.loads(line)
+        response = self.server.run(request)
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class CommandServer(socketserver.UnixStreamServer):
+    """Runs forwarded commands one at a time, sharing one warm AppConfig.
+
+    The repository's engine and the summarizer's HTTP client are created once;
+    each command gets its own consoles, captured and sent back to the client.
+    """
+
+    def __init__(self, socket_path: Path, config: AppConfig) -> None:
+        self.config = config
+        # created owner-only: a chmod after bind would leave a window for others
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(str(socket_path), _CommandHandler)
+        finally:
+            os.umask(old_umask)
+
+    def run(self, request: dict[str, Any]) -> dict[str, Any]:
+        from .main import app as main_app
+
+        argv = request.get("argv") or []
+        if argv[:1] and argv[0] not in FORWARDED_COMMANDS:
+            return {
+                "exit_code": 2,
+                "stdout": "",
+                "stderr": f"Command '{argv[0]}' is not served by the daemon.\n",
+            }
+        env = {
+            "COLUMNS": str(request.get("columns", 80)),
+            "FORCE_COLOR": "1" if request.get("color") else None,
+        }
+        with _captured_io(env) as (stdout, stderr):
+            try:
+                result = main_app(
+                    argv,
+                    prog_name="bookmarker",
+                    obj=self.config,
+                    standalone_mode=False,
+                )
+                exit_code = result if isinstance(result, int) else 0
+            except click.ClickException as e:
+                e.show()
+                exit_code = e.exit_code
+            except click.Abort:
+                print("Aborted!", file=sys.stderr)
+                exit_code = 1
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                traceback.print_exception(e)
+                exit_code = 1
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+
+@contextmanager
+def _captured_io(
+    env: dict[str, str | None],
+) -> Generator[tuple[io.StringIO, io.StringIO]]:
+    """Capture one command's output, with the client's terminal settings.
+
+    Commands run one at a time, so swapping the process-wide streams and
+    environment is safe. stdin is empty: prompts abort instead of blocking.
+    """
+    saved_streams = sys.stdin, sys.stdout, sys.stderr
+    saved_env = {name: os.environ.get(name) for name in env}
+    stdout, stderr = io.StringIO(), io.StringIO()
+    sys.stdin, sys.stdout, sys.stderr = io.StringIO(), stdout, stderr
+    for name, value in env.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    try:
+        yield stdout, stderr
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved_streams
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@app.command(name="serve")
+def serve(ctx: typer.Context):
+    """Run a daemon that answers other commands with warm connections."""
+    config = get_config(ctx)
+    socket_path = get_socket_path()
+    if daemon_running(socket_path):
+        config.error_console.print(f"A daemon is already listening on {socket_path}.")
+        raise typer.Exit(code=1)
+    socket_path.unlink(missing_ok=True)
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    config.repo  # open the engine and check the schema before the first command
+    from ..core.summarizers import get_summarizer
+    from ..services import fetchers  # noqa: F401
+
+    try:
+        config.summarizer = get_summarizer()
+    except Exception:
+        logger.exception("Summarizer unavailable; it will be created per command.")
+
+    with CommandServer(socket_path, config) as server:
+        # pay the remaining imports and first queries before clients connect
+        server.run({"argv": ["list", "--limit", "1"]})
+        config.console.print(
+            f"[green]Serving bookmarker on {socket_path}.[/] Press Ctrl+C to stop."
+        )
+        # stop cleanly, removing the socket, on SIGTERM as on Ctrl+C
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
@@ -0,0 +1,65 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from ..core.exceptions import MissingDependencyError
+from ..core.exporters import ExportFormat, write_jsonl, write_parquet
+from .helpers import get_config
+
+app = typer.Typer()
+
+SINCE_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]
+
+
+@app.command(name="export")
+def export_artifacts(
+    ctx: typer.Context,
+    output: Annotated[
+        Path,
+        typer.Argument(help="File to write, or - for stdout (JSONL only)"),
+    ],
+    export_format: Annotated[
+        ExportFormat,
+        typer.Option("--format", help="Output format (parquet requires pyarrow)"),
+    ] = ExportFormat.JSONL,
+    since: Annotated[
+        datetime | None,
+        typer.Option(
+            help="Only export artifacts updated at or after this UTC time",
+            formats=SINCE_FORMATS,
+        ),
+    ] = None,
+    content: Annotated[
+        bool, typer.Option(help="Include summaries and raw content")
+    ] = True,
+):
+    """Export artifacts to JSONL or Parquet."""
+    config = get_config(ctx)
+    to_stdout = str(output) == "-"
+    if to_stdout and export_format is not ExportFormat.JSONL:
+        config.error_console.print("Only JSONL can be written to stdout.")
+        raise typer.Exit(code=1)
+
+    rows = config.repo.iter_export_rows(since=since, include_content=content)
+    try:
+        if export_format is ExportFormat.PARQUET:
+            result = write_parquet(rows, output, include_content=content)
+        elif to_stdout:
+            result = write_jsonl(rows, sys.stdout)
+        else:
+            with output.open("w", encoding="utf-8") as file:
+                result = write_jsonl(rows, file)
+    except MissingDependencyError as e:
+        config.error_console.print(str(e))
+        raise typer.Exit(code=1)
+
+    if not to_stdout:
+        config.console.print(
+            f"[green]Exported {result.count} artifacts to {output}.[/]"
+        )
+        if result.last_updated_at is not None:
+            next_since = result.last_updated_at.strftime(SINCE_FORMATS[-1])
+            config.console.print(f"Export newer changes with `--since {next_since}`.")
@@ -6,6 +6,7 @@ from rich.progress import Progress, SpinnerColumn, TextColumn
 from ..core.exceptions import (
     ArtifactNotFoundError,
     ContentFetchError,
+    HtmlCacheDisabledError,
 )
 from .helpers import get_config
 
@@ -23,10 +24,15 @@ def run_fetch_logic(ctx: typer.Context, artifact_id: int) -> None:
             transient=True,
         ) as progress:
             progress.add_task(description="Fetching...", total=None)
-            fetch_and_store_content(artifact_id, repo=config.repo)
-        config.console.print(
-            f"[green]Content fetched for artifact ID {artifact_id}.[/]"
-        )
+            artifact = fetch_and_store_content(artifact_id, repo=config.repo)
+        if artifact is None:
+            config.console.print(
+                f"[green]Content unchanged for artifact ID {artifact_id}.[/]"
+            )
+        else:
+            config.console.print(
+                f"[green]Content fetched for artifact ID {artifact_id}.[/]"
+            )
     except ArtifactNotFoundError:
         config.error_console.print(f"Artifact with ID {artifact_id} not found.")
         raise typer.Exit(code=1)
@@ -61,10 +67,9 @@ def fetch_content_many(
     ],
 ):
     """Fetch multiple artifacts concurrently."""
-    from ..services.fetchers import fetch_and_store_content_many
+    from ..services.fetchers import fetch_and_store_content_pooled
 
     config = get_config(ctx)
-    bulk_fetch_timed_out = False
     with Progress(
         SpinnerColumn(),
         TextColumn("{task.description}"),
@@ -74,25 +79,66 @@ def fetch_content_many(
             "Fetching multiple artifacts...", total=len(artifact_ids)
         )
         try:
-            results = fetch_and_store_content_many(artifact_ids, repo=config.repo)
-        except TimeoutError:
-            bulk_fetch_timed_out = True
+            # each download has its own deadline; those that miss it are
+            # reported as fetch errors rather than failing the batch
+            results = fetch_and_store_content_pooled(artifact_ids, repo=config.repo)
         finally:
             progress.update(task, completed=len(artifact_ids))
 
-    # throw console error outside progress context manager for cleaner output
-    if bulk_fetch_timed_out:
+    for aid, status in results.items():
+        if status == "ok":
+            config.console.print(f"[green]Fetched artifact {aid} successfully.[/]")
+        elif status == "unchanged":
+            config.console.print(f"[green]Artifact {aid} is unchanged.[/]")
+        elif status == "not_found":
+            config.error_console.print(f"[red]Artifact {aid} not found.[/]")
+        else:
+            config.error_console.print(
+                f"[red]Failed to fetch artifact {aid}: {status}[/]"
+            )
+
+
+@app.command(name="reparse")
+def reparse_content_many(
+    ctx: typer.Context,
+    artifact_ids: Annotated[
+        list[int] | None,
+        typer.Argument(help="The IDs of the artifacts to reparse; all if omitted"),
+    ] = None,
+):
+    """Extract content again from cached pages, without downloading them."""
+    from ..services.fetchers import reparse_and_store_content_many
+
+    config = get_config(ctx)
+    try:
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("{task.description}"),
+            transient=True,
+        ) as progress:
+            progress.add_task(description="Reparsing cached pages...", total=None)
+            results = reparse_and_store_content_many(artifact_ids, repo=config.repo)
+    except HtmlCacheDisabledError:
         config.error_console.print(
-            "[red]Exceeded time limit for bulk fetching. Try fetching fewer artifacts.[/]"
+            "[red]The HTML cache is disabled. Set HTML_CACHE_SIZE_MB to enable it.[/]"
         )
         raise typer.Exit(code=1)
 
+    if not results:
+        config.console.print("No cached pages to reparse.")
     for aid, status in results.items():
         if status == "ok":
-            config.console.print(f"[green]Fetched artifact {aid} successfully.[/]")
+            config.console.print(f"[green]Reparsed artifact {aid}.[/]")
+        elif status == "unchanged":
+            config.console.print(f"[green]Artifact {aid} is unchanged.[/]")
         elif status == "not_found":
             config.error_console.print(f"[red]Artifact {aid} not found.[/]")
+        elif status == "not_cached":
+            config.error_console.print(
+                f"[red]No cached page for artifact {aid}. "
+                f"Run `bookmarker fetch {aid}` first.[/]"
+            )
         else:
             config.error_console.print(
-                f"[red]Failed to fetch artifact {aid}: {status}[/]"
+                f"[red]Failed to reparse artifact {aid}: {status}[/]"
             )
@@ -1,4 +1,7 @@
-from typing import NamedTuple
+import logging
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console, Group
@@ -7,45 +10,90 @@ from rich.padding import Padding
 from rich.panel import Panel
 from rich.text import Text
 
-from ..core.database import DatabaseRepository, get_repo
-from ..core.models import Artifact
+from ..core.exceptions import SchemaMigrationError
 
+if TYPE_CHECKING:
+    from ..core.database import DatabaseRepository
+    from ..core.models import Artifact
+    from ..core.summarizers import ContentSummarizer
 
-class AppConfig(NamedTuple):
-    repo: DatabaseRepository | None
+logger = logging.getLogger(__name__)
+
+
+def get_repo() -> "DatabaseRepository":
+    # imported on use: SQLModel and SQLAlchemy dominate CLI startup time
+    from ..core.database import get_repo
+
+    return get_repo()
+
+
+@dataclass
+class AppConfig:
     console: Console
     error_console: Console
+    # kept across commands by `bookmarker serve`; otherwise built per command
+    summarizer: "ContentSummarizer | None" = None
 
+    @cached_property
+    def repo(self) -> "DatabaseRepository":
+        """Repository for the configured database, opened on first use.
 
-def app_callback(ctx: typer.Context) -> None:
-    console = Console()
-    error_console = Console(stderr=True, style="bold red")
-
-    if ctx.invoked_subcommand == "init":
-        repo = None
-    else:
+        Commands that never touch it, like `init` or `--help`, build no engine.
+        """
         try:
             repo = get_repo()
-            repo.create_db_and_tables()
         except RuntimeError as e:
-            error_console.print(e)
-            console.print("Run [green]`bookmarker init`[/] to set up config file.")
+            self.error_console.print(e)
+            self.console.print("Run [green]`bookmarker init`[/] to set up config file.")
             raise typer.Exit(1)
+        try:
+            repo.ensure_schema()
+        except SchemaMigrationError as e:
+            self.error_console.print(escape(str(e)))
+            self.console.print(
+                "If a newer release of bookmarker wrote this database, upgrade "
+                "bookmarker; otherwise restore the database from a backup."
+            )
+            raise typer.Exit(1)
+        return repo
 
-    app_config = AppConfig(
-        repo=repo,
-        console=console,
-        error_console=error_console,
+
+def app_callback(ctx: typer.Context) -> None:
+    config = AppConfig(
+        console=Console(),
+        error_console=Console(stderr=True, style="bold red"),
     )
+    if isinstance(ctx.obj, AppConfig):
+        # a command forwarded to `bookmarker serve` reuses its warm clients
+        config.repo = ctx.obj.repo
+        config.summarizer = ctx.obj.summarizer
+    ctx.obj = config
+    ctx.call_on_close(lambda: _log_cache_stats(config))
 
-    ctx.obj = app_config
+
+def _log_cache_stats(config: AppConfig) -> None:
+    # only commands that opened the repository have anything to report
+    repo = config.__dict__.get("repo")
+    if repo is not None and (cache_stats := repo.cache_stats) is not None:
+        logger.debug(f"Artifact cache: {cache_stats}")
 
 
 def get_config(ctx: typer.Context) -> AppConfig:
     return ctx.obj
 
 
-def generate_panel(artifact: Artifact) -> Panel:
+def complete_tag(incomplete: str) -> list[tuple[str, str]]:
+    """Shell completion for the last tag name of a `--tag` expression."""
+    head_length = max(incomplete.rfind(char) for char in "&|!() ") + 1
+    head, prefix = incomplete[:head_length], incomplete[head_length:]
+    try:
+        tags = get_repo().list_tags(prefix)
+    except RuntimeError:
+        return []
+    return [(f"{head}{tag.name}", f"{tag.artifact_count} artifacts") for tag in tags]
+
+
+def generate_panel(artifact: "Artifact", snippet: str | None = None) -> Panel:
     """Generate a rich panel for displaying a artifact."""
 
     title_text = Text(artifact.title, style="bold")
@@ -61,7 +109,7 @@ def generate_panel(artifact: Artifact) -> Panel:
         )
 
     if artifact.content_summary is None:
-        if artifact.content_raw is None:
+        if artifact.content_hash is None:
             summary = (
                 "Content has not been fetched yet.\n"
                 f"Run `bookmarker fetch {artifact.id}`.\n"
@@ -75,6 +123,11 @@ def generate_panel(artifact: Artifact) -> Panel:
     summary_padding = Padding(summary_text, (1, 2))
     body_elements.append(summary_padding)
 
+    if snippet is not None:
+        snippet_text = Text(snippet, style="italic dim", justify="left")
+        snippet_text.highlight_regex(r"\*\*[^*]+\*\*", style="bold yellow")
+        body_elements.append(Padding(snippet_text, (0, 2, 1, 2)))
+
     body = Group(*body_elements)
 
     panel = Panel.fit(
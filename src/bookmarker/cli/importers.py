@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from ..core.exceptions import InvalidImportError
+from ..core.importers import ImportFormat, detect_format, iter_import_records
+from .helpers import get_config
+
+app = typer.Typer()
+
+
+@app.command(name="import")
+def import_bookmarks(
+    ctx: typer.Context,
+    path: Annotated[
+        Path,
+        typer.Argument(
+            help="Bookmark HTML export, CSV or JSONL file",
+            exists=True,
+            dir_okay=False,
+            readable=True,
+        ),
+    ],
+    import_format: Annotated[
+        ImportFormat | None,
+        typer.Option(
+            "--format", help="File format (detected from the file suffix if omitted)"
+        ),
+    ] = None,
+):
+    """Import bookmarks from a browser, Pocket, CSV or JSONL export."""
+    config = get_config(ctx)
+    try:
+        if import_format is None:
+            import_format = detect_format(path)
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("{task.description}"),
+            transient=True,
+        ) as progress:
+            progress.add_task(description="Importing...", total=None)
+            result = config.repo.bulk_add(iter_import_records(path, import_format))
+    except (InvalidImportError, UnicodeDecodeError) as e:
+        config.error_console.print(f"Could not import '{path.name}': {e}")
+        raise typer.Exit(code=1)
+
+    config.console.print(f"[green]Imported {result.added} artifacts.[/]")
+    if result.skipped:
+        config.console.print(f"Skipped {result.skipped} URLs that already exist.")
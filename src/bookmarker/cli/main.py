@@ -2,19 +2,28 @@ import typer
 
 from ..core.config import set_up_logging
 from .base import app as base_app
+from .daemon import app as daemon_app
+from .exporters import app as exporters_app
 from .fetchers import app as fetchers_app
 from .helpers import app_callback
+from .importers import app as importers_app
 from .init_config import app as init_config_app
 from .summarizers import app as summarizers_app
 
-try:
-    set_up_logging()
-except FileNotFoundError as e:
-    print(str(e))
-
 app = typer.Typer(callback=app_callback)
 
 app.add_typer(init_config_app)
 app.add_typer(base_app)
 app.add_typer(fetchers_app)
 app.add_typer(summarizers_app)
+app.add_typer(importers_app)
+app.add_typer(exporters_app)
+app.add_typer(daemon_app)
+
+
+def main() -> None:
+    try:
+        set_up_logging()
+    except FileNotFoundError as e:
+        print(str(e))
+    app()
@@ -29,7 +29,10 @@ def run_summarize_logic(
         ) as progress:
             progress.add_task(description="Summarizing...", total=None)
             artifact = summarize_and_store_content(
-                artifact_id, repo=config.repo, refresh=refresh
+                artifact_id,
+                repo=config.repo,
+                summarizer=config.summarizer,
+                refresh=refresh,
             )
         config.console.print(
             f"[green]Content summarized for artifact ID {artifact_id}.[/]"
@@ -97,7 +100,9 @@ def summarize_content_many(
             "Summarizing multiple artifacts...", total=len(artifact_ids)
         )
         try:
-            results = summarize_and_store_content_many(artifact_ids, repo=config.repo)
+            results = summarize_and_store_content_many(
+                artifact_ids, repo=config.repo, summarizer=config.summarizer
+            )
         except TimeoutError:
             bulk_summarize_timed_out = True
         finally:
@@ -0,0 +1,273 @@
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Mapping, Sequence
+
+from sqlalchemy import URL
+from sqlalchemy.util import greenlet_spawn
+
+from .cache import CacheStats
+from .config import (
+    CacheSettings,
+    PoolSettings,
+    get_cache_settings,
+    get_config,
+    get_pool_settings,
+    get_sqlite_pragmas,
+)
+from .database import (
+    IMPORT_BATCH_SIZE,
+    DatabaseRepository,
+    create_repository_engine,
+    normalize_database_url,
+)
+from .importers import ImportRecord
+from .models import (
+    Artifact,
+    ArtifactListItem,
+    BulkAddResult,
+    PageRecord,
+    PageValidators,
+    Tag,
+    TagCount,
+)
+from .pagination import DEFAULT_BATCH_SIZE, SortKey
+from .search import SearchHit
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def async_database_url(database_url: str) -> URL:
+    """Switch a database URL to the async driver of its backend."""
+    url = normalize_database_url(database_url)
+    try:
+        drivername = ASYNC_DRIVERS[url.get_backend_name()]
+    except KeyError:
+        raise ValueError(f"No async driver for {url.drivername} databases.") from None
+    return url.set(drivername=drivername)
+
+
+class AsyncDatabaseRepository:
+    """Async counterpart of DatabaseRepository, on aiosqlite or asyncpg.
+
+    Every method awaits the matching DatabaseRepository method, run against the
+    async engine's sync facade inside a greenlet, as `AsyncSession.run_sync`
+    does. Driver I/O is awaited on the event loop, so no thread blocks on the
+    database, and both repositories share one implementation. Iterators are
+    async iterators; each batch query is awaited separately.
+
+    Requires the optional `aiosqlite` or `asyncpg` driver
+    (`bookmarker-ai[async]`).
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        sqlite_pragmas: Mapping[str, str] | None = None,
+        pool_settings: PoolSettings | None = None,
+        cache_settings: CacheSettings | None = None,
+    ) -> None:
+        self._engine = create_repository_engine(
+            async_database_url(database_url),
+            echo=echo,
+            sqlite_pragmas=sqlite_pragmas,
+            pool_settings=pool_settings,
+            is_async=True,
+        )
+        self._repo = DatabaseRepository.from_engine(
+            self._engine.sync_engine, cache_settings
+        )
+
+    async def __aenter__(self) -> "AsyncDatabaseRepository":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.dispose()
+
+    async def dispose(self) -> None:
+        """Close all pooled connections."""
+        await self._engine.dispose()
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self._repo.is_sqlite
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        return self._repo.cache_stats
+
+    async def _run[T](
+        self, method: Callable[..., T], /, *args: Any, **kwargs: Any
+    ) -> T:
+        return await greenlet_spawn(method, *args, **kwargs)
+
+    async def _iterate[T](self, iterator: Iterator[T]) -> AsyncIterator[T]:
+        done = object()
+        while (item := await greenlet_spawn(next, iterator, done)) is not done:
+            yield item
+
+    async def create_db_and_tables(self) -> None:
+        await self._run(self._repo.create_db_and_tables)
+
+    async def ensure_schema(self) -> None:
+        await self._run(self._repo.ensure_schema)
+
+    async def add(self, artifact: Artifact) -> None:
+        await self._run(self._repo.add, artifact)
+
+    async def get_or_add(self, artifact: Artifact) -> tuple[Artifact, bool]:
+        return await self._run(self._repo.get_or_add, artifact)
+
+    async def bulk_add(
+        self, records: Iterable[ImportRecord], *, batch_size: int = IMPORT_BATCH_SIZE
+    ) -> BulkAddResult:
+        return await self._run(self._repo.bulk_add, records, batch_size=batch_size)
+
+    async def get(self, artifact_id: int) -> Artifact | None:
+        return await self._run(self._repo.get, artifact_id)
+
+    async def get_by_url(self, url: str) -> Artifact | None:
+        return await self._run(self._repo.get_by_url, url)
+
+    async def list(self) -> Sequence[Artifact]:
+        return await self._run(self._repo.list)
+
+    async def list_items(self) -> Sequence[ArtifactListItem]:
+        return await self._run(self._repo.list_items)
+
+    def iter_list_items(
+        self,
+        tag_name: str | None = None,
+        *,
+        sort: SortKey = SortKey.CREATED,
+        after: str | None = None,
+        limit: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> AsyncIterator[ArtifactListItem]:
+        return self._iterate(
+            self._repo.iter_list_items(
+                tag_name, sort=sort, after=after, limit=limit, batch_size=batch_size
+            )
+        )
+
+    async def delete(self, artifact_id: int) -> None:
+        await self._run(self._repo.delete, artifact_id)
+
+    async def store_content_raw(
+        self,
+        artifact_id: int,
+        content: str,
+        validators: PageValidators | None = None,
+    ) -> Artifact:
+        return await self._run(
+            self._repo.store_content_raw, artifact_id, content, validators
+        )
+
+    async def get_content_raw(self, artifact_id: int) -> str | None:
+        return await self._run(self._repo.get_content_raw, artifact_id)
+
+    async def list_pages(
+        self, artifact_ids: Iterable[int] | None = None
+    ) -> Sequence[PageRecord]:
+        return await self._run(self._repo.list_pages, artifact_ids)
+
+    async def store_content_summary(self, artifact_id: int, content: str) -> Artifact:
+        return await self._run(self._repo.store_content_summary, artifact_id, content)
+
+    async def store_content_raw_many(
+        self,
+        contents: Mapping[int, str],
+        validators: Mapping[int, PageValidators] | None = None,
+    ) -> Sequence[int]:
+        return await self._run(self._repo.store_content_raw_many, contents, validators)
+
+    async def store_page_validators_many(
+        self, validators: Mapping[int, PageValidators]
+    ) -> Sequence[int]:
+        return await self._run(self._repo.store_page_validators_many, validators)
+
+    async def store_content_summary_many(
+        self, contents: Mapping[int, str]
+    ) -> Sequence[int]:
+        return await self._run(self._repo.store_content_summary_many, contents)
+
+    async def tag(
+        self, artifact_id: int, /, *tags: Tag, remove: bool = False
+    ) -> Artifact:
+        return await self._run(self._repo.tag, artifact_id, *tags, remove=remove)
+
+    async def tag_many(
+        self,
+        artifact_ids: Iterable[int] | None = None,
+        *,
+        term: str | None = None,
+        tag_name: str | None = None,
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+    ) -> int:
+        return await self._run(
+            self._repo.tag_many,
+            artifact_ids,
+            term=term,
+            tag_name=tag_name,
+            add=add,
+            remove=remove,
+        )
+
+    async def list_tags(self, prefix: str | None = None) -> Sequence[TagCount]:
+        return await self._run(self._repo.list_tags, prefix)
+
+    async def search(
+        self, term: str, tag_name: str | None = None
+    ) -> Sequence[Artifact]:
+        return await self._run(self._repo.search, term, tag_name=tag_name)
+
+    async def search_ranked(
+        self, term: str, tag_name: str | None = None
+    ) -> Sequence[SearchHit]:
+        return await self._run(self._repo.search_ranked, term, tag_name=tag_name)
+
+    async def search_fuzzy(
+        self, term: str, tag_name: str | None = None, *, limit: int | None = None
+    ) -> Sequence[SearchHit]:
+        return await self._run(
+            self._repo.search_fuzzy, term, tag_name=tag_name, limit=limit
+        )
+
+    def iter_search(
+        self,
+        term: str,
+        tag_name: str | None = None,
+        *,
+        sort: SortKey = SortKey.RANK,
+        after: str | None = None,
+        limit: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> AsyncIterator[SearchHit]:
+        return self._iterate(
+            self._repo.iter_search(
+                term,
+                tag_name,
+                sort=sort,
+                after=after,
+                limit=limit,
+                batch_size=batch_size,
+            )
+        )
+
+
+def get_async_repo() -> AsyncDatabaseRepository:
+    """Async repository for the configured database; see `get_repo`."""
+    try:
+        config = get_config()
+    except FileNotFoundError:
+        raise RuntimeError("Configuration file not found.")
+
+    return AsyncDatabaseRepository(
+        database_url=config("DATABASE_URL"),
+        echo=config("DEBUG", cast=bool, default=False),
+        sqlite_pragmas=get_sqlite_pragmas(),
+        pool_settings=get_pool_settings(),
+        cache_settings=get_cache_settings(),
+    )
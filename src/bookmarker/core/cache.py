@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Callable, Iterable, NamedTuple
+
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .models import Artifact, Tag
+
+
+@dataclass
+class CacheStats:
+    """Running totals of artifact cache lookups.
+
+    `revalidations` counts expired entries that were served again after their
+    updated_at matched the database, at the cost of a one-column query.
+    """
+
+    hits: int = 0
+    revalidations: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.revalidations + self.misses
+        return (self.hits + self.revalidations) / lookups if lookups else 0.0
+
+
+def _detached_copy[M: (Artifact, Tag)](instance: M) -> M:
+    """Copy a detached row, so that it can still be merged back by a session."""
+    copy = type(instance)(
+        **{name: getattr(instance, name) for name in type(instance).model_fields}
+    )
+    if isinstance(instance, Artifact):
+        set_committed_value(
+            copy, "tags", [_detached_copy(tag) for tag in instance.tags]
+        )
+    make_transient_to_detached(copy)
+    return copy
+
+
+class _Entry(NamedTuple):
+    artifact: Artifact
+    expires_at: float
+
+
+class ArtifactCache:
+    """Bounded LRU of detached artifacts keyed by ID, with an index by URL.
+
+    Entries younger than `ttl` seconds are served as they are; older ones are
+    handed back for revalidation against updated_at, which catches writes made
+    by other processes. The cache keeps its own copy of each artifact and hands
+    out fresh copies, so callers may modify what they get; writes go through
+    the repository, which invalidates them.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._ids_by_url: dict[str, int] = {}
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return replace(self._stats)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, artifact_id: int) -> tuple[Artifact | None, bool]:
+        """Look up an artifact by ID.
+
+        Returns:
+            tuple[Artifact | None, bool]: cached artifact, or None on a miss, and
+                whether it is still fresh; stale ones need `revalidate`
+        """
+        with self._lock:
+            entry = self._entries.get(artifact_id)
+            if entry is None:
+                self._stats.misses += 1
+                return None, False
+            self._entries.move_to_end(artifact_id)
+            if entry.expires_at > self._clock():
+                self._stats.hits += 1
+                return _detached_copy(entry.artifact), True
+            return _detached_copy(entry.artifact), False
+
+    def get_id(self, url_normalized: str) -> int | None:
+        """ID of the cached artifact with this normalized URL, if any."""
+        with self._lock:
+            artifact_id = self._ids_by_url.get(url_normalized)
+            if artifact_id is None:
+                self._stats.misses += 1
+            return artifact_id
+
+    def revalidate(
+        self, artifact_id: int, updated_at: datetime | None, *, exists: bool = True
+    ) -> Artifact | None:
+        """Renew a stale entry if the stored updated_at still matches it.
+
+        Returns:
+            Artifact | None: the cached artifact, or None if it changed or is gone
+        """
+        with self._lock:
+            entry = self._entries.get(artifact_id)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            if not exists or entry.artifact.updated_at != updated_at:
+                self._remove(artifact_id)
+                self._stats.misses += 1
+                return None
+            self._entries[artifact_id] = entry._replace(
+                expires_at=self._clock() + self.ttl
+            )
+            self._stats.revalidations += 1
+            return _detached_copy(entry.artifact)
+
+    def put(self, artifact: Artifact) -> None:
+        """Cache a copy of a stored artifact."""
+        artifact_id = artifact.id
+        if artifact_id is None:
+            raise ValueError("Only stored artifacts can be cached.")
+        artifact = _detached_copy(artifact)
+        with self._lock:
+            self._remove(artifact_id)
+            self._entries[artifact_id] = _Entry(artifact, self._clock() + self.ttl)
+            if artifact.url_normalized is not None:
+                self._ids_by_url[artifact.url_normalized] = artifact_id
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._stats.evictions += 1
+
+    def invalidate(self, artifact_ids: Iterable[int]) -> None:
+        with self._lock:
+            for artifact_id in artifact_ids:
+                self._remove(artifact_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_url.clear()
+
+    def _remove(self, artifact_id: int) -> None:
+        entry = self._entries.pop(artifact_id, None)
+        if entry is None:
+            return
+        url_normalized = entry.artifact.url_normalized
+        if (
+            url_normalized is not None
+            and self._ids_by_url.get(url_normalized) == artifact_id
+        ):
+            del self._ids_by_url[url_normalized]
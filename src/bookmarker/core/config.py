@@ -2,8 +2,22 @@ import logging
 import os
 from functools import cache
 from pathlib import Path
+from typing import Any, Callable, NamedTuple
 
-from decouple import Config, RepositoryEnv
+from decouple import Config, RepositoryEnv, strtobool
+
+DEFAULT_MAX_WORKERS = 5
+DEFAULT_MAX_CONNECTIONS = 100
+
+# applied to every new SQLite connection; override with SQLITE_<NAME> in config.env
+SQLITE_PRAGMA_DEFAULTS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "mmap_size": "268435456",
+    "cache_size": "-64000",
+    "temp_store": "MEMORY",
+}
 
 
 @cache
@@ -36,3 +50,106 @@ def set_up_logging():
 def get_timeout_multithreading() -> int:
     config = get_config()
     return config("TIMEOUT_MULTITHREADING", 15, cast=int)
+
+
+def get_sqlite_pragmas() -> dict[str, str]:
+    config = get_config()
+    return {
+        name: config(f"SQLITE_{name.upper()}", default="") or default
+        for name, default in SQLITE_PRAGMA_DEFAULTS.items()
+    }
+
+
+def _get_or_default(key: str, default: Any, cast: Callable[[str], Any]) -> Any:
+    # blank keys copied from .env.template mean "use the default"
+    value = get_config()(key, default="")
+    return cast(value) if value != "" else default
+
+
+def get_max_workers() -> int:
+    return _get_or_default("MAX_WORKERS", DEFAULT_MAX_WORKERS, int)
+
+
+def get_max_connections() -> int:
+    return _get_or_default("MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS, int)
+
+
+def get_parse_workers() -> int:
+    return _get_or_default("PARSE_WORKERS", os.process_cpu_count() or 1, int)
+
+
+class HostSettings(NamedTuple):
+    """Politeness limits per host for bulk fetching."""
+
+    max_per_host: int = 2
+    delay: float = 0.2
+    respect_robots: bool = False
+
+
+def get_host_settings() -> HostSettings:
+    defaults = HostSettings()
+    return HostSettings(
+        max_per_host=_get_or_default("FETCH_MAX_PER_HOST", defaults.max_per_host, int),
+        delay=_get_or_default("FETCH_HOST_DELAY", defaults.delay, float),
+        respect_robots=_get_or_default(
+            "FETCH_RESPECT_ROBOTS", defaults.respect_robots, strtobool
+        ),
+    )
+
+
+class PoolSettings(NamedTuple):
+    """Connection pool settings for server databases such as PostgreSQL."""
+
+    pool_size: int
+    max_overflow: int
+    timeout: float = 30.0
+    pre_ping: bool = True
+    statement_timeout_ms: int = 0
+
+    @classmethod
+    def for_workers(cls, max_workers: int) -> "PoolSettings":
+        # one connection per bulk worker plus one for the thread writing results
+        return cls(pool_size=max_workers + 1, max_overflow=max_workers)
+
+
+def get_pool_settings() -> PoolSettings:
+    defaults = PoolSettings.for_workers(get_max_workers())
+    return PoolSettings(
+        pool_size=_get_or_default("DB_POOL_SIZE", defaults.pool_size, int),
+        max_overflow=_get_or_default("DB_MAX_OVERFLOW", defaults.max_overflow, int),
+        timeout=_get_or_default("DB_POOL_TIMEOUT", defaults.timeout, float),
+        pre_ping=_get_or_default("DB_POOL_PRE_PING", defaults.pre_ping, strtobool),
+        statement_timeout_ms=_get_or_default(
+            "DB_STATEMENT_TIMEOUT_MS", defaults.statement_timeout_ms, int
+        ),
+    )
+
+
+class CacheSettings(NamedTuple):
+    """Artifact cache of DatabaseRepository; a size of 0 disables it."""
+
+    size: int = 256
+    ttl: float = 5.0
+
+
+def get_cache_settings() -> CacheSettings:
+    defaults = CacheSettings()
+    return CacheSettings(
+        size=_get_or_default("ARTIFACT_CACHE_SIZE", defaults.size, int),
+        ttl=_get_or_default("ARTIFACT_CACHE_TTL", defaults.ttl, float),
+    )
+
+
+class HtmlCacheSettings(NamedTuple):
+    """On-disk cache of downloaded pages; a size of 0 disables it."""
+
+    directory: Path = Path.home() / ".bookmarker" / "cache"
+    size_mb: int = 512
+
+
+def get_html_cache_settings() -> HtmlCacheSettings:
+    defaults = HtmlCacheSettings()
+    return HtmlCacheSettings(
+        directory=_get_or_default("HTML_CACHE_DIR", defaults.directory, Path),
+        size_mb=_get_or_default("HTML_CACHE_SIZE_MB", defaults.size_mb, int),
+    )
@@ -0,0 +1,47 @@
+import hashlib
+import zlib
+
+from .models import ArtifactContent, ContentCodec
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    zstd = None
+
+DEFAULT_CODEC = ContentCodec.ZSTD if zstd is not None else ContentCodec.ZLIB
+ZLIB_LEVEL = 6
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def compress(content: str, codec: ContentCodec = DEFAULT_CODEC) -> bytes:
+    data = content.encode()
+    if codec is ContentCodec.ZSTD:
+        if zstd is None:
+            raise ValueError("zstd compression requires Python 3.14+.")
+        return zstd.compress(data)
+    return zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress(data: bytes, codec: ContentCodec) -> str:
+    if codec is ContentCodec.ZSTD:
+        if zstd is None:
+            raise ValueError("Content was stored with zstd, which needs Python 3.14+.")
+        return zstd.decompress(data).decode()
+    return zlib.decompress(data).decode()
+
+
+def pack_content(content: str, codec: ContentCodec = DEFAULT_CODEC) -> ArtifactContent:
+    """Build the blob row for a body, keyed by the SHA-256 of its text."""
+    return ArtifactContent(
+        hash=content_hash(content),
+        codec=codec,
+        size=len(content.encode()),
+        data=compress(content, codec),
+    )
+
+
+def unpack_content(blob: ArtifactContent) -> str:
+    return decompress(blob.data, ContentCodec(blob.codec))
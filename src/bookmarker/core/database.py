@@ -1,42 +1,780 @@
+import logging
+import re
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Sequence
+from itertools import batched
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Self, Sequence
 
-from sqlmodel import Session, create_engine, or_, select
+from sqlalchemy import (
+    URL,
+    Column,
+    ColumnElement,
+    Connection,
+    MetaData,
+    Result,
+    String,
+    Table,
+    delete,
+    event,
+    exists,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    make_url,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import Session, and_, col, create_engine, or_, select
 
-from .config import get_config
-from .exceptions import ArtifactNotFoundError
-from .models import Artifact, SQLModel, Tag
+from .cache import ArtifactCache, CacheStats
+from .config import (
+    DEFAULT_MAX_WORKERS,
+    SQLITE_PRAGMA_DEFAULTS,
+    CacheSettings,
+    PoolSettings,
+    get_cache_settings,
+    get_config,
+    get_pool_settings,
+    get_sqlite_pragmas,
+)
+from .content import content_hash, decompress, pack_content, unpack_content
+from .exceptions import ArtifactNotFoundError, SchemaMigrationError
+from .fuzzy import (
+    edit_distance,
+    extract_terms,
+    max_edit_distance,
+    min_shared_grams,
+    term_grams,
+)
+from .importers import ImportRecord
+from .models import (
+    Artifact,
+    ArtifactContent,
+    ArtifactFuzzyTermLink,
+    ArtifactListItem,
+    ArtifactTagLink,
+    ArtifactTypeEnum,
+    BulkAddResult,
+    ContentCodec,
+    FuzzyTerm,
+    FuzzyTermGram,
+    PageRecord,
+    PageValidators,
+    SQLModel,
+    Tag,
+    TagCount,
+    clean_tag_name,
+)
+from .pagination import DEFAULT_BATCH_SIZE, SortKey, decode_cursor
+from .pool import InstrumentedQueuePool, PoolStats
+from .search import (
+    CONTENT_FTS_TABLE,
+    CONTENT_FTS_WEIGHT,
+    FTS_TABLE,
+    FTS_WEIGHTS,
+    SNIPPET_ELLIPSIS,
+    SNIPPET_MARKERS,
+    SNIPPET_TOKENS,
+    TRIGRAM_TABLE,
+    SearchHit,
+    artifact_content_fts,
+    artifact_content_rows,
+    artifact_fts,
+    artifact_trigram,
+    build_match_phrases,
+    build_trigram_query,
+    create_fts_index,
+    create_trigram_index,
+    fts_index_exists,
+    index_contents,
+    is_substring_query,
+    make_snippet,
+    trigram_index_exists,
+    unindex_contents,
+)
+from .tagexpr import compile_tag_expression, parse_tag_expression
+from .urls import normalize_url
+
+logger = logging.getLogger(__name__)
+
+# keep IN (...) lists well below SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK_SIZE = 500
+# dialects with INSERT ... ON CONFLICT DO NOTHING
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+IMPORT_BATCH_SIZE = 1000
+# Alembic head revision matching the models; bump it with every migration
+SCHEMA_VERSION = "c4f7a9d2b6e8"
+# revision of the tables that releases before Alembic stamps created unstamped
+BASELINE_SCHEMA_VERSION = "cfcaf1314dc0"
+MIGRATIONS_DIR = Path(__file__).parents[1] / "migrations"
+# the table Alembic stamps, so `alembic upgrade` continues from the stamp
+schema_version_table = Table(
+    "alembic_version",
+    MetaData(),
+    Column("version_num", String(32), primary_key=True),
+)
+
+
+_PRAGMA_VALUE_PATTERN = re.compile(r"^-?\w+$")
+
+
+def _validate_sqlite_pragmas(pragmas: Mapping[str, str]) -> dict[str, str]:
+    validated = {}
+    for name, value in pragmas.items():
+        if name not in SQLITE_PRAGMA_DEFAULTS:
+            raise ValueError(f"Unsupported SQLite pragma: {name}")
+        value = str(value).strip()
+        if not _PRAGMA_VALUE_PATTERN.match(value):
+            raise ValueError(f"Invalid value for SQLite pragma {name}: {value!r}")
+        validated[name] = value
+    return validated
+
+
+def _set_sqlite_pragmas(pragmas: Mapping[str, str]) -> Callable[..., None]:
+    def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return on_connect
+
+
+def _set_statement_timeout(timeout_ms: int) -> Callable[..., None]:
+    def on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+        finally:
+            cursor.close()
+        # psycopg and friends open a transaction for the SET; don't leave it dangling
+        dbapi_connection.commit()
+
+    return on_connect
+
+
+def _stored_ids(*models: Artifact | Tag) -> list[int]:
+    # IDs are assigned once a model is flushed; None only before that
+    return [model.id for model in models if model.id is not None]
+
+
+def _returned_ids[K](result: Result[tuple[K, int | None]]) -> Iterator[tuple[K, int]]:
+    # rows of INSERT ... RETURNING key, id; the IDs are never NULL
+    for key, model_id in result:
+        if model_id is not None:
+            yield key, model_id
+
+
+def normalize_database_url(database_url: str) -> URL:
+    # Heroku-style postgres:// URLs are rejected by SQLAlchemy 1.4+
+    if database_url.startswith("postgres://"):
+        database_url = "postgresql://" + database_url.removeprefix("postgres://")
+    return make_url(database_url)
+
+
+def create_repository_engine(
+    url: URL,
+    *,
+    echo: bool = False,
+    sqlite_pragmas: Mapping[str, str] | None = None,
+    pool_settings: PoolSettings | None = None,
+    is_async: bool = False,
+) -> Any:
+    """Create the engine used by a repository, sync or async.
+
+    SQLite connections get the pragmas applied on connect. Server databases
+    get a pool sized by `pool_settings`; sync engines use the instrumented
+    pool, and PostgreSQL also gets a statement timeout when one is set.
+    """
+    make_engine = create_engine
+    if is_async:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        make_engine = create_async_engine
+    if url.get_backend_name() == "sqlite":
+        engine = make_engine(url, echo=echo)
+        pragmas = _validate_sqlite_pragmas(
+            SQLITE_PRAGMA_DEFAULTS if sqlite_pragmas is None else sqlite_pragmas
+        )
+        event.listen(
+            getattr(engine, "sync_engine", engine),
+            "connect",
+            _set_sqlite_pragmas(pragmas),
+        )
+        logger.debug(f"SQLite pragmas applied on connect: {pragmas}")
+        return engine
+
+    if pool_settings is None:
+        pool_settings = PoolSettings.for_workers(DEFAULT_MAX_WORKERS)
+    pool_kwargs = {} if is_async else {"poolclass": InstrumentedQueuePool}
+    engine = make_engine(
+        url,
+        echo=echo,
+        pool_size=pool_settings.pool_size,
+        max_overflow=pool_settings.max_overflow,
+        pool_timeout=pool_settings.timeout,
+        pool_pre_ping=pool_settings.pre_ping,
+        **pool_kwargs,
+    )
+    if pool_settings.statement_timeout_ms > 0:
+        if url.get_backend_name() == "postgresql":
+            event.listen(
+                getattr(engine, "sync_engine", engine),
+                "connect",
+                _set_statement_timeout(pool_settings.statement_timeout_ms),
+            )
+        else:
+            logger.warning(f"Statement timeout is not supported for {url.drivername}.")
+    logger.debug(f"Connection pool settings: {pool_settings}")
+    return engine
 
 
 class DatabaseRepository:
-    def __init__(self, database_url: str, echo: bool = False) -> None:
-        self._engine = create_engine(database_url, echo=echo)
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        sqlite_pragmas: Mapping[str, str] | None = None,
+        pool_settings: PoolSettings | None = None,
+        cache_settings: CacheSettings | None = None,
+    ) -> None:
+        self._engine: Engine = create_repository_engine(
+            normalize_database_url(database_url),
+            echo=echo,
+            sqlite_pragmas=sqlite_pragmas,
+            pool_settings=pool_settings,
+        )
+        self._fts_available: bool | None = None
+        self._trigram_available: bool | None = None
+        self._cache = self._make_cache(cache_settings)
+
+    @classmethod
+    def from_engine(
+        cls, engine: Engine, cache_settings: CacheSettings | None = None
+    ) -> Self:
+        """Wrap an existing engine, such as the sync facade of an AsyncEngine."""
+        repo = cls.__new__(cls)
+        repo._engine = engine
+        repo._fts_available = None
+        repo._trigram_available = None
+        repo._cache = cls._make_cache(cache_settings)
+        return repo
+
+    @staticmethod
+    def _make_cache(cache_settings: CacheSettings | None) -> ArtifactCache | None:
+        if cache_settings is None or cache_settings.size <= 0:
+            return None
+        return ArtifactCache(cache_settings.size, cache_settings.ttl)
+
+    @property
+    def pool_stats(self) -> PoolStats | None:
+        """Checkout wait-time statistics, for engines using the instrumented pool."""
+        stats = getattr(self._engine.pool, "stats", None)
+        return stats.snapshot() if stats is not None else None
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        """Hit/miss counts of the artifact cache, if it is enabled."""
+        return self._cache.stats if self._cache is not None else None
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self._engine.dialect.name == "sqlite"
 
     def create_db_and_tables(self) -> None:
         SQLModel.metadata.create_all(self._engine)
+        if self.is_sqlite:
+            try:
+                with self._engine.begin() as connection:
+                    create_fts_index(connection)
+                self._fts_available = True
+            except OperationalError:
+                logger.warning("SQLite FTS5 unavailable; search falls back to LIKE.")
+                self._fts_available = False
+        if self._engine.dialect.name in ("sqlite", "postgresql"):
+            try:
+                with self._engine.begin() as connection:
+                    create_trigram_index(connection)
+                self._trigram_available = True
+            except DBAPIError:
+                logger.warning(
+                    "Trigram index unavailable; substring search scans the table."
+                )
+                self._trigram_available = False
+
+    def ensure_schema(self) -> None:
+        """Bring the database to SCHEMA_VERSION, creating or migrating it.
+
+        A database at the current version costs a single one-row query, instead
+        of the table inspection `create_db_and_tables` does. A new database is
+        created and stamped, as is an unstamped one that already has every
+        table, column and index of the models. An unstamped one with older
+        tables, as releases before Alembic stamps left them, is stamped with
+        BASELINE_SCHEMA_VERSION. Stamped databases are then upgraded in-process
+        with the migrations shipped in the package.
+
+        Raises:
+            SchemaMigrationError: if the migrations cannot upgrade the database
+        """
+        with self._engine.connect() as connection:
+            version = self._read_schema_version(connection)
+        if version == SCHEMA_VERSION:
+            return
+        if version is None:
+            with self._engine.begin() as connection:
+                if inspect(connection).has_table("artifact"):
+                    version = (
+                        SCHEMA_VERSION
+                        if self._has_model_schema(connection)
+                        else BASELINE_SCHEMA_VERSION
+                    )
+                    self._stamp_schema(connection, version)
+        if version is None:
+            self.create_db_and_tables()
+            with self._engine.begin() as connection:
+                self._stamp_schema(connection, SCHEMA_VERSION)
+        elif version != SCHEMA_VERSION:
+            self._upgrade_schema(version)
+
+    @staticmethod
+    def _stamp_schema(connection: Connection, version: str) -> None:
+        schema_version_table.create(connection, checkfirst=True)
+        connection.execute(schema_version_table.insert().values(version_num=version))
+
+    def _upgrade_schema(self, version: str) -> None:
+        from alembic import command
+        from alembic.config import Config
+        from alembic.util import CommandError
+
+        logger.info(f"Upgrading database schema from {version} to {SCHEMA_VERSION}.")
+        config = Config()
+        config.set_main_option("script_location", str(MIGRATIONS_DIR))
+        config.attributes["target_metadata"] = SQLModel.metadata
+        try:
+            with self._engine.begin() as connection:
+                config.attributes["connection"] = connection
+                command.upgrade(config, "head")
+        except (CommandError, DBAPIError) as e:
+            raise SchemaMigrationError(
+                f"Could not upgrade database schema {version} to {SCHEMA_VERSION}: {e}"
+            ) from e
+        # the migrations create the search indexes; look them up again
+        self._fts_available = None
+        self._trigram_available = None
+
+    @staticmethod
+    def _read_schema_version(connection: Connection) -> str | None:
+        try:
+            versions = connection.execute(
+                select(schema_version_table.c.version_num)
+            ).scalars()
+            return next(versions, None)
+        except DBAPIError:
+            connection.rollback()
+            return None
+
+    @staticmethod
+    def _has_model_schema(connection: Connection) -> bool:
+        inspector = inspect(connection)
+        for model_table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(model_table.name):
+                return False
+            columns = {c["name"] for c in inspector.get_columns(model_table.name)}
+            indexes = {i["name"] for i in inspector.get_indexes(model_table.name)}
+            if not (
+                set(model_table.columns.keys()) <= columns
+                and {index.name for index in model_table.indexes} <= indexes
+            ):
+                return False
+        return True
+
+    def _use_fts(self) -> bool:
+        if not self.is_sqlite:
+            return False
+        if self._fts_available is None:
+            with self._engine.connect() as connection:
+                self._fts_available = fts_index_exists(connection)
+        return self._fts_available
+
+    def _use_trigram(self) -> bool:
+        if not self.is_sqlite:
+            return False
+        if self._trigram_available is None:
+            with self._engine.connect() as connection:
+                self._trigram_available = trigram_index_exists(connection)
+        return self._trigram_available
 
     def _store_artifact(self, artifact: Artifact) -> None:
+        self._invalidate([artifact.id])
+        artifact.url_normalized = normalize_url(artifact.url)
         artifact.updated_at = datetime.now(timezone.utc)
         with Session(self._engine) as session:
+            # recount the tags the artifact had as well as the ones it has now
+            old_tag_ids: list[int] = []
+            if artifact.id is not None:
+                old_tag_ids = list(
+                    session.exec(
+                        select(ArtifactTagLink.tag_id).where(
+                            ArtifactTagLink.artifact_id == artifact.id
+                        )
+                    )
+                )
+            # new Tag objects are matched to stored tags by their unique name
+            if any(tag.id is None for tag in artifact.tags):
+                names = list(dict.fromkeys(tag.name for tag in artifact.tags))
+                tag_ids = self._get_or_create_tag_ids(session, names)
+                artifact.tags = [session.get_one(Tag, tag_ids[name]) for name in names]
             session.add(artifact)
+            session.flush()
+            self._refresh_tag_counts(
+                session, [*old_tag_ids, *_stored_ids(*artifact.tags)]
+            )
+            self._index_fuzzy_terms(session, _stored_ids(artifact))
             session.commit()
             session.refresh(artifact)
 
     def add(self, artifact: Artifact) -> None:
         self._store_artifact(artifact)
 
+    def get_or_add(self, artifact: Artifact) -> tuple[Artifact, bool]:
+        """Insert the artifact unless one with the same normalized URL exists.
+
+        On SQLite and PostgreSQL a new artifact costs a single
+        INSERT ... ON CONFLICT DO NOTHING RETURNING statement, and the unique
+        index on url_normalized keeps concurrent adds from creating duplicates.
+
+        Args:
+            artifact (Artifact): artifact to add; its tags are ignored
+
+        Returns:
+            tuple[Artifact, bool]: stored artifact and whether it was just created
+        """
+        artifact.url_normalized = normalize_url(artifact.url)
+        artifact.updated_at = datetime.now(timezone.utc)
+        with Session(self._engine, expire_on_commit=False) as session:
+            upsert_insert = UPSERT_INSERTS.get(self._engine.dialect.name)
+            if upsert_insert is not None:
+                created = session.scalars(
+                    upsert_insert(Artifact)
+                    .values(**artifact.model_dump(exclude={"id"}))
+                    .on_conflict_do_nothing(index_elements=["url_normalized"])
+                    .returning(Artifact)
+                ).first()
+                if created is not None:
+                    self._index_fuzzy_terms(session, _stored_ids(created))
+                session.commit()
+                if created is not None:
+                    set_committed_value(created, "tags", [])
+            else:
+                created = artifact
+                session.add(artifact)
+                try:
+                    session.flush()
+                    self._index_fuzzy_terms(session, _stored_ids(artifact))
+                    session.commit()
+                    session.refresh(artifact)
+                except IntegrityError:
+                    session.rollback()
+                    created = None
+            if created is not None:
+                return created, True
+            existing = session.exec(
+                select(Artifact).where(
+                    Artifact.url_normalized == artifact.url_normalized
+                )
+            ).one()
+            return existing, False
+
     def list(self) -> Sequence[Artifact]:
         with Session(self._engine) as session:
             return session.exec(select(Artifact)).all()
 
+    def list_items(self) -> Sequence[ArtifactListItem]:
+        """List all artifacts without loading their content."""
+        return list(self.iter_list_items())
+
+    def iter_list_items(
+        self,
+        tag_name: str | None = None,
+        *,
+        sort: SortKey = SortKey.CREATED,
+        after: str | None = None,
+        limit: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[ArtifactListItem]:
+        """Lazily yield artifacts in keyset-paginated batches, without their content.
+
+        Fetched/summarized flags are computed in SQL and tags are gathered with one
+        query per batch, so no content blob is read or validated. Each batch is a
+        separate short query resuming after the last row seen, so memory and
+        first-row latency do not grow with the size of the library.
+
+        Args:
+            tag_name (str | None): only return artifacts matching this tag name
+                or expression, e.g. `python & (perf | db) & !draft`
+            sort (SortKey): ordering of the rows; `rank` is only valid for search
+            after (str | None): cursor of the last row of a previous page
+            limit (int | None): maximum number of rows to yield; None for all
+            batch_size (int): number of rows fetched per query
+
+        Returns:
+            Iterator[ArtifactListItem]: listing rows in `sort` order
+        """
+        if sort is SortKey.RANK:
+            raise ValueError("Sort by rank is only available for search.")
+        sort_column = self._sort_column(sort)
+        columns: list[Any] = [
+            Artifact.id,
+            Artifact.title,
+            Artifact.artifact_type,
+            Artifact.url,
+            Artifact.created_at,
+            col(Artifact.content_hash).is_not(None).label("is_fetched"),
+            col(Artifact.content_summary).is_not(None).label("is_summarized"),
+        ]
+        query = select(*columns)
+        if tag_name is not None:
+            query = query.where(self._has_tags(tag_name))
+
+        def to_items(session: Session, rows: Sequence[Any]) -> list[ArtifactListItem]:
+            tag_names = self._get_tag_names(session, [row.id for row in rows])
+            return [
+                ArtifactListItem(
+                    id=row.id,
+                    title=row.title,
+                    artifact_type=row.artifact_type,
+                    url=row.url,
+                    created_at=row.created_at,
+                    tags=tag_names.get(row.id, ()),
+                    is_fetched=bool(row.is_fetched),
+                    is_summarized=bool(row.is_summarized),
+                )
+                for row in rows
+            ]
+
+        yield from self._iter_keyset(
+            query,
+            sort_column,
+            descending=sort.descending,
+            position=decode_cursor(sort, after) if after is not None else None,
+            position_of=lambda row: (getattr(row, sort.field), row.id),
+            convert=to_items,
+            limit=limit,
+            batch_size=batch_size,
+        )
+
+    def iter_export_rows(
+        self,
+        *,
+        since: datetime | None = None,
+        include_content: bool = True,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[dict[str, Any]]:
+        """Lazily yield artifacts as plain dicts for export, in ID order.
+
+        Rows are read in keyset-paginated batches, so memory stays bounded by
+        `batch_size` no matter how large the library is.
+
+        Args:
+            since (datetime | None): only rows updated at or after this time (UTC)
+            include_content (bool): add the summary and decompressed raw content
+            batch_size (int): number of rows fetched per query
+
+        Returns:
+            Iterator[dict[str, Any]]: one dict per artifact, keyed by column name
+        """
+        columns: list[Any] = [
+            Artifact.id,
+            Artifact.title,
+            Artifact.url,
+            Artifact.artifact_type,
+            Artifact.notes,
+            Artifact.created_at,
+            Artifact.updated_at,
+        ]
+        if include_content:
+            columns += [Artifact.content_summary, ArtifactContent]
+        query = select(*columns)
+        if include_content:
+            query = query.outerjoin(
+                ArtifactContent, col(ArtifactContent.hash) == Artifact.content_hash
+            )
+        if since is not None:
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+            query = query.where(col(Artifact.updated_at) >= since)
+
+        def to_dicts(session: Session, rows: Sequence[Any]) -> list[dict[str, Any]]:
+            tag_names = self._get_tag_names(session, (row.id for row in rows))
+            items = []
+            for row in rows:
+                item = row._asdict()
+                blob = item.pop("ArtifactContent", None)
+                content_summary = item.pop("content_summary", None)
+                item["tags"] = list(tag_names.get(row.id, ()))
+                if include_content:
+                    item["content_summary"] = content_summary
+                    item["content_raw"] = (
+                        unpack_content(blob) if blob is not None else None
+                    )
+                items.append(item)
+            return items
+
+        yield from self._iter_keyset(
+            query,
+            Artifact.id,
+            descending=False,
+            position=None,
+            position_of=lambda row: (row.id, row.id),
+            convert=to_dicts,
+            limit=None,
+            batch_size=batch_size,
+        )
+
+    @staticmethod
+    def _sort_column(sort: SortKey) -> Any:
+        return {
+            "created_at": Artifact.created_at,
+            "id": Artifact.id,
+            "title": Artifact.title,
+        }[sort.field]
+
+    def _iter_keyset[R, T](
+        self,
+        query: Any,
+        sort_column: Any,
+        *,
+        descending: bool,
+        position: tuple[Any, int] | None,
+        position_of: Callable[[R], tuple[Any, int]],
+        convert: Callable[[Session, Sequence[R]], Sequence[T]],
+        limit: int | None,
+        batch_size: int,
+    ) -> Iterator[T]:
+        """Run `query` in batches ordered by (sort_column, Artifact.id).
+
+        Each batch is a fresh query resuming after the last row of the previous
+        one, so no transaction stays open while the caller consumes results.
+        `convert` runs inside the batch's session; `position_of` returns the
+        (sort value, ID) keyset position of a raw row.
+        """
+        key = tuple_(sort_column, col(Artifact.id))
+        if descending:
+            query = query.order_by(sort_column.desc(), col(Artifact.id).desc())
+        else:
+            query = query.order_by(sort_column, Artifact.id)
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            page = query.limit(size)
+            if position is not None:
+                bound = tuple_(*map(literal, position))
+                page = page.where(key < bound if descending else key > bound)
+            with Session(self._engine) as session:
+                rows = session.exec(page).all()
+                items = convert(session, rows)
+            yield from items
+            if len(rows) < size:
+                return
+            position = position_of(rows[-1])
+            if remaining is not None:
+                remaining -= len(rows)
+
+    @staticmethod
+    def _get_tag_names(
+        session: Session, artifact_ids: Iterable[int]
+    ) -> dict[int, tuple[str, ...]]:
+        artifact_ids = list(artifact_ids)
+        tag_names: dict[int, list[str]] = defaultdict(list)
+        for start in range(0, len(artifact_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = artifact_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+            query = (
+                select(ArtifactTagLink.artifact_id, Tag.name)
+                .join(Tag, col(Tag.id) == ArtifactTagLink.tag_id)
+                .where(col(ArtifactTagLink.artifact_id).in_(chunk))
+                .order_by(col(ArtifactTagLink.artifact_id), col(Tag.id))
+            )
+            for artifact_id, name in session.exec(query):
+                tag_names[artifact_id].append(name)
+        return {artifact_id: tuple(names) for artifact_id, names in tag_names.items()}
+
     def get(self, artifact_id: int) -> Artifact | None:
+        """Load an artifact by ID, through the artifact cache when it is enabled.
+
+        Fresh cache entries cost no query. Entries older than the cache TTL are
+        served again only if their updated_at still matches the stored row, so
+        writes by other processes are picked up. Each call returns its own copy.
+        """
+        if self._cache is None:
+            return self._load(artifact_id)
+        artifact, is_fresh = self._cache.get(artifact_id)
+        if is_fresh:
+            return artifact
+        if artifact is not None:
+            with Session(self._engine) as session:
+                row = session.exec(
+                    select(Artifact.id, Artifact.updated_at).where(
+                        Artifact.id == artifact_id
+                    )
+                ).first()
+            artifact = self._cache.revalidate(
+                artifact_id,
+                row.updated_at if row is not None else None,
+                exists=row is not None,
+            )
+            if artifact is not None:
+                return artifact
+        artifact = self._load(artifact_id)
+        if artifact is not None:
+            self._cache.put(artifact)
+        return artifact
+
+    def _get_existing(self, artifact_id: int) -> Artifact:
+        """Load an artifact just written; it may have been deleted since."""
+        artifact = self.get(artifact_id)
+        if artifact is None:
+            raise ArtifactNotFoundError(f"Artifact with ID {artifact_id} not found.")
+        return artifact
+
+    def _load(self, artifact_id: int) -> Artifact | None:
         with Session(self._engine) as session:
             return session.get(Artifact, artifact_id)
 
     def get_by_url(self, url: str) -> Artifact | None:
+        url_normalized = normalize_url(url)
+        if self._cache is not None:
+            artifact_id = self._cache.get_id(url_normalized)
+            if artifact_id is not None:
+                artifact = self.get(artifact_id)
+                if artifact is not None:
+                    return artifact
         with Session(self._engine) as session:
-            statement = select(Artifact).where(Artifact.url == url)
-            return session.exec(statement).first()
+            statement = select(Artifact).where(
+                Artifact.url_normalized == url_normalized
+            )
+            artifact = session.exec(statement).first()
+        if artifact is not None and self._cache is not None:
+            self._cache.put(artifact)
+        return artifact
+
+    def _invalidate(self, artifact_ids: Iterable[int | None] | None = None) -> None:
+        """Drop artifacts from the cache after a write; None drops all of them."""
+        if self._cache is None:
+            return
+        if artifact_ids is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(a_id for a_id in artifact_ids if a_id is not None)
 
     def delete(self, artifact_id: int) -> None:
         with Session(self._engine) as session:
@@ -45,27 +783,817 @@ class DatabaseRepository:
                 raise ArtifactNotFoundError(
                     f"Artifact with ID {artifact_id} not found."
                 )
+            tag_ids = session.exec(
+                select(ArtifactTagLink.tag_id).where(
+                    ArtifactTagLink.artifact_id == artifact_id
+                )
+            ).all()
+            session.exec(
+                delete(ArtifactFuzzyTermLink).where(
+                    col(ArtifactFuzzyTermLink.artifact_id) == artifact_id
+                )
+            )
             session.delete(artifact)
+            session.flush()
+            self._release_contents(session, [artifact.content_hash])
+            self._refresh_tag_counts(session, tag_ids)
             session.commit()
+        self._invalidate([artifact_id])
 
-    def store_content_raw(self, artifact_id: int, content: str) -> Artifact:
-        artifact = self.get(artifact_id)
-        if artifact is None:
+    def store_content_raw(
+        self,
+        artifact_id: int,
+        content: str,
+        validators: PageValidators | None = None,
+    ) -> Artifact:
+        validators_by_id = {artifact_id: validators} if validators else None
+        if not self.store_content_raw_many({artifact_id: content}, validators_by_id):
             raise ArtifactNotFoundError(f"Artifact with ID {artifact_id} not found.")
-        artifact.content_raw = content
-        self._store_artifact(artifact)
-        return artifact
+        return self._get_existing(artifact_id)
+
+    def get_content_raw(self, artifact_id: int) -> str | None:
+        """Load and decompress the raw content of an artifact.
+
+        Args:
+            artifact_id (int): ID of the artifact
+
+        Returns:
+            str | None: raw content, or None if it has not been fetched yet
+        """
+        with Session(self._engine) as session:
+            row = session.exec(
+                select(Artifact.id, ArtifactContent)
+                .outerjoin(
+                    ArtifactContent, col(ArtifactContent.hash) == Artifact.content_hash
+                )
+                .where(Artifact.id == artifact_id)
+            ).first()
+        if row is None:
+            raise ArtifactNotFoundError(f"Artifact with ID {artifact_id} not found.")
+        _, blob = row
+        return unpack_content(blob) if blob is not None else None
+
+    def list_pages(
+        self, artifact_ids: Iterable[int] | None = None
+    ) -> Sequence[PageRecord]:
+        """Artifacts with the hash of the page their raw content came from.
+
+        Args:
+            artifact_ids (Iterable[int] | None): artifacts to include; all if None
+
+        Returns:
+            Sequence[PageRecord]: one record per artifact with a page hash, by ID
+        """
+        columns: list[Any] = [
+            Artifact.id,
+            Artifact.url,
+            Artifact.content_hash,
+            Artifact.http_etag,
+            Artifact.http_last_modified,
+            Artifact.page_hash,
+        ]
+        query = (
+            select(*columns)
+            .where(col(Artifact.page_hash).is_not(None))
+            .order_by(col(Artifact.id))
+        )
+        with Session(self._engine) as session:
+            if artifact_ids is None:
+                rows = session.exec(query).all()
+            else:
+                rows = sorted(
+                    row
+                    for chunk in batched(
+                        dict.fromkeys(artifact_ids), IN_CLAUSE_CHUNK_SIZE
+                    )
+                    for row in session.exec(query.where(col(Artifact.id).in_(chunk)))
+                )
+        return [
+            PageRecord(a_id, url, PageValidators(*validators), content_hash)
+            for a_id, url, content_hash, *validators in rows
+        ]
 
     def store_content_summary(self, artifact_id: int, content: str) -> Artifact:
-        artifact = self.get(artifact_id)
-        if artifact is None:
+        # a bulk UPDATE, so a cached artifact is never modified in place
+        if not self.store_content_summary_many({artifact_id: content}):
             raise ArtifactNotFoundError(f"Artifact with ID {artifact_id} not found.")
-        artifact.content_summary = content
-        self._store_artifact(artifact)
-        return artifact
+        return self._get_existing(artifact_id)
+
+    def store_content_raw_many(
+        self,
+        contents: Mapping[int, str],
+        validators: Mapping[int, PageValidators] | None = None,
+    ) -> Sequence[int]:
+        """Store raw content for many artifacts in a single transaction.
+
+        Args:
+            contents (Mapping[int, str]): raw content keyed by artifact ID
+            validators (Mapping[int, PageValidators] | None): validators of the
+                pages the content came from; artifacts without any get theirs
+                cleared, as they no longer describe the stored content
+
+        Bodies are compressed into artifact_content, keyed by their SHA-256, so
+        identical bodies are stored once. Blobs no longer referenced by any
+        artifact are deleted.
+
+        Returns:
+            Sequence[int]: IDs of updated artifacts; unknown IDs are skipped
+        """
+        if not contents:
+            return []
+        updated_at = datetime.now(timezone.utc)
+        with Session(self._engine) as session:
+            old_hashes = self._get_content_hashes(session, contents.keys())
+            stored_ids = [a_id for a_id in contents if a_id in old_hashes]
+            if stored_ids:
+                new_hashes = self._put_contents(
+                    session, {a_id: contents[a_id] for a_id in stored_ids}
+                )
+                session.exec(
+                    update(Artifact),
+                    params=[
+                        {
+                            "id": a_id,
+                            "content_hash": new_hashes[a_id],
+                            "updated_at": updated_at,
+                            **self._validator_values(
+                                (validators or {}).get(a_id, PageValidators())
+                            ),
+                        }
+                        for a_id in stored_ids
+                    ],
+                )
+                self._release_contents(
+                    session, (old_hashes[a_id] for a_id in stored_ids)
+                )
+            session.commit()
+        self._invalidate(stored_ids)
+        return stored_ids
+
+    def store_page_validators_many(
+        self, validators: Mapping[int, PageValidators]
+    ) -> Sequence[int]:
+        """Replace the page validators of artifacts whose content is unchanged.
+
+        updated_at is bumped like on any other write, so artifact caches that
+        revalidate against it, in this process or another, see the change.
+
+        Returns:
+            Sequence[int]: IDs of updated artifacts; unknown IDs are skipped
+        """
+        if not validators:
+            return []
+        with Session(self._engine) as session:
+            existing_ids = self._get_existing_ids(session, validators.keys())
+            stored_ids = [a_id for a_id in validators if a_id in existing_ids]
+            if stored_ids:
+                updated_at = datetime.now(timezone.utc)
+                session.exec(
+                    update(Artifact),
+                    params=[
+                        {
+                            "id": a_id,
+                            **self._validator_values(validators[a_id]),
+                            "updated_at": updated_at,
+                        }
+                        for a_id in stored_ids
+                    ],
+                )
+            session.commit()
+        self._invalidate(stored_ids)
+        return stored_ids
+
+    @staticmethod
+    def _validator_values(validators: PageValidators) -> dict[str, str | None]:
+        return {
+            "http_etag": validators.etag,
+            "http_last_modified": validators.last_modified,
+            "page_hash": validators.page_hash,
+        }
+
+    def store_content_summary_many(self, contents: Mapping[int, str]) -> Sequence[int]:
+        """Store summaries for many artifacts in a single transaction.
+
+        Args:
+            contents (Mapping[int, str]): summary keyed by artifact ID
+
+        Returns:
+            Sequence[int]: IDs of updated artifacts; unknown IDs are skipped
+        """
+        return self._store_content_many("content_summary", contents)
+
+    def _store_content_many(
+        self, field: str, contents: Mapping[int, str]
+    ) -> Sequence[int]:
+        if not contents:
+            return []
+        updated_at = datetime.now(timezone.utc)
+        with Session(self._engine) as session:
+            existing_ids = self._get_existing_ids(session, contents.keys())
+            stored_ids = [a_id for a_id in contents if a_id in existing_ids]
+            if stored_ids:
+                # ORM bulk UPDATE by primary key: one executemany statement
+                session.exec(
+                    update(Artifact),
+                    params=[
+                        {"id": a_id, field: contents[a_id], "updated_at": updated_at}
+                        for a_id in stored_ids
+                    ],
+                )
+                if field == "content_summary":
+                    self._index_fuzzy_terms(session, stored_ids)
+            session.commit()
+        self._invalidate(stored_ids)
+        return stored_ids
+
+    @staticmethod
+    def _get_content_hashes(
+        session: Session, artifact_ids: Iterable[int]
+    ) -> dict[int, str | None]:
+        artifact_ids = list(artifact_ids)
+        content_hashes: dict[int, str | None] = {}
+        for start in range(0, len(artifact_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = artifact_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+            content_hashes.update(
+                session.exec(
+                    select(Artifact.id, Artifact.content_hash).where(
+                        col(Artifact.id).in_(chunk)
+                    )
+                ).all()
+            )
+        return content_hashes
+
+    def _put_contents(
+        self, session: Session, contents: Mapping[int, str]
+    ) -> dict[int, str]:
+        """Store each distinct body once; return the content hash per artifact ID.
+
+        New blobs are added to the raw content search index as they are created.
+        """
+        blobs: dict[str, str] = {}
+        hashes: dict[int, str] = {}
+        for a_id, content in contents.items():
+            hashes[a_id] = content_hash(content)
+            blobs.setdefault(hashes[a_id], content)
+        new_hashes = list(blobs)
+        for start in range(0, len(new_hashes), IN_CLAUSE_CHUNK_SIZE):
+            chunk = new_hashes[start : start + IN_CLAUSE_CHUNK_SIZE]
+            for existing in session.exec(
+                select(ArtifactContent.hash).where(col(ArtifactContent.hash).in_(chunk))
+            ):
+                del blobs[existing]
+        session.add_all(pack_content(content) for content in blobs.values())
+        session.flush()
+        if blobs and self._use_fts():
+            new_hashes = list(blobs)
+            for start in range(0, len(new_hashes), IN_CLAUSE_CHUNK_SIZE):
+                chunk = new_hashes[start : start + IN_CLAUSE_CHUNK_SIZE]
+                rowids = session.exec(
+                    select(
+                        artifact_content_rows.c.rowid, artifact_content_rows.c.hash
+                    ).where(artifact_content_rows.c.hash.in_(chunk))
+                )
+                index_contents(
+                    session.connection(),
+                    {rowid: blobs[blob_hash] for rowid, blob_hash in rowids},
+                )
+        return hashes
+
+    def _release_contents(
+        self, session: Session, content_hashes: Iterable[str | None]
+    ) -> None:
+        """Delete blobs that no artifact references any more.
+
+        Their bodies are removed from the raw content search index, which needs
+        the indexed text, so only released blobs are decompressed.
+        """
+        content_hashes = list({h for h in content_hashes if h is not None})
+        unreferenced = ~exists().where(
+            col(Artifact.content_hash) == ArtifactContent.hash
+        )
+        for start in range(0, len(content_hashes), IN_CLAUSE_CHUNK_SIZE):
+            chunk = content_hashes[start : start + IN_CLAUSE_CHUNK_SIZE]
+            if self._use_fts():
+                released = session.exec(
+                    select(
+                        artifact_content_rows.c.rowid,
+                        artifact_content_rows.c.codec,
+                        artifact_content_rows.c.data,
+                    ).where(
+                        artifact_content_rows.c.hash.in_(chunk),
+                        ~exists().where(
+                            col(Artifact.content_hash) == artifact_content_rows.c.hash
+                        ),
+                    )
+                )
+                unindex_contents(
+                    session.connection(),
+                    {
+                        rowid: decompress(data, ContentCodec(codec))
+                        for rowid, codec, data in released
+                    },
+                )
+            session.exec(
+                delete(ArtifactContent).where(
+                    col(ArtifactContent.hash).in_(chunk), unreferenced
+                )
+            )
+
+    @staticmethod
+    def _get_existing_ids(session: Session, artifact_ids: Iterable[int]) -> set[int]:
+        artifact_ids = list(artifact_ids)
+        existing_ids: set[int] = set()
+        for start in range(0, len(artifact_ids), IN_CLAUSE_CHUNK_SIZE):
+            chunk = artifact_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+            existing_ids.update(
+                session.exec(select(Artifact.id).where(col(Artifact.id).in_(chunk)))
+            )
+        return existing_ids
+
+    def bulk_add(
+        self, records: Iterable[ImportRecord], *, batch_size: int = IMPORT_BATCH_SIZE
+    ) -> BulkAddResult:
+        """Insert many bookmarks, skipping URLs that are already stored.
+
+        Records are consumed lazily and written in one transaction per batch:
+        a multi-row INSERT for the artifacts, one for any new tags and one for
+        the tag links. Duplicates are detected on the normalized URL, both
+        within the input and against the table.
+
+        Args:
+            records (Iterable[ImportRecord]): bookmarks to add
+            batch_size (int): number of records per transaction
+
+        Returns:
+            BulkAddResult: number of artifacts added and duplicates skipped
+        """
+        added = skipped = 0
+        seen: set[str] = set()
+        for batch in batched(records, batch_size):
+            rows: dict[str, ImportRecord] = {}
+            for record in batch:
+                url_normalized = normalize_url(record.url)
+                if url_normalized in seen:
+                    skipped += 1
+                    continue
+                seen.add(url_normalized)
+                rows[url_normalized] = record
+            if not rows:
+                continue
+            with Session(self._engine) as session:
+                artifact_ids = self._insert_new_artifacts(session, rows)
+                self._link_tags(
+                    session,
+                    {
+                        artifact_id: rows[url_normalized].tags
+                        for url_normalized, artifact_id in artifact_ids.items()
+                    },
+                )
+                self._index_fuzzy_terms(session, artifact_ids.values())
+                session.commit()
+            added += len(artifact_ids)
+            skipped += len(rows) - len(artifact_ids)
+        return BulkAddResult(added=added, skipped=skipped)
+
+    def _insert_new_artifacts(
+        self, session: Session, rows: Mapping[str, ImportRecord]
+    ) -> dict[str, int]:
+        """Insert records whose normalized URL is new; return their IDs by URL."""
+        now = datetime.now(timezone.utc)
+        upsert_insert = UPSERT_INSERTS.get(self._engine.dialect.name)
+        if upsert_insert is not None:
+            statement = upsert_insert(Artifact).on_conflict_do_nothing(
+                index_elements=["url_normalized"]
+            )
+        else:
+            statement = insert(Artifact)
+            existing = set()
+            keys = list(rows)
+            for start in range(0, len(keys), IN_CLAUSE_CHUNK_SIZE):
+                chunk = keys[start : start + IN_CLAUSE_CHUNK_SIZE]
+                existing.update(
+                    session.exec(
+                        select(Artifact.url_normalized).where(
+                            col(Artifact.url_normalized).in_(chunk)
+                        )
+                    )
+                )
+            rows = {key: row for key, row in rows.items() if key not in existing}
+            if not rows:
+                return {}
+        result = session.connection().execute(
+            statement.returning(col(Artifact.url_normalized), col(Artifact.id)),
+            [
+                {
+                    "title": record.title,
+                    "url": record.url,
+                    "url_normalized": url_normalized,
+                    "artifact_type": ArtifactTypeEnum.ARTICLE,
+                    "notes": record.notes,
+                    "created_at": record.created_at or now,
+                    "updated_at": now,
+                }
+                for url_normalized, record in rows.items()
+            ],
+        )
+        return {url_normalized: a_id for url_normalized, a_id in result}
+
+    def _link_tags(
+        self, session: Session, tag_names: Mapping[int, Iterable[str]]
+    ) -> None:
+        """Attach tags by name to new artifacts, creating missing tags."""
+        names = list({name: None for names in tag_names.values() for name in names})
+        if not names:
+            return
+        tag_ids = self._get_or_create_tag_ids(session, names)
+        links = [
+            {"artifact_id": artifact_id, "tag_id": tag_ids[name]}
+            for artifact_id, names in tag_names.items()
+            for name in names
+        ]
+        if links:
+            session.connection().execute(insert(ArtifactTagLink), links)
+            self._refresh_tag_counts(session, tag_ids.values())
+
+    def tag_many(
+        self,
+        artifact_ids: Iterable[int] | None = None,
+        *,
+        term: str | None = None,
+        tag_name: str | None = None,
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+    ) -> int:
+        """Add and remove tags on many artifacts in one transaction.
+
+        Artifacts are selected by ID, by search filter (`term` and `tag_name`, as
+        in `search`), or both. Missing tags are created once, then links are
+        inserted with one INSERT ... SELECT and deleted with one DELETE per
+        chunk of IDs, without loading any artifact.
+
+        Args:
+            artifact_ids (Iterable[int] | None): IDs of artifacts to update
+            term (str | None): only update artifacts matching this search text
+            tag_name (str | None): only update artifacts matching this tag name
+                or expression, e.g. `python & !draft`
+            add (Iterable[str]): names of tags to add
+            remove (Iterable[str]): names of tags to remove
+
+        Returns:
+            int: number of artifacts selected; unknown IDs are skipped
+        """
+        add_names = list(dict.fromkeys(clean_tag_name(name) for name in add))
+        remove_names = list(dict.fromkeys(clean_tag_name(name) for name in remove))
+        filters: list[ColumnElement[bool]] = []
+        if term is not None:
+            filters.append(self._matches(term))
+        if tag_name is not None:
+            filters.append(self._has_tags(tag_name))
+        if artifact_ids is not None:
+            artifact_ids = list(dict.fromkeys(artifact_ids))
+            chunks = [
+                [
+                    col(Artifact.id).in_(
+                        artifact_ids[start : start + IN_CLAUSE_CHUNK_SIZE]
+                    )
+                ]
+                for start in range(0, len(artifact_ids), IN_CLAUSE_CHUNK_SIZE)
+            ]
+        else:
+            chunks = [[]]
+
+        updated_at = datetime.now(timezone.utc)
+        with Session(self._engine) as session:
+            add_ids = list(self._get_or_create_tag_ids(session, add_names).values())
+            remove_ids = list(self._get_tag_ids(session, remove_names).values())
+            # select every target before changing any link, since the filters
+            # may read the very tags being added or removed
+            target_ids = [
+                artifact_id
+                for chunk in chunks
+                for artifact_id in session.exec(
+                    select(Artifact.id).where(*filters, *chunk)
+                ).all()
+            ]
+            selected = len(target_ids)
+            for batch in batched(target_ids, IN_CLAUSE_CHUNK_SIZE):
+                if add_ids:
+                    session.exec(
+                        insert(ArtifactTagLink).from_select(
+                            ["artifact_id", "tag_id"],
+                            select(Artifact.id, Tag.id)
+                            .join(Tag, col(Tag.id).in_(add_ids))
+                            .where(
+                                col(Artifact.id).in_(batch),
+                                ~exists().where(
+                                    col(ArtifactTagLink.artifact_id) == Artifact.id,
+                                    col(ArtifactTagLink.tag_id) == Tag.id,
+                                ),
+                            ),
+                        )
+                    )
+                if remove_ids:
+                    session.exec(
+                        delete(ArtifactTagLink).where(
+                            col(ArtifactTagLink.tag_id).in_(remove_ids),
+                            col(ArtifactTagLink.artifact_id).in_(batch),
+                        )
+                    )
+                if add_ids or remove_ids:
+                    session.exec(
+                        update(Artifact)
+                        .where(col(Artifact.id).in_(batch))
+                        .values(updated_at=updated_at)
+                    )
+                    self._index_fuzzy_terms(session, list(batch))
+            self._refresh_tag_counts(session, [*add_ids, *remove_ids])
+            session.commit()
+        if add_ids or remove_ids:
+            # filtered selections are not known by ID; drop the whole cache
+            self._invalidate(artifact_ids if not filters else None)
+        return selected
+
+    @staticmethod
+    def _get_tag_ids(session: Session, names: Sequence[str]) -> dict[str, int]:
+        tag_ids: dict[str, int] = {}
+        for start in range(0, len(names), IN_CLAUSE_CHUNK_SIZE):
+            chunk = names[start : start + IN_CLAUSE_CHUNK_SIZE]
+            tag_ids.update(
+                session.exec(
+                    select(Tag.name, Tag.id).where(col(Tag.name).in_(chunk))
+                ).all()
+            )
+        return tag_ids
+
+    def _get_or_create_tag_ids(
+        self, session: Session, names: Sequence[str]
+    ) -> dict[str, int]:
+        """Look up tags by name, inserting the missing ones in one statement.
+
+        On SQLite and PostgreSQL the insert skips names created concurrently,
+        relying on the unique index on Tag.name, and the IDs are read back.
+        """
+        tag_ids = self._get_tag_ids(session, names)
+        new_names = [name for name in names if name not in tag_ids]
+        if not new_names:
+            return tag_ids
+        rows = [{"name": name} for name in new_names]
+        upsert_insert = UPSERT_INSERTS.get(self._engine.dialect.name)
+        if upsert_insert is not None:
+            session.connection().execute(
+                upsert_insert(Tag).on_conflict_do_nothing(index_elements=[Tag.name]),
+                rows,
+            )
+            tag_ids.update(self._get_tag_ids(session, new_names))
+        else:
+            result = session.connection().execute(
+                insert(Tag).returning(col(Tag.name), col(Tag.id)), rows
+            )
+            tag_ids.update(_returned_ids(result))
+        return tag_ids
+
+    @staticmethod
+    def _refresh_tag_counts(session: Session, tag_ids: Iterable[int]) -> None:
+        """Recount the links of the given tags into Tag.artifact_count.
+
+        Each count is a range scan of the (tag_id, artifact_id) link index, so
+        the cost depends on the tags touched, not on the size of the library.
+        """
+        link_count = (
+            select(func.count())
+            .select_from(ArtifactTagLink)
+            .where(ArtifactTagLink.tag_id == Tag.id)
+            .scalar_subquery()
+        )
+        for chunk in batched(dict.fromkeys(tag_ids), IN_CLAUSE_CHUNK_SIZE):
+            session.exec(
+                update(Tag)
+                .where(col(Tag.id).in_(chunk))
+                .values(artifact_count=link_count)
+            )
+
+    def _index_fuzzy_terms(self, session: Session, artifact_ids: Iterable[int]) -> None:
+        """Replace the fuzzy search words of artifacts with their current ones.
+
+        Words come from the title, tag names and summary; new words are added to
+        the vocabulary with their trigrams. Words no longer used by any artifact
+        stay in the vocabulary, where they match nothing.
+        """
+        for chunk in batched(dict.fromkeys(artifact_ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = session.exec(
+                select(Artifact.id, Artifact.title, Artifact.content_summary).where(
+                    col(Artifact.id).in_(chunk)
+                )
+            ).all()
+            tag_names = self._get_tag_names(session, chunk)
+            terms = {
+                row.id: extract_terms(
+                    row.title, *tag_names.get(row.id, ()), row.content_summary
+                )
+                for row in rows
+            }
+            term_ids = self._get_or_create_fuzzy_term_ids(
+                session, list(dict.fromkeys(t for ts in terms.values() for t in ts))
+            )
+            session.exec(
+                delete(ArtifactFuzzyTermLink).where(
+                    col(ArtifactFuzzyTermLink.artifact_id).in_(chunk)
+                )
+            )
+            links = [
+                {"artifact_id": artifact_id, "term_id": term_ids[term]}
+                for artifact_id, artifact_terms in terms.items()
+                for term in artifact_terms
+            ]
+            if links:
+                session.connection().execute(insert(ArtifactFuzzyTermLink), links)
+
+    def _get_or_create_fuzzy_term_ids(
+        self, session: Session, terms: Sequence[str]
+    ) -> dict[str, int]:
+        """Look up vocabulary words, adding missing ones with their trigrams."""
+        term_ids: dict[str, int] = {}
+        for chunk in batched(terms, IN_CLAUSE_CHUNK_SIZE):
+            term_ids.update(
+                session.exec(
+                    select(FuzzyTerm.term, FuzzyTerm.id).where(
+                        col(FuzzyTerm.term).in_(chunk)
+                    )
+                ).all()
+            )
+        new_terms = [term for term in terms if term not in term_ids]
+        if not new_terms:
+            return term_ids
+        rows = [{"term": term, "length": len(term)} for term in new_terms]
+        upsert_insert = UPSERT_INSERTS.get(self._engine.dialect.name)
+        if upsert_insert is not None:
+            statement = upsert_insert(FuzzyTerm).on_conflict_do_nothing(
+                index_elements=[FuzzyTerm.term]
+            )
+        else:
+            statement = insert(FuzzyTerm)
+        result = session.connection().execute(
+            statement.returning(col(FuzzyTerm.term), col(FuzzyTerm.id)), rows
+        )
+        created = dict(_returned_ids(result))
+        if upsert_insert is not None:
+            # words added concurrently by another process already have grams
+            for chunk in batched(new_terms, IN_CLAUSE_CHUNK_SIZE):
+                term_ids.update(
+                    session.exec(
+                        select(FuzzyTerm.term, FuzzyTerm.id).where(
+                            col(FuzzyTerm.term).in_(chunk)
+                        )
+                    ).all()
+                )
+        else:
+            term_ids.update(created)
+        grams = [
+            {"gram": gram, "term_id": term_id}
+            for term, term_id in created.items()
+            for gram in term_grams(term)
+        ]
+        if grams:
+            session.connection().execute(insert(FuzzyTermGram), grams)
+        return term_ids
+
+    def search_fuzzy(
+        self,
+        term: str,
+        tag_name: str | None = None,
+        *,
+        limit: int | None = None,
+    ) -> Sequence[SearchHit]:
+        """Search titles, tags and summaries, tolerating typos in each word.
+
+        Every word of the term is looked up in the fuzzy vocabulary through its
+        trigram postings, and candidates within `max_edit_distance` are kept; no
+        artifact row is scanned. Artifacts containing a match for every word are
+        ranked by the total edit distance, then newest first.
+
+        Args:
+            term (str): words to search for; words under 3 letters are ignored
+            tag_name (str | None): only return artifacts matching this tag name
+                or expression, e.g. `python & (perf | db) & !draft`
+            limit (int | None): maximum number of hits to return; None for all
+
+        Returns:
+            Sequence[SearchHit]: hits with the total edit distance as `rank` and
+                the matched words as `snippet`
+        """
+        words = extract_terms(term)
+        if not words:
+            return []
+        with Session(self._engine) as session:
+            matches = [self._get_fuzzy_matches(session, word) for word in words]
+            if not all(matches):
+                return []
+            word_of_term = {
+                term_id: index
+                for index, word_matches in enumerate(matches)
+                for term_id in word_matches
+            }
+            best: dict[int, list[tuple[int, str] | None]] = defaultdict(
+                lambda: [None] * len(words)
+            )
+            for chunk in batched(word_of_term, IN_CLAUSE_CHUNK_SIZE):
+                query = select(
+                    ArtifactFuzzyTermLink.artifact_id, ArtifactFuzzyTermLink.term_id
+                ).where(col(ArtifactFuzzyTermLink.term_id).in_(chunk))
+                if tag_name is not None:
+                    query = query.where(
+                        col(ArtifactFuzzyTermLink.artifact_id).in_(
+                            compile_tag_expression(parse_tag_expression(tag_name))
+                        )
+                    )
+                for artifact_id, term_id in session.exec(query):
+                    index = word_of_term[term_id]
+                    found = best[artifact_id]
+                    match = matches[index][term_id]
+                    if (current := found[index]) is None or match < current:
+                        found[index] = match
+            complete: list[tuple[int, int, list[tuple[int, str]]]] = []
+            for artifact_id, found in best.items():
+                words_found = [match for match in found if match is not None]
+                if len(words_found) == len(words):
+                    total = sum(distance for distance, _ in words_found)
+                    complete.append((total, -artifact_id, words_found))
+            ranked = sorted(complete, key=lambda item: item[:2])[:limit]
+            artifacts: dict[int, Artifact] = {}
+            for chunk in batched([-item[1] for item in ranked], IN_CLAUSE_CHUNK_SIZE):
+                artifacts.update(
+                    (artifact.id, artifact)
+                    for artifact in session.exec(
+                        select(Artifact).where(col(Artifact.id).in_(chunk))
+                    )
+                    if artifact.id is not None
+                )
+        return [
+            SearchHit(
+                artifacts[-negative_id],
+                rank=float(distance),
+                snippet=" ".join(
+                    "{}{}{}".format(SNIPPET_MARKERS[0], word, SNIPPET_MARKERS[1])
+                    for _, word in found
+                ),
+            )
+            for distance, negative_id, found in ranked
+        ]
+
+    @staticmethod
+    def _get_fuzzy_matches(session: Session, word: str) -> dict[int, tuple[int, str]]:
+        """Vocabulary words within the tolerated edit distance of `word`.
+
+        Returns:
+            dict[int, tuple[int, str]]: edit distance and word, by term ID
+        """
+        distance = max_edit_distance(word)
+        grams = list(term_grams(word))
+        candidates = session.exec(
+            select(FuzzyTerm.id, FuzzyTerm.term)
+            .join(FuzzyTermGram, col(FuzzyTermGram.term_id) == FuzzyTerm.id)
+            .where(
+                col(FuzzyTermGram.gram).in_(grams),
+                col(FuzzyTerm.length).between(
+                    len(word) - distance, len(word) + distance
+                ),
+            )
+            .group_by(col(FuzzyTerm.id), col(FuzzyTerm.term))
+            .having(func.count() >= min_shared_grams(word, distance))
+        ).all()
+        matches = {}
+        for term_id, candidate in candidates:
+            candidate_distance = edit_distance(word, candidate, distance)
+            if candidate_distance <= distance:
+                matches[term_id] = (candidate_distance, candidate)
+        return matches
+
+    def list_tags(self, prefix: str | None = None) -> Sequence[TagCount]:
+        """List tags in use with their artifact counts, ordered by name.
+
+        Counts come from the maintained `artifact_count` column, so the cost
+        grows with the number of tags rather than artifacts.
+
+        Args:
+            prefix (str | None): only list tags whose name starts with this
+                text, read with a range scan of the unique name index
+
+        Returns:
+            Sequence[TagCount]: tags carried by at least one artifact
+        """
+        query = (
+            select(Tag.name, Tag.artifact_count)
+            .where(Tag.artifact_count > 0)
+            .order_by(Tag.name)
+        )
+        if prefix:
+            prefix = clean_tag_name(prefix)
+            query = query.where(Tag.name >= prefix, Tag.name < prefix + "\U0010ffff")
+        with Session(self._engine) as session:
+            return [TagCount(*row) for row in session.exec(query)]
 
     def tag(self, artifact_id: int, /, *tags: Tag, remove: bool = False) -> Artifact:
-        """Updates the artifact's tags in-place. Modifies artifact.tags and updated_at.
+        """Updates the artifact's tags. Modifies artifact.tags and updated_at.
         Method either adds tags provided or removes tags provided depending on `remove`.
 
         Args:
@@ -76,55 +1604,232 @@ class DatabaseRepository:
         Returns:
             Artifact: updated artifact object
         """
-        artifact = self.get(artifact_id)
-        if artifact is None:
-            raise ArtifactNotFoundError
-
-        # get existing tags from database, to avoid duplicate tag creation
-        tag_names = {tag.name for tag in tags}
-        with Session(self._engine) as session:
-            existing_tags = session.exec(
-                select(Tag).where(Tag.name.in_(tag_names))
-            ).all()
-            existing_tags_dict = {tag.name: tag for tag in existing_tags}
-            tags_synced = tuple(existing_tags_dict.get(tag.name, tag) for tag in tags)
-
-        current_tags: dict[str, Tag] = {tag.name: tag for tag in artifact.tags}
-        incoming_tags: dict[str, Tag] = {tag.name: tag for tag in tags_synced}
+        tag_names = [tag.name for tag in tags]
         if remove:
-            updated_tags = [
-                tag
-                for tag_name, tag in current_tags.items()
-                if tag_name not in incoming_tags
-            ]
+            selected = self.tag_many([artifact_id], remove=tag_names)
         else:
-            updated_tags = list(current_tags.values())
-            for tag_name, tag in incoming_tags.items():
-                if tag_name not in current_tags:
-                    updated_tags.append(tag)
-
-        artifact.tags = updated_tags
-        self._store_artifact(artifact)
-        return artifact
+            selected = self.tag_many([artifact_id], add=tag_names)
+        if not selected:
+            raise ArtifactNotFoundError
+        return self._get_existing(artifact_id)
 
     def search(
         self,
         term: str,
         tag_name: str | None = None,
     ) -> Sequence[Artifact]:
-        results = []
-        term_lower = term.lower()
-        with Session(self._engine) as session:
-            query = select(Artifact).where(
-                or_(
-                    Artifact.title.ilike(f"%{term_lower}%"),
-                    Artifact.url.ilike(f"%{term_lower}%"),
+        return [hit.artifact for hit in self.search_ranked(term, tag_name=tag_name)]
+
+    def search_ranked(
+        self,
+        term: str,
+        tag_name: str | None = None,
+    ) -> Sequence[SearchHit]:
+        return list(self.iter_search(term, tag_name=tag_name))
+
+    def iter_search(
+        self,
+        term: str,
+        tag_name: str | None = None,
+        *,
+        sort: SortKey = SortKey.RANK,
+        after: str | None = None,
+        limit: int | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[SearchHit]:
+        """Search title, URL, summary and raw content of artifacts.
+
+        On SQLite the FTS5 index is used and, by default, hits are ordered by BM25
+        relevance, each with a snippet of the best matching column. Other backends,
+        and terms that look like URL fragments (`github.com/foo`), use a
+        case-insensitive substring match on title and URL instead, served by the
+        trigram index; there `rank` ordering degrades to ID order. Hits are
+        yielded lazily in keyset-paginated batches.
+
+        Args:
+            term (str): free text to search for; an empty term matches everything
+            tag_name (str | None): only return artifacts matching this tag name
+                or expression, e.g. `python & (perf | db) & !draft`
+            sort (SortKey): ordering of the hits
+            after (str | None): cursor of the last hit of a previous page
+            limit (int | None): maximum number of hits to yield; None for all
+            batch_size (int): number of hits fetched per query
+
+        Returns:
+            Iterator[SearchHit]: matching artifacts in `sort` order
+        """
+        phrases = self._word_phrases(term)
+        use_fts = phrases is not None
+        if use_fts:
+            any_phrase = " OR ".join(phrases)
+            fts = literal_column(FTS_TABLE)
+            content_fts = literal_column(CONTENT_FTS_TABLE)
+            fts_hits = (
+                select(
+                    artifact_fts.c.rowid.label("id"),
+                    func.bm25(fts, *FTS_WEIGHTS).label("rank"),
+                    func.snippet(
+                        fts, -1, *SNIPPET_MARKERS, SNIPPET_ELLIPSIS, SNIPPET_TOKENS
+                    ).label("snippet"),
                 )
+                .where(fts.op("MATCH")(any_phrase))
+                .subquery()
             )
-            if tag_name is not None:
-                query = query.where(Artifact.tags.any(Tag.name == tag_name))
-            results = session.exec(query).all()
-        return results
+            content_hits = (
+                select(
+                    artifact_content_fts.c.rowid.label("content_rowid"),
+                    func.bm25(content_fts, CONTENT_FTS_WEIGHT).label("rank"),
+                )
+                .where(content_fts.op("MATCH")(any_phrase))
+                .subquery()
+            )
+            # a hit's rank adds up its bm25 scores in both indexes
+            ranked = (
+                select(
+                    Artifact.id,
+                    (
+                        func.coalesce(fts_hits.c.rank, 0.0)
+                        + func.coalesce(content_hits.c.rank, 0.0)
+                    ).label("rank"),
+                    fts_hits.c.snippet,
+                    content_hits.c.content_rowid,
+                )
+                .outerjoin(fts_hits, fts_hits.c.id == Artifact.id)
+                .outerjoin(
+                    artifact_content_rows,
+                    artifact_content_rows.c.hash == Artifact.content_hash,
+                )
+                .outerjoin(
+                    content_hits,
+                    content_hits.c.content_rowid == artifact_content_rows.c.rowid,
+                )
+                .where(self._matches(term))
+                .subquery()
+            )
+            query = select(
+                Artifact, ranked.c.rank, ranked.c.snippet, ranked.c.content_rowid
+            ).join(ranked, ranked.c.id == Artifact.id)
+            if sort is SortKey.RANK:
+                sort_column = ranked.c.rank
+            else:
+                sort_column = self._sort_column(sort)
+        else:
+            query = select(Artifact).where(self._matches(term))
+            if sort is SortKey.RANK:
+                sort_column = Artifact.id
+            else:
+                sort_column = self._sort_column(sort)
+        if tag_name is not None:
+            query = query.where(self._has_tags(tag_name))
+
+        def position_of(row: Any) -> tuple[Any, int]:
+            artifact = row.Artifact if use_fts else row
+            if sort is not SortKey.RANK:
+                return getattr(artifact, sort.field), artifact.id
+            return (row.rank if use_fts else artifact.id), artifact.id
+
+        def to_hits(session: Session, rows: Sequence[Any]) -> list[SearchHit]:
+            if not use_fts:
+                return [SearchHit(artifact) for artifact in rows]
+            # the raw content index keeps no text; excerpt bodies matched there
+            bodies = self._get_contents_by_rowid(
+                session,
+                {row.content_rowid for row in rows if row.snippet is None} - {None},
+            )
+            return [
+                SearchHit(
+                    row.Artifact,
+                    row.rank,
+                    row.snippet
+                    if row.snippet is not None or row.content_rowid not in bodies
+                    else make_snippet(bodies[row.content_rowid], term),
+                )
+                for row in rows
+            ]
+
+        yield from self._iter_keyset(
+            query,
+            sort_column,
+            descending=sort.descending,
+            position=decode_cursor(sort, after) if after is not None else None,
+            position_of=position_of,
+            convert=to_hits,
+            limit=limit,
+            batch_size=batch_size,
+        )
+
+    def _word_phrases(self, term: str) -> Sequence[str] | None:
+        """FTS5 phrases for a word search, or None for a substring one."""
+        if is_substring_query(term) or not self._use_fts():
+            return None
+        return build_match_phrases(term) or None
+
+    @staticmethod
+    def _get_contents_by_rowid(
+        session: Session, rowids: Iterable[int]
+    ) -> dict[int, str]:
+        contents: dict[int, str] = {}
+        for chunk in batched(rowids, IN_CLAUSE_CHUNK_SIZE):
+            rows = session.exec(
+                select(
+                    artifact_content_rows.c.rowid,
+                    artifact_content_rows.c.codec,
+                    artifact_content_rows.c.data,
+                ).where(artifact_content_rows.c.rowid.in_(chunk))
+            )
+            contents.update(
+                (rowid, decompress(data, ContentCodec(codec)))
+                for rowid, codec, data in rows
+            )
+        return contents
+
+    def _matches(self, term: str) -> ColumnElement[bool]:
+        """Search predicate on Artifact, without ranking (see `iter_search`)."""
+        phrases = self._word_phrases(term)
+        if phrases is not None:
+            # every phrase must match the title, URL or summary, or the body
+            fts = literal_column(FTS_TABLE)
+            content_fts = literal_column(CONTENT_FTS_TABLE)
+            return and_(
+                *(
+                    or_(
+                        col(Artifact.id).in_(
+                            select(artifact_fts.c.rowid).where(fts.op("MATCH")(phrase))
+                        ),
+                        col(Artifact.content_hash).in_(
+                            select(artifact_content_rows.c.hash).where(
+                                artifact_content_rows.c.rowid.in_(
+                                    select(artifact_content_fts.c.rowid).where(
+                                        content_fts.op("MATCH")(phrase)
+                                    )
+                                )
+                            )
+                        ),
+                    )
+                    for phrase in phrases
+                )
+            )
+        trigram_match = build_trigram_query(term)
+        if trigram_match is not None and self._use_trigram():
+            trigram = literal_column(TRIGRAM_TABLE)
+            return col(Artifact.id).in_(
+                select(artifact_trigram.c.rowid).where(
+                    trigram.op("MATCH")(trigram_match)
+                )
+            )
+        # on PostgreSQL, the pg_trgm GIN indexes serve these ILIKE scans
+        term_lower = term.lower()
+        return or_(
+            col(Artifact.title).ilike(f"%{term_lower}%"),
+            col(Artifact.url).ilike(f"%{term_lower}%"),
+        )
+
+    @staticmethod
+    def _has_tags(expression: str) -> ColumnElement[bool]:
+        """Tag filter predicate on Artifact; see `parse_tag_expression`."""
+        return col(Artifact.id).in_(
+            compile_tag_expression(parse_tag_expression(expression))
+        )
 
 
 def get_repo() -> DatabaseRepository:
@@ -136,4 +1841,10 @@ def get_repo() -> DatabaseRepository:
 
     database_url = config("DATABASE_URL")
     debug = config("DEBUG", cast=bool, default=False)
-    return DatabaseRepository(database_url=database_url, echo=debug)
+    return DatabaseRepository(
+        database_url=database_url,
+        echo=debug,
+        sqlite_pragmas=get_sqlite_pragmas(),
+        pool_settings=get_pool_settings(),
+        cache_settings=get_cache_settings(),
+    )
@@ -0,0 +1,11 @@
+from enum import StrEnum
+
+
+class ArtifactTypeEnum(StrEnum):
+    ARTICLE = "article"
+    YOUTUBE = "youtube"
+
+
+class ContentCodec(StrEnum):
+    ZLIB = "zlib"
+    ZSTD = "zstd"
@@ -20,3 +20,27 @@ class ContentSummaryExistsWarning(Exception):
 
 class InvalidAPIKeyError(Exception):
     pass
+
+
+class InvalidCursorError(Exception):
+    pass
+
+
+class InvalidImportError(Exception):
+    pass
+
+
+class MissingDependencyError(Exception):
+    pass
+
+
+class InvalidTagExpressionError(Exception):
+    pass
+
+
+class HtmlCacheDisabledError(Exception):
+    pass
+
+
+class SchemaMigrationError(Exception):
+    pass
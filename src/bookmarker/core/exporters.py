@@ -0,0 +1,101 @@
+import json
+from datetime import datetime
+from enum import StrEnum
+from itertools import batched
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, NamedTuple
+
+from .exceptions import MissingDependencyError
+
+PARQUET_ROW_GROUP_SIZE = 10_000
+
+
+class ExportFormat(StrEnum):
+    JSONL = "jsonl"
+    PARQUET = "parquet"
+
+
+class ExportResult(NamedTuple):
+    count: int
+    last_updated_at: datetime | None
+
+
+class _ExportTracker:
+    """Counts rows and tracks the newest `updated_at` as rows stream past."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last_updated_at: datetime | None = None
+
+    def track(self, rows: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for row in rows:
+            self.count += 1
+            updated_at = row.get("updated_at")
+            if updated_at is not None and (
+                self.last_updated_at is None or updated_at > self.last_updated_at
+            ):
+                self.last_updated_at = updated_at
+            yield row
+
+    @property
+    def result(self) -> ExportResult:
+        return ExportResult(self.count, self.last_updated_at)
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def write_jsonl(rows: Iterable[dict[str, Any]], file: IO[str]) -> ExportResult:
+    """Write one JSON object per row, one row at a time."""
+    tracker = _ExportTracker()
+    for row in tracker.track(rows):
+        file.write(json.dumps(row, ensure_ascii=False, default=_to_json))
+        file.write("\n")
+    return tracker.result
+
+
+def write_parquet(
+    rows: Iterable[dict[str, Any]],
+    path: Path,
+    *,
+    include_content: bool = True,
+    row_group_size: int = PARQUET_ROW_GROUP_SIZE,
+) -> ExportResult:
+    """Write rows to a Parquet file, holding at most one row group in memory.
+
+    Requires the optional `pyarrow` dependency (`bookmarker-ai[parquet]`).
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise MissingDependencyError(
+            "Parquet export requires pyarrow. "
+            "Install it with `pip install 'bookmarker-ai[parquet]'`."
+        ) from None
+
+    fields = [
+        pa.field("id", pa.int64(), nullable=False),
+        pa.field("title", pa.string()),
+        pa.field("url", pa.string()),
+        pa.field("artifact_type", pa.string()),
+        pa.field("notes", pa.string()),
+        pa.field("created_at", pa.timestamp("us")),
+        pa.field("updated_at", pa.timestamp("us")),
+        pa.field("tags", pa.list_(pa.string())),
+    ]
+    if include_content:
+        fields += [
+            pa.field("content_summary", pa.string()),
+            pa.field("content_raw", pa.string()),
+        ]
+    schema = pa.schema(fields)
+
+    tracker = _ExportTracker()
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in batched(tracker.track(rows), row_group_size):
+            writer.write_table(pa.Table.from_pylist(list(batch), schema=schema))
+    return tracker.result
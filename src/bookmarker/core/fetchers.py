@@ -1,8 +1,68 @@
+import asyncio
+import codecs
+import os
+import re
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from importlib.util import find_spec
+from typing import AsyncIterator, Mapping, NamedTuple
 
+import httpx
 from trafilatura import extract, fetch_url
+from trafilatura.downloads import USER_AGENT
+from trafilatura.utils import decode_file
 
+from .config import DEFAULT_MAX_CONNECTIONS, HostSettings
+from .content import content_hash
 from .exceptions import ContentFetchError
+from .html_cache import HtmlCache
+from .models import PageValidators
+from .scheduler import HostScheduler, round_robin
+
+
+def extract_content(url: str, content: str) -> str:
+    """Extract the main text of an HTML page as markdown.
+
+    A module-level function so it can be sent to a process pool.
+    """
+    parsed = extract(
+        content,
+        include_images=True,
+        include_tables=True,
+        include_links=True,
+        output_format="markdown",
+    )
+    if parsed is None:
+        raise ContentFetchError(f"Failed to parse content from URL: {url}")
+    return parsed
+
+
+# how far into a page browsers look for a <meta> charset declaration
+META_CHARSET_PRESCAN_BYTES = 1024
+_META_CHARSET_PATTERN = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I
+)
+
+
+def decode_page(data: bytes, declared_charset: str | None = None) -> str:
+    """Decode a downloaded page to text.
+
+    Tries UTF-8, then the charset of the Content-Type header, then a <meta>
+    charset near the top of the page, and finally trafilatura's detection,
+    which its own downloader relies on.
+    """
+    candidates = ["utf-8", declared_charset]
+    meta = _META_CHARSET_PATTERN.search(data[:META_CHARSET_PRESCAN_BYTES])
+    if meta is not None:
+        candidates.append(meta.group(1).decode("ascii"))
+    for charset in candidates:
+        if charset is None:
+            continue
+        try:
+            return data.decode(codecs.lookup(charset).name)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return decode_file(data)
 
 
 class ContentFetcher(ABC):
@@ -19,22 +79,266 @@ class TrafilaturaFetcher(ContentFetcher):
         return downloaded
 
     def parse_content(self, url: str, content: str) -> str:
-        parsed = extract(
-            content,
-            include_images=True,
-            include_tables=True,
-            include_links=True,
-            output_format="markdown",
-        )
-        if parsed is None:
-            raise ContentFetchError(f"Failed to parse content from URL: {url}")
-        return parsed
+        return extract_content(url, content)
 
     def fetch(self, url: str) -> str:
         content = self.get_content(url)
         return self.parse_content(url, content)
 
 
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_REQUEST_TIMEOUT = 30.0
+DEFAULT_QUEUE_SIZE = 32
+
+
+class Page(NamedTuple):
+    """A downloaded page; content is None when it matched the validators sent."""
+
+    content: str | None
+    validators: PageValidators
+
+    @property
+    def unchanged(self) -> bool:
+        return self.content is None
+
+
+class FetchResult(NamedTuple):
+    """Outcome of one download of `AsyncHttpFetcher.fetch_many`.
+
+    Unchanged pages come back without content and are never parsed.
+    """
+
+    key: int
+    content: str | None = None
+    error: Exception | None = None
+    validators: PageValidators = PageValidators()
+    unchanged: bool = False
+
+
+class AsyncHttpFetcher(TrafilaturaFetcher):
+    """Trafilatura fetcher downloading pages over one pooled async HTTP client.
+
+    Connections are kept alive and reused across artifacts on the same host,
+    and multiplexed over HTTP/2 when the optional `h2` package is installed
+    (`bookmarker-ai[http2]`).
+
+    `fetch_many` runs as a pipeline: up to `max_connections` downloads in
+    flight on the event loop, then `parse_workers` extraction jobs in
+    `parse_executor`, a process pool for bulk runs since extraction is
+    CPU-bound. Stages hand over through queues of `queue_size`, so a slow stage
+    holds back the ones before it instead of piling up downloaded pages.
+    Without an executor, extraction runs in the loop's default thread pool.
+
+    With an `html_cache`, every downloaded page is kept on disk under its
+    hash, so `bookmarker reparse` can extract it again without a download.
+
+    Downloads start in round-robin order across hosts and each host is limited
+    by `host_settings` (see HostScheduler), so a batch dominated by one site
+    spreads its connections over the other hosts instead of hammering it.
+    Each request must complete within `timeout` seconds; time spent waiting
+    for its host doesn't count.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        http2: bool | None = None,
+        parse_executor: Executor | None = None,
+        parse_workers: int | None = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        host_settings: HostSettings | None = None,
+        html_cache: HtmlCache | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        if max_connections < 1:
+            raise ValueError("Max connections must be at least 1.")
+        self.max_connections = max_connections
+        self.max_keepalive_connections = min(max_keepalive_connections, max_connections)
+        self.timeout = timeout
+        self.http2 = find_spec("h2") is not None if http2 is None else http2
+        self.parse_executor = parse_executor
+        self.parse_workers = parse_workers or os.process_cpu_count() or 1
+        self.queue_size = queue_size
+        self.host_settings = host_settings or HostSettings()
+        self.html_cache = html_cache
+        self._transport = transport
+
+    def _client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+            ),
+            timeout=self.timeout,
+            follow_redirects=True,
+            # identify as trafilatura does when it downloads pages itself
+            headers={"User-Agent": USER_AGENT},
+            transport=self._transport,
+        )
+
+    async def get_content_async(self, client: httpx.AsyncClient, url: str) -> str:
+        page = await self.get_page_async(client, url)
+        if page.content is None:
+            raise ContentFetchError(f"No content returned from URL: {url}")
+        return page.content
+
+    async def get_page_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        validators: PageValidators | None = None,
+    ) -> Page:
+        """Download a page, conditionally if validators of a previous one exist.
+
+        A 304 response, or a page hashing the same as before, comes back as
+        unchanged, with the validators refreshed from the response.
+        """
+        validators = validators or PageValidators()
+        headers = {}
+        if validators.etag:
+            headers["If-None-Match"] = validators.etag
+        if validators.last_modified:
+            headers["If-Modified-Since"] = validators.last_modified
+        try:
+            # httpx times each phase of a request; this caps the request as a
+            # whole, so a server trickling bytes can't hold a connection forever
+            async with asyncio.timeout(self.timeout):
+                response = await client.get(url, headers=headers)
+            if response.status_code != httpx.codes.NOT_MODIFIED:
+                response.raise_for_status()
+        except (httpx.HTTPError, TimeoutError) as e:
+            raise ContentFetchError(f"Failed to get content from URL: {url}") from e
+
+        refreshed = PageValidators(
+            etag=response.headers.get("ETag", validators.etag),
+            last_modified=response.headers.get(
+                "Last-Modified", validators.last_modified
+            ),
+            page_hash=validators.page_hash,
+        )
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            return Page(None, refreshed)
+        content = decode_page(response.content, response.charset_encoding)
+        refreshed = refreshed._replace(page_hash=content_hash(content))
+        if self.html_cache is not None:
+            await asyncio.to_thread(self.html_cache.put, content)
+        if refreshed.page_hash == validators.page_hash:
+            return Page(None, refreshed)
+        return Page(content, refreshed)
+
+    async def parse_content_async(self, url: str, content: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.parse_executor, extract_content, url, content
+        )
+
+    def fetch_page(self, url: str, validators: PageValidators | None = None) -> Page:
+        """Fetch and parse a page unless it matches the validators given."""
+
+        async def main() -> Page:
+            async with self._client() as client:
+                page = await self.get_page_async(client, url, validators)
+            if page.content is None:
+                return page
+            return page._replace(
+                content=await self.parse_content_async(url, page.content)
+            )
+
+        return asyncio.run(main())
+
+    async def fetch_many(
+        self,
+        urls: Mapping[int, str],
+        validators: Mapping[int, PageValidators] | None = None,
+    ) -> AsyncIterator[FetchResult]:
+        """Fetch all URLs concurrently, yielding results as they complete.
+
+        Args:
+            urls (Mapping[int, str]): URLs to fetch, keyed by e.g. artifact ID
+            validators (Mapping[int, PageValidators] | None): validators of
+                previously fetched pages, by the same keys
+
+        Yields:
+            FetchResult: parsed content, or the exception raised for the URL
+        """
+        validators = validators or {}
+        downloaded: asyncio.Queue[tuple[int, str, str, PageValidators] | None] = (
+            asyncio.Queue(self.queue_size)
+        )
+        parsed: asyncio.Queue[FetchResult | None] = asyncio.Queue(self.queue_size)
+        # a connection slot is held until the page is queued, which bounds the
+        # number of downloaded pages waiting for a parser
+        slots = asyncio.Semaphore(self.max_connections)
+        scheduler = HostScheduler(self.host_settings)
+
+        async def download(client: httpx.AsyncClient, key: int, url: str) -> None:
+            # wait for the host first, so busy hosts don't tie up connections
+            async with scheduler.slot(client, url), slots:
+                try:
+                    page = await self.get_page_async(client, url, validators.get(key))
+                except Exception as e:
+                    await parsed.put(FetchResult(key, error=e))
+                    return
+                if page.content is None:
+                    await parsed.put(
+                        FetchResult(key, validators=page.validators, unchanged=True)
+                    )
+                    return
+                await downloaded.put((key, url, page.content, page.validators))
+
+        async def parse() -> None:
+            while (item := await downloaded.get()) is not None:
+                key, url, content, page_validators = item
+                try:
+                    result = FetchResult(
+                        key,
+                        content=await self.parse_content_async(url, content),
+                        validators=page_validators,
+                    )
+                except Exception as e:
+                    result = FetchResult(key, error=e)
+                await parsed.put(result)
+
+        async def close(
+            downloads: list[asyncio.Task], parsers: list[asyncio.Task]
+        ) -> None:
+            await asyncio.gather(*downloads)
+            for _ in parsers:
+                await downloaded.put(None)
+            await asyncio.gather(*parsers)
+            await parsed.put(None)
+
+        async with self._client() as client:
+            downloads = [
+                asyncio.create_task(download(client, key, url))
+                for key, url in round_robin(urls)
+            ]
+            parsers = [
+                asyncio.create_task(parse())
+                for _ in range(min(self.parse_workers, len(urls)))
+            ]
+            closer = asyncio.create_task(close(downloads, parsers))
+            tasks = [*downloads, *parsers, closer]
+            try:
+                while (result := await parsed.get()) is not None:
+                    yield result
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_content(self, url: str) -> str:
+        async def main() -> str:
+            async with self._client() as client:
+                return await self.get_content_async(client, url)
+
+        return asyncio.run(main())
+
+
 class YouTubeFetcher(ContentFetcher):
     def fetch(self, url: str) -> str | None:
         raise NotImplementedError(
@@ -0,0 +1,77 @@
+import re
+
+# vocabulary words are runs of 3+ letters from titles, tags and summaries
+FUZZY_GRAM_SIZE = 3
+_WORD_PATTERN = re.compile(r"[^\W\d_]{3,}")
+_MAX_TERM_LENGTH = 40
+_STOPWORDS = frozenset(
+    """
+    about after also and are been but can for from has have how its into more
+    not now one our out that the their then there these they this was were
+    what when which who why will with you your
+    """.split()
+)
+
+
+def extract_terms(*texts: str | None) -> list[str]:
+    """Lowercased vocabulary words of the given texts, in first-seen order."""
+    terms: dict[str, None] = {}
+    for text in texts:
+        if not text:
+            continue
+        for word in _WORD_PATTERN.findall(text.lower()):
+            if word not in _STOPWORDS and len(word) <= _MAX_TERM_LENGTH:
+                terms[word] = None
+    return list(terms)
+
+
+def term_grams(term: str) -> set[str]:
+    """Trigrams of a term padded with ^ and $, so word edges count too."""
+    padded = f"^{term}$"
+    return {
+        padded[i : i + FUZZY_GRAM_SIZE]
+        for i in range(len(padded) - FUZZY_GRAM_SIZE + 1)
+    }
+
+
+def max_edit_distance(term: str) -> int:
+    """Typos tolerated in a query word: none up to 3 letters, then 1, then 2."""
+    if len(term) <= 3:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+def min_shared_grams(term: str, distance: int) -> int:
+    """Lower bound of grams a vocabulary word within `distance` shares with term.
+
+    Each edit, a transposition included, changes at most FUZZY_GRAM_SIZE + 1
+    grams, so candidates sharing fewer cannot match and are never read. At least
+    one shared gram is always required, so a typo in the middle of a short word
+    (`rsut`) can go unmatched.
+    """
+    return max(1, len(term_grams(term)) - (FUZZY_GRAM_SIZE + 1) * distance)
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance of a and b, capped at limit + 1.
+
+    Insertions, deletions, substitutions and adjacent transpositions each cost
+    one. Rows stop early once every cell exceeds `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous_previous: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost
+            )
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], limit + 1)
@@ -0,0 +1,118 @@
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from .config import get_html_cache_settings
+from .content import DEFAULT_CODEC, compress, content_hash, decompress
+from .enums import ContentCodec
+
+logger = logging.getLogger(__name__)
+
+# eviction frees space down to this share of max_bytes, so a full cache is not
+# rescanned on every write
+EVICTION_LOW_WATERMARK = 0.9
+
+
+class HtmlCache:
+    """Compressed downloaded pages on disk, keyed by the SHA-256 of their text.
+
+    The key is the artifact's `page_hash`, so the page its raw content was
+    extracted from can be found again without a download. Files live in
+    `<directory>/<first two hex digits>/<hash>.<codec>` and are evicted least
+    recently used first once their total size exceeds `max_bytes`; reads
+    refresh a file's modification time.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        if max_bytes < 1:
+            raise ValueError("Cache size must be at least 1 byte.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def _path(self, page_hash: str, codec: ContentCodec) -> Path:
+        return self.directory / page_hash[:2] / f"{page_hash}.{codec}"
+
+    def _find(self, page_hash: str) -> tuple[Path, ContentCodec] | None:
+        for codec in dict.fromkeys((DEFAULT_CODEC, *ContentCodec)):
+            path = self._path(page_hash, codec)
+            if path.exists():
+                return path, codec
+        return None
+
+    def __contains__(self, page_hash: str) -> bool:
+        return self._find(page_hash) is not None
+
+    def get(self, page_hash: str) -> str | None:
+        found = self._find(page_hash)
+        if found is None:
+            return None
+        path, codec = found
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            # evicted by another process in the meantime
+            return None
+        return decompress(data, codec)
+
+    def put(self, page: str) -> str:
+        """Store a page unless already cached; return its hash."""
+        page_hash = content_hash(page)
+        if page_hash in self:
+            return page_hash
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+        path = self._path(page_hash, DEFAULT_CODEC)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = compress(page, DEFAULT_CODEC)
+        # write then rename, so readers never see a partial file
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(data)
+        os.replace(file.name, path)
+        with self._lock:
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+        return page_hash
+
+    def _files(self) -> list[Path]:
+        return [path for path in self.directory.glob("??/*.*") if path.is_file()]
+
+    def _scan_size(self) -> int:
+        if not self.directory.exists():
+            return 0
+        return sum(path.stat().st_size for path in self._files())
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        target = self.max_bytes * EVICTION_LOW_WATERMARK
+        evicted = 0
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+            evicted += 1
+        self._size = size
+        logger.debug(f"Evicted {evicted} pages from the HTML cache.")
+
+
+def get_html_cache() -> HtmlCache | None:
+    """HTML cache from the configuration, or None if it is disabled."""
+    settings = get_html_cache_settings()
+    if settings.size_mb <= 0:
+        return None
+    return HtmlCache(settings.directory, settings.size_mb * 1024 * 1024)
@@ -0,0 +1,221 @@
+import csv
+import json
+import logging
+from datetime import datetime, timezone
+from enum import StrEnum
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, NamedTuple
+
+from .exceptions import InvalidImportError
+from .tags import clean_tag_name
+
+logger = logging.getLogger(__name__)
+
+HTML_CHUNK_SIZE = 64 * 1024
+TITLE_MAX_LENGTH = 200
+TAG_NAME_MAX_LENGTH = 20
+# Pocket's CSV export separates tags with "|"; other tools use commas
+TAG_SEPARATORS = ("|", ",")
+
+
+class ImportFormat(StrEnum):
+    HTML = "html"
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+FORMAT_SUFFIXES = {
+    ".html": ImportFormat.HTML,
+    ".htm": ImportFormat.HTML,
+    ".csv": ImportFormat.CSV,
+    ".jsonl": ImportFormat.JSONL,
+    ".ndjson": ImportFormat.JSONL,
+}
+
+
+class ImportRecord(NamedTuple):
+    """One bookmark read from an import file, ready for `repo.bulk_add`."""
+
+    title: str
+    url: str
+    tags: tuple[str, ...] = ()
+    notes: str | None = None
+    created_at: datetime | None = None
+
+
+def make_record(
+    url: Any,
+    title: Any = None,
+    tags: Iterable[str] = (),
+    notes: Any = None,
+    created_at: Any = None,
+) -> ImportRecord | None:
+    """Clean raw field values; return None when the bookmark has no usable URL."""
+    url = str(url or "").strip()
+    if len(url) < 5:
+        return None
+    title = str(title or "").strip() or url
+    tag_names = dict.fromkeys(
+        clean_tag_name(tag)[:TAG_NAME_MAX_LENGTH] for tag in tags if tag.strip()
+    )
+    return ImportRecord(
+        title=title[:TITLE_MAX_LENGTH],
+        url=url,
+        tags=tuple(tag_names),
+        notes=(str(notes).strip() or None) if notes else None,
+        created_at=parse_timestamp(created_at),
+    )
+
+
+def split_tags(value: Any) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, list):
+        return [str(tag) for tag in value]
+    value = str(value)
+    for separator in TAG_SEPARATORS:
+        if separator in value:
+            return value.split(separator)
+    return [value]
+
+
+def parse_timestamp(value: Any) -> datetime | None:
+    """Read a Unix timestamp (browser and Pocket exports) or an ISO 8601 string."""
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.fromtimestamp(int(value), tz=timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class _BookmarkHTMLParser(HTMLParser):
+    """Collects `<A HREF=...>` links of a Netscape bookmark file as they are fed."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[ImportRecord] = []
+        self._link: dict[str, str | None] | None = None
+        self._title: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "a":
+            self._link = dict(attrs)
+            self._title = []
+
+    def handle_data(self, data: str) -> None:
+        if self._link is not None:
+            self._title.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != "a" or self._link is None:
+            return
+        link, self._link = self._link, None
+        record = make_record(
+            url=link.get("href"),
+            title="".join(self._title),
+            tags=split_tags(link.get("tags")),
+            created_at=link.get("add_date") or link.get("time_added"),
+        )
+        if record is not None:
+            self.records.append(record)
+
+
+def parse_html(file: IO[str]) -> Iterator[ImportRecord]:
+    """Parse a Netscape bookmark file, as exported by browsers and Pocket."""
+    parser = _BookmarkHTMLParser()
+    while chunk := file.read(HTML_CHUNK_SIZE):
+        parser.feed(chunk)
+        yield from parser.records
+        parser.records.clear()
+    parser.close()
+    yield from parser.records
+
+
+def parse_csv(file: IO[str]) -> Iterator[ImportRecord]:
+    """Parse a CSV file with a `url` column and optional title/tags/notes/date."""
+    reader = csv.DictReader(file)
+    if reader.fieldnames is None or "url" not in reader.fieldnames:
+        raise InvalidImportError("CSV file needs a header row with a `url` column.")
+    for row in reader:
+        record = make_record(
+            url=row.get("url"),
+            title=row.get("title"),
+            tags=split_tags(row.get("tags")),
+            notes=row.get("notes"),
+            created_at=row.get("created_at") or row.get("time_added"),
+        )
+        if record is None:
+            logger.warning(f"Skipping CSV row {reader.line_num}: no URL.")
+            continue
+        yield record
+
+
+def parse_jsonl(file: IO[str]) -> Iterator[ImportRecord]:
+    """Parse one JSON object per line with a `url` key and optional fields."""
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Skipping JSONL line {line_number}: invalid JSON.")
+            continue
+        record = (
+            make_record(
+                url=item.get("url"),
+                title=item.get("title"),
+                tags=split_tags(item.get("tags")),
+                notes=item.get("notes"),
+                created_at=item.get("created_at"),
+            )
+            if isinstance(item, dict)
+            else None
+        )
+        if record is None:
+            logger.warning(f"Skipping JSONL line {line_number}: no URL.")
+            continue
+        yield record
+
+
+PARSERS = {
+    ImportFormat.HTML: parse_html,
+    ImportFormat.CSV: parse_csv,
+    ImportFormat.JSONL: parse_jsonl,
+}
+
+
+def detect_format(path: Path) -> ImportFormat:
+    try:
+        return FORMAT_SUFFIXES[path.suffix.lower()]
+    except KeyError:
+        raise InvalidImportError(
+            f"Cannot tell the format of '{path.name}'; pass --format."
+        ) from None
+
+
+def iter_import_records(
+    path: Path, import_format: ImportFormat | None = None
+) -> Iterator[ImportRecord]:
+    """Stream bookmarks from an export file without reading it into memory.
+
+    Args:
+        path (Path): bookmark HTML, CSV or JSONL file
+        import_format (ImportFormat | None): file format; detected from the
+            suffix when None
+
+    Returns:
+        Iterator[ImportRecord]: bookmarks in file order; entries without a URL
+            are skipped
+    """
+    if import_format is None:
+        import_format = detect_format(path)
+    parse = PARSERS[import_format]
+    with path.open(encoding="utf-8-sig", newline="") as file:
+        yield from parse(file)
@@ -1,12 +1,11 @@
 from .config import set_up_logging
 from .database import get_repo
 
-set_up_logging()
-
 
 def main():
+    set_up_logging()
     repo = get_repo()
-    repo.create_db_and_tables()
+    repo.ensure_schema()
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,24 +1,37 @@
-import re
 from datetime import datetime, timezone
-from enum import StrEnum
+from typing import NamedTuple
 
 from pydantic import ConfigDict, field_validator
-from sqlalchemy import Column
+from sqlalchemy import Column, Index
 from sqlalchemy import Enum as SaEnum
 from sqlmodel import Field, Relationship, SQLModel
 
+from .enums import ArtifactTypeEnum, ContentCodec
+from .tags import clean_tag_name
+
 
 def enum_column(enum_cls):
     """A SQLAlchemy column that properly returns ENUM values instead of labels"""
     return Column(SaEnum(enum_cls, values_callable=lambda x: [e.value for e in x]))
 
 
-class ArtifactTypeEnum(StrEnum):
-    ARTICLE = "article"
-    YOUTUBE = "youtube"
+class ArtifactContent(SQLModel, table=True):
+    """Compressed article body, shared by every artifact with identical content."""
+
+    __tablename__ = "artifact_content"
+
+    hash: str = Field(primary_key=True, max_length=64)
+    codec: ContentCodec = Field(sa_column=enum_column(ContentCodec))
+    size: int
+    data: bytes
 
 
 class ArtifactTagLink(SQLModel, table=True):
+    # the primary key leads with artifact_id; tag filters look up by tag first
+    __table_args__ = (
+        Index("ix_artifacttaglink_tag_id_artifact_id", "tag_id", "artifact_id"),
+    )
+
     artifact_id: int | None = Field(
         default=None, foreign_key="artifact.id", primary_key=True
     )
@@ -26,17 +39,33 @@ class ArtifactTagLink(SQLModel, table=True):
 
 
 class Artifact(SQLModel, table=True):
+    # composite keys back keyset pagination on (sort column, id)
+    __table_args__ = (
+        Index("ix_artifact_created_at_id", "created_at", "id"),
+        Index("ix_artifact_title_id", "title", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     title: str = Field(index=True, min_length=1, max_length=200)
     url: str = Field(index=True, min_length=5)
+    # duplicate key for url, see core.urls.normalize_url; set by the repository
+    url_normalized: str | None = Field(default=None, unique=True, index=True)
     artifact_type: ArtifactTypeEnum = Field(
         default=ArtifactTypeEnum.ARTICLE, sa_column=enum_column(ArtifactTypeEnum)
     )
     notes: str | None = None
-    content_raw: str | None = None
+    # raw content lives in artifact_content; load it with repo.get_content_raw()
+    content_hash: str | None = Field(
+        default=None, foreign_key="artifact_content.hash", index=True
+    )
+    # HTTP validators of the page raw content came from; see PageValidators
+    http_etag: str | None = None
+    http_last_modified: str | None = None
+    page_hash: str | None = Field(default=None, max_length=64)
     content_summary: str | None = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime | None = None
+    # indexed for incremental exports (`bookmarker export --since`)
+    updated_at: datetime | None = Field(default=None, index=True)
 
     tags: list["Tag"] = Relationship(
         back_populates="artifacts",
@@ -49,7 +78,9 @@ class Artifact(SQLModel, table=True):
 
 class Tag(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    name: str = Field(index=True, min_length=1, max_length=20)
+    name: str = Field(unique=True, index=True, min_length=1, max_length=20)
+    # maintained by DatabaseRepository whenever links change
+    artifact_count: int = Field(default=0)
 
     artifacts: list["Artifact"] = Relationship(
         back_populates="tags", link_model=ArtifactTagLink
@@ -58,8 +89,81 @@ class Tag(SQLModel, table=True):
     @field_validator("name", mode="before")
     @classmethod
     def clean_tag_name(cls, value: str) -> str:
-        value = value.strip().lower()
-        value = re.sub(r"\s+", "-", value)
-        return value
+        return clean_tag_name(value)
 
     model_config = ConfigDict(validate_assignment=True)
+
+
+class FuzzyTerm(SQLModel, table=True):
+    """Word of the fuzzy search vocabulary; see core.fuzzy."""
+
+    __tablename__ = "fuzzy_term"
+
+    id: int | None = Field(default=None, primary_key=True)
+    term: str = Field(unique=True, index=True)
+    length: int
+
+
+class FuzzyTermGram(SQLModel, table=True):
+    """Trigram posting of a vocabulary word; the primary key leads with gram."""
+
+    __tablename__ = "fuzzy_term_gram"
+
+    gram: str = Field(primary_key=True)
+    term_id: int = Field(foreign_key="fuzzy_term.id", primary_key=True)
+
+
+class ArtifactFuzzyTermLink(SQLModel, table=True):
+    """Vocabulary words of an artifact's title, tags and summary."""
+
+    __tablename__ = "artifact_fuzzy_term"
+    __table_args__ = (
+        Index("ix_artifact_fuzzy_term_term_id_artifact_id", "term_id", "artifact_id"),
+    )
+
+    artifact_id: int = Field(foreign_key="artifact.id", primary_key=True)
+    term_id: int = Field(foreign_key="fuzzy_term.id", primary_key=True)
+
+
+class PageValidators(NamedTuple):
+    """Validators of a downloaded page, sent back to skip unchanged re-fetches.
+
+    `page_hash` is the SHA-256 of the page itself, not of the extracted text,
+    so an unchanged page is recognized before extraction.
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+    page_hash: str | None = None
+
+
+class PageRecord(NamedTuple):
+    """Artifact whose raw content was extracted from a downloaded page."""
+
+    id: int
+    url: str
+    validators: PageValidators
+    content_hash: str | None
+
+
+class TagCount(NamedTuple):
+    name: str
+    artifact_count: int
+
+
+class ArtifactListItem(NamedTuple):
+    """Lightweight artifact row for listings; never carries content bodies."""
+
+    id: int
+    title: str
+    artifact_type: ArtifactTypeEnum
+    url: str
+    created_at: datetime
+    tags: tuple[str, ...]
+    is_fetched: bool
+    is_summarized: bool
+
+
+class BulkAddResult(NamedTuple):
+    added: int
+    skipped: int
@@ -0,0 +1,74 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from .exceptions import InvalidCursorError
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class SortKey(StrEnum):
+    CREATED = "created"
+    CREATED_DESC = "-created"
+    ID = "id"
+    ID_DESC = "-id"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+    RANK = "rank"
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+    @property
+    def field(self) -> str:
+        return {
+            "created": "created_at",
+            "id": "id",
+            "title": "title",
+            "rank": "rank",
+        }[self.value.lstrip("-")]
+
+
+def encode_cursor(sort: SortKey, value: Any, row_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort.value, value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort: SortKey, cursor: str) -> tuple[Any, int]:
+    """Decode a cursor produced by `encode_cursor` for the same sort key.
+
+    Returns:
+        tuple[Any, int]: sort value and ID of the last row of the previous page
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if sort_value != sort.value or not isinstance(row_id, int):
+            raise ValueError
+        if sort.field == "created_at":
+            value = datetime.fromisoformat(value)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor for sort '{sort}': {cursor}") from e
+    return value, row_id
+
+
+def cursor_for(sort: SortKey, row: Any) -> str:
+    """Build the cursor that resumes a listing right after `row`.
+
+    Accepts listing items, artifacts and search hits. Rank cursors of hits found
+    without the full-text index fall back to the artifact ID.
+    """
+    source = getattr(row, "artifact", row)
+    if sort is SortKey.RANK:
+        value = getattr(row, "rank", None)
+        if value is None:
+            value = source.id
+    else:
+        value = getattr(source, sort.field)
+    return encode_cursor(sort, value, source.id)
@@ -0,0 +1,66 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+
+@dataclass
+class PoolStats:
+    """Running totals of how long threads waited to check out a connection."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+    def record(self, wait: float, *, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> "PoolStats":
+        with self._lock:
+            return PoolStats(
+                checkouts=self.checkouts,
+                timeouts=self.timeouts,
+                total_wait=self.total_wait,
+                max_wait=self.max_wait,
+            )
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait times in `stats`."""
+
+    def __init__(self, *args: Any, stats: PoolStats | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = stats if stats is not None else PoolStats()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # keep accumulating into the same stats when the engine is disposed
+        pool = cast(InstrumentedQueuePool, super().recreate())
+        pool.stats = self.stats
+        return pool
@@ -0,0 +1,112 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncGenerator, Callable, Mapping
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from .config import HostSettings
+
+# a site asking for longer pauses than this is still fetched at this pace
+MAX_CRAWL_DELAY = 30.0
+
+
+def host_of(url: str) -> str:
+    """Host and port of a URL, the unit the scheduler spreads load over."""
+    return urlsplit(url).netloc.lower()
+
+
+def round_robin[K](urls: Mapping[K, str]) -> list[tuple[K, str]]:
+    """Interleave URLs by host, so each host gets a turn before any gets two."""
+    by_host: dict[str, deque[tuple[K, str]]] = {}
+    for key, url in urls.items():
+        by_host.setdefault(host_of(url), deque()).append((key, url))
+    ordered = []
+    queues = deque(by_host.values())
+    while queues:
+        queue = queues.popleft()
+        ordered.append(queue.popleft())
+        if queue:
+            queues.append(queue)
+    return ordered
+
+
+@dataclass
+class _HostState:
+    slots: asyncio.Semaphore
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    next_start: float = 0.0
+    delay: float | None = None
+
+
+class HostScheduler:
+    """Per-host politeness for bulk downloads on one event loop.
+
+    Requests to a host are capped at `max_per_host` at a time and started at
+    least `delay` seconds apart, stretched to the host's robots.txt
+    Crawl-delay when `respect_robots` is set. robots.txt is fetched once per
+    host and cached for the scheduler's lifetime. Requests waiting on a busy
+    host hold no connection, so other hosts keep the pool busy.
+
+    Create one scheduler per run; its locks belong to the running event loop.
+    """
+
+    def __init__(
+        self,
+        settings: HostSettings,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if settings.max_per_host < 1:
+            raise ValueError("Max requests per host must be at least 1.")
+        self.settings = settings
+        self._clock = clock
+        self._hosts: dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(
+                asyncio.Semaphore(self.settings.max_per_host)
+            )
+        return self._hosts[host]
+
+    async def host_delay(self, client: httpx.AsyncClient, url: str) -> float:
+        """Minimum seconds between request starts to the host of url."""
+        state = self._state(host_of(url))
+        if state.delay is None:
+            crawl_delay = 0.0
+            if self.settings.respect_robots:
+                crawl_delay = await self._crawl_delay(client, url)
+            state.delay = max(self.settings.delay, crawl_delay)
+        return state.delay
+
+    async def _crawl_delay(self, client: httpx.AsyncClient, url: str) -> float:
+        parts = urlsplit(url)
+        try:
+            response = await client.get(f"{parts.scheme}://{parts.netloc}/robots.txt")
+        except httpx.HTTPError:
+            return 0.0
+        if response.status_code != 200:
+            return 0.0
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+        delay = parser.crawl_delay(client.headers.get("User-Agent", "*"))
+        return min(float(delay or 0), MAX_CRAWL_DELAY)
+
+    @asynccontextmanager
+    async def slot(self, client: httpx.AsyncClient, url: str) -> AsyncGenerator[None]:
+        """Wait for a turn at the host of url and hold it for the request."""
+        state = self._state(host_of(url))
+        async with state.slots:
+            async with state.lock:
+                # fetching robots.txt under the lock makes the host's other
+                # requests wait for it instead of racing ahead
+                delay = await self.host_delay(client, url)
+                wait = state.next_start - self._clock()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                state.next_start = self._clock() + delay
+            yield
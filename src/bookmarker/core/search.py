@@ -0,0 +1,315 @@
+import re
+from typing import Mapping, NamedTuple
+
+from sqlalchemy import Connection, column, select, table, text
+
+from .content import decompress
+from .models import Artifact, ContentCodec
+
+FTS_TABLE = "artifact_fts"
+FTS_COLUMNS = ("title", "url", "content_summary")
+# bm25 weights, in FTS_COLUMNS order: a title hit outranks a hit in the summary
+FTS_WEIGHTS = (10.0, 5.0, 2.0)
+SNIPPET_MARKERS = ("**", "**")
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 12
+FTS_INDEX_BATCH_SIZE = 500
+
+artifact_fts = table(FTS_TABLE, column("rowid"))
+
+_FTS_COLUMN_LIST = ", ".join(FTS_COLUMNS)
+_FTS_OLD_VALUES = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+_FTS_NEW_VALUES = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+
+# external content table: the index reads title, url and summary back from
+# artifact, and plain SQL triggers keep it in sync
+FTS_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_FTS_COLUMN_LIST},
+        content='artifact', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON artifact BEGIN
+        INSERT INTO {FTS_TABLE} (rowid, {_FTS_COLUMN_LIST})
+        VALUES (new.id, {_FTS_NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON artifact BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_FTS_COLUMN_LIST})
+        VALUES ('delete', old.id, {_FTS_OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF {_FTS_COLUMN_LIST} ON artifact BEGIN
+        INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rowid, {_FTS_COLUMN_LIST})
+        VALUES ('delete', old.id, {_FTS_OLD_VALUES});
+        INSERT INTO {FTS_TABLE} (rowid, {_FTS_COLUMN_LIST})
+        VALUES (new.id, {_FTS_NEW_VALUES});
+    END
+    """,
+)
+
+# raw content: a contentless index keyed by the rowid of the artifact_content
+# blob, so a body is indexed once however many artifacts share it and is never
+# stored a second time uncompressed. Blobs are immutable; the repository
+# indexes one as it is created and removes it as the blob is released.
+CONTENT_FTS_TABLE = "artifact_content_fts"
+CONTENT_FTS_WEIGHT = 1.0
+
+artifact_content_fts = table(CONTENT_FTS_TABLE, column("rowid"))
+# artifact_content with its implicit rowid, which keys the raw content index
+artifact_content_rows = table(
+    "artifact_content", column("rowid"), column("hash"), column("codec"), column("data")
+)
+
+CONTENT_FTS_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {CONTENT_FTS_TABLE} USING fts5(
+        content_raw, content=''
+    )
+    """,
+)
+
+
+# substring index over title and url: FTS5 trigram tokenizer on SQLite (3.34+),
+# pg_trgm GIN indexes on PostgreSQL, where they serve ILIKE '%term%' directly
+TRIGRAM_TABLE = "artifact_trigram"
+TRIGRAM_COLUMNS = ("title", "url")
+TRIGRAM_MIN_LENGTH = 3
+
+artifact_trigram = table(TRIGRAM_TABLE, column("rowid"))
+
+_TRIGRAM_COLUMN_LIST = ", ".join(TRIGRAM_COLUMNS)
+_TRIGRAM_OLD_VALUES = ", ".join(f"old.{c}" for c in TRIGRAM_COLUMNS)
+_TRIGRAM_NEW_VALUES = ", ".join(f"new.{c}" for c in TRIGRAM_COLUMNS)
+
+# external content table: the index reads title and url back from artifact
+TRIGRAM_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TRIGRAM_TABLE} USING fts5(
+        {_TRIGRAM_COLUMN_LIST},
+        content='artifact', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TRIGRAM_TABLE}_ai AFTER INSERT ON artifact BEGIN
+        INSERT INTO {TRIGRAM_TABLE} (rowid, {_TRIGRAM_COLUMN_LIST})
+        VALUES (new.id, {_TRIGRAM_NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TRIGRAM_TABLE}_ad AFTER DELETE ON artifact BEGIN
+        INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}, rowid, {_TRIGRAM_COLUMN_LIST})
+        VALUES ('delete', old.id, {_TRIGRAM_OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {TRIGRAM_TABLE}_au
+    AFTER UPDATE OF {_TRIGRAM_COLUMN_LIST} ON artifact BEGIN
+        INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}, rowid, {_TRIGRAM_COLUMN_LIST})
+        VALUES ('delete', old.id, {_TRIGRAM_OLD_VALUES});
+        INSERT INTO {TRIGRAM_TABLE} (rowid, {_TRIGRAM_COLUMN_LIST})
+        VALUES (new.id, {_TRIGRAM_NEW_VALUES});
+    END
+    """,
+)
+
+PG_TRIGRAM_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    *(
+        f"CREATE INDEX IF NOT EXISTS ix_artifact_{c}_trgm "
+        f"ON artifact USING gin ({c} gin_trgm_ops)"
+        for c in TRIGRAM_COLUMNS
+    ),
+)
+
+# punctuation that marks a URL or path fragment rather than words
+_SUBSTRING_QUERY_PATTERN = re.compile(r"\S*[./:?=&#@]\S*")
+
+
+class SearchHit(NamedTuple):
+    artifact: Artifact
+    rank: float | None = None
+    snippet: str | None = None
+
+
+def _table_exists(connection: Connection, name: str) -> bool:
+    statement = text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    )
+    return connection.execute(statement, {"name": name}).first() is not None
+
+
+def fts_index_exists(connection: Connection) -> bool:
+    return _table_exists(connection, FTS_TABLE) and _table_exists(
+        connection, CONTENT_FTS_TABLE
+    )
+
+
+def create_fts_index(connection: Connection) -> None:
+    """Create the FTS5 tables and their sync triggers; index rows on first run."""
+    new_fts = not _table_exists(connection, FTS_TABLE)
+    new_content_fts = not _table_exists(connection, CONTENT_FTS_TABLE)
+    for statement in (*FTS_DDL, *CONTENT_FTS_DDL):
+        connection.execute(text(statement))
+    if new_fts:
+        connection.execute(
+            text(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('rebuild')")
+        )
+    if new_content_fts:
+        blobs = connection.execute(
+            select(
+                artifact_content_rows.c.rowid,
+                artifact_content_rows.c.codec,
+                artifact_content_rows.c.data,
+            )
+        )
+        for rows in blobs.partitions(FTS_INDEX_BATCH_SIZE):
+            index_contents(
+                connection,
+                {
+                    rowid: decompress(data, ContentCodec(codec))
+                    for rowid, codec, data in rows
+                },
+            )
+
+
+def index_contents(connection: Connection, contents: Mapping[int, str]) -> None:
+    """Add bodies, keyed by artifact_content rowid, to the raw content index."""
+    if not contents:
+        return
+    connection.execute(
+        text(
+            f"INSERT INTO {CONTENT_FTS_TABLE} (rowid, content_raw) VALUES (:id, :body)"
+        ),
+        [{"id": rowid, "body": body} for rowid, body in contents.items()],
+    )
+
+
+def unindex_contents(connection: Connection, contents: Mapping[int, str]) -> None:
+    """Remove bodies from the raw content index; needs the text that was indexed."""
+    if not contents:
+        return
+    connection.execute(
+        text(
+            f"INSERT INTO {CONTENT_FTS_TABLE} ({CONTENT_FTS_TABLE}, rowid, content_raw) "
+            "VALUES ('delete', :id, :body)"
+        ),
+        [{"id": rowid, "body": body} for rowid, body in contents.items()],
+    )
+
+
+def trigram_index_exists(connection: Connection) -> bool:
+    statement = text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+    )
+    return connection.execute(statement, {"name": TRIGRAM_TABLE}).first() is not None
+
+
+def create_trigram_index(connection: Connection) -> None:
+    """Create the substring index on title and url for SQLite or PostgreSQL."""
+    if connection.dialect.name == "postgresql":
+        for statement in PG_TRIGRAM_DDL:
+            connection.execute(text(statement))
+        return
+    is_new = not trigram_index_exists(connection)
+    for statement in TRIGRAM_DDL:
+        connection.execute(text(statement))
+    if is_new:
+        connection.execute(
+            text(f"INSERT INTO {TRIGRAM_TABLE} ({TRIGRAM_TABLE}) VALUES ('rebuild')")
+        )
+
+
+def build_match_phrases(term: str) -> list[str]:
+    """Translate free text into FTS5 phrases, all of which a hit must match.
+
+    Each whitespace-separated word becomes a quoted prefix phrase, so user input
+    never reaches the FTS5 query syntax and `pyth` still matches `python`.
+    Returns an empty list when the term holds nothing searchable.
+    """
+    return [
+        '"{}"*'.format(word.replace('"', '""'))
+        for word in term.split()
+        if re.search(r"\w", word)
+    ]
+
+
+_WORD_PATTERN = re.compile(r"\w+")
+# characters tokenized on either side of the first match when building a snippet
+_SNIPPET_REACH = 80 * SNIPPET_TOKENS
+
+
+def make_snippet(text: str, term: str) -> str | None:
+    """Excerpt of `text` around the first word matching a word of `term`.
+
+    Mirrors the FTS5 `snippet()` output for the raw content index, which keeps
+    no text to build one from: SNIPPET_TOKENS words, matches wrapped in
+    SNIPPET_MARKERS, and SNIPPET_ELLIPSIS where the excerpt cuts the text.
+    Only the text around the match is tokenized, so long bodies stay cheap.
+    """
+    prefixes = tuple(w.lower() for w in _WORD_PATTERN.findall(term))
+    if not prefixes:
+        return None
+    pattern = re.compile(
+        r"(?<!\w)(?:{})".format("|".join(map(re.escape, prefixes))), re.IGNORECASE
+    )
+    match = pattern.search(text)
+    if match is None:
+        return None
+    low = max(0, match.start() - _SNIPPET_REACH)
+    high = min(len(text), match.start() + _SNIPPET_REACH)
+    words = [
+        w
+        for w in _WORD_PATTERN.finditer(text, low, high)
+        # drop words cut by the bounds of the window
+        if (w.start() > low or low == 0 or not _WORD_PATTERN.match(text, low - 1))
+        and (w.end() < high or not _WORD_PATTERN.match(text, high))
+    ]
+    first = next(i for i, w in enumerate(words) if w.start() == match.start())
+    start = max(0, min(first - SNIPPET_TOKENS // 4, len(words) - SNIPPET_TOKENS))
+    window = words[start : start + SNIPPET_TOKENS]
+    opening, closing = SNIPPET_MARKERS
+    position = window[0].start()
+    parts = [SNIPPET_ELLIPSIS] if _WORD_PATTERN.search(text, 0, position) else []
+    for word in window:
+        parts.append(text[position : word.start()])
+        if word.group().lower().startswith(prefixes):
+            parts.append(f"{opening}{word.group()}{closing}")
+        else:
+            parts.append(word.group())
+        position = word.end()
+    if _WORD_PATTERN.search(text, position):
+        parts.append(SNIPPET_ELLIPSIS)
+    else:
+        parts.append(text[position:])
+    return "".join(parts)
+
+
+def is_substring_query(term: str) -> bool:
+    """Whether a term reads as a URL or path fragment, like `github.com/foo`.
+
+    Word tokenizers split such terms at the punctuation, so they are matched as
+    substrings of title and URL instead.
+    """
+    term = term.strip()
+    return (
+        len(term) >= TRIGRAM_MIN_LENGTH
+        and _SUBSTRING_QUERY_PATTERN.fullmatch(term) is not None
+    )
+
+
+def build_trigram_query(term: str) -> str | None:
+    """Translate a substring into an FTS5 MATCH expression for the trigram index.
+
+    The whole term becomes one quoted phrase, which the trigram tokenizer
+    matches anywhere in title or URL, ignoring case. Returns None for terms
+    shorter than a trigram, which the index cannot serve.
+    """
+    if len(term) < TRIGRAM_MIN_LENGTH:
+        return None
+    return '"{}"'.format(term.replace('"', '""'))
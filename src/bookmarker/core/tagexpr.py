@@ -0,0 +1,165 @@
+import re
+from typing import Any, NamedTuple
+
+from sqlalchemy import CompoundSelect, Select, except_, intersect, select, union
+from sqlmodel import col
+
+from .exceptions import InvalidTagExpressionError
+from .models import Artifact, ArtifactTagLink, Tag, clean_tag_name
+
+_TOKEN_PATTERN = re.compile(r"\s*(?:([&|!()])|([^\s&|!()]+))")
+
+
+class TagName(NamedTuple):
+    name: str
+
+
+class TagAnd(NamedTuple):
+    items: tuple[Any, ...]
+
+
+class TagOr(NamedTuple):
+    items: tuple[Any, ...]
+
+
+class TagNot(NamedTuple):
+    item: Any
+
+
+type TagExpression = TagName | TagAnd | TagOr | TagNot
+
+
+def _tokenize(expression: str) -> list[str]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise InvalidTagExpressionError(f"Invalid tag expression: {expression!r}")
+        tokens.append(match.group(1) or match.group(2))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over: or := and ('|' and)*; and := not ('&' not)*;
+    not := '!' not | '(' or ')' | NAME."""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def error(self, message: str) -> InvalidTagExpressionError:
+        return InvalidTagExpressionError(
+            f"Invalid tag expression {self.expression!r}: {message}"
+        )
+
+    def peek(self) -> str | None:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def take(self) -> str | None:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> TagExpression:
+        if not self.tokens:
+            raise self.error("it is empty")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise self.error(f"unexpected {self.peek()!r}")
+        return node
+
+    def parse_or(self) -> TagExpression:
+        items = [self.parse_and()]
+        while self.peek() == "|":
+            self.take()
+            items.append(self.parse_and())
+        return items[0] if len(items) == 1 else TagOr(tuple(items))
+
+    def parse_and(self) -> TagExpression:
+        items = [self.parse_not()]
+        while self.peek() == "&":
+            self.take()
+            items.append(self.parse_not())
+        return items[0] if len(items) == 1 else TagAnd(tuple(items))
+
+    def parse_not(self) -> TagExpression:
+        token = self.take()
+        if token == "!":
+            return TagNot(self.parse_not())
+        if token == "(":
+            node = self.parse_or()
+            if self.take() != ")":
+                raise self.error("missing ')'")
+            return node
+        if token is None:
+            raise self.error("it ends too early")
+        if token in "&|)":
+            raise self.error(f"unexpected {token!r}")
+        return TagName(clean_tag_name(token))
+
+
+def parse_tag_expression(expression: str) -> TagExpression:
+    """Parse a boolean tag filter such as `python & (perf | db) & !draft`.
+
+    `&` binds tighter than `|`, `!` negates, and parentheses group. A single
+    tag name is a valid expression. Names are cleaned like Tag names.
+
+    Raises:
+        InvalidTagExpressionError: if the expression is malformed
+    """
+    return _Parser(expression).parse()
+
+
+def _as_select(query: Select | CompoundSelect) -> Select:
+    # SQLite rejects parenthesized compound selects nested in one another
+    if isinstance(query, CompoundSelect):
+        return select(query.subquery().c.artifact_id)
+    return query
+
+
+def compile_tag_expression(node: TagExpression) -> Select:
+    """Compile a parsed tag filter to a SELECT of matching artifact IDs.
+
+    Each tag becomes a lookup on the (tag_id, artifact_id) index of the link
+    table, combined with INTERSECT, UNION and EXCEPT; no per-artifact subquery
+    is evaluated.
+    """
+    match node:
+        case TagName(name):
+            return select(col(ArtifactTagLink.artifact_id)).where(
+                col(ArtifactTagLink.tag_id).in_(
+                    select(col(Tag.id)).where(col(Tag.name) == name)
+                )
+            )
+        case TagOr(items):
+            return _as_select(union(*(compile_tag_expression(i) for i in items)))
+        case TagNot(item):
+            return _as_select(
+                except_(
+                    select(col(Artifact.id).label("artifact_id")),
+                    compile_tag_expression(item),
+                )
+            )
+        case TagAnd(items):
+            included = [
+                compile_tag_expression(i) for i in items if not isinstance(i, TagNot)
+            ]
+            excluded = [
+                compile_tag_expression(i.item) for i in items if isinstance(i, TagNot)
+            ]
+            if not included:
+                query = select(col(Artifact.id).label("artifact_id"))
+            elif len(included) == 1:
+                query = included[0]
+            else:
+                query = _as_select(intersect(*included))
+            if excluded:
+                query = _as_select(except_(query, *excluded))
+            return query
+    raise TypeError(f"Not a tag expression: {node!r}")
@@ -0,0 +1,8 @@
+import re
+
+
+def clean_tag_name(value: str) -> str:
+    """Lowercase a tag name and replace whitespace runs with hyphens."""
+    value = value.strip().lower()
+    value = re.sub(r"\s+", "-", value)
+    return value
@@ -0,0 +1,52 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# query parameters that only track where a click came from
+TRACKING_PARAM_PREFIXES = ("utm_",)
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "mc_cid", "mc_eid", "ref_src"})
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """Reduce a URL to the key used to detect duplicate artifacts.
+
+    The scheme, default port, fragment, trailing slash and tracking parameters
+    (`utm_*`, `fbclid`, ...) are dropped, the host is lowercased and the
+    remaining query parameters are sorted. `http://Example.com/a/?utm_source=x`
+    and `https://example.com/a` both become `example.com/a`.
+
+    Args:
+        url (str): URL as entered by the user
+
+    Returns:
+        str: normalized URL; not meant to be fetched
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        # no scheme given, e.g. "example.com/a"
+        parts = urlsplit(f"//{url.strip()}")
+
+    host = (parts.hostname or "").rstrip(".")
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is not None and port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{port}"
+    if parts.username or parts.password:
+        userinfo = parts.netloc.rpartition("@")[0]
+        host = f"{userinfo}@{host}"
+
+    path = parts.path.rstrip("/")
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not _is_tracking_param(name)
+        )
+    )
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
@@ -1,17 +1,23 @@
 from logging.config import fileConfig
 
 from alembic import context
-from decouple import config as decouple_config
 from sqlalchemy import engine_from_config, pool
 
-from src.bookmarker.core.models import SQLModel
-
-DATABASE_URL = decouple_config("DATABASE_URL")
-
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
-config.set_main_option("sqlalchemy.url", DATABASE_URL)
+
+# `DatabaseRepository.ensure_schema` upgrades a database in-process, handing
+# over its own connection and metadata; the alembic command line reads the
+# database URL from the bookmarker config and imports the models itself
+shared_connection = config.attributes.get("connection")
+if shared_connection is None:
+    from decouple import config as decouple_config
+
+    from src.bookmarker.core.models import SQLModel
+
+    config.set_main_option("sqlalchemy.url", decouple_config("DATABASE_URL"))
+    config.attributes["target_metadata"] = SQLModel.metadata
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
@@ -22,7 +28,21 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = SQLModel.metadata
+target_metadata = config.attributes["target_metadata"]
+
+# virtual tables (and their shadow tables) created by raw DDL, unknown to SQLModel
+UNMANAGED_TABLE_PREFIXES = ("artifact_fts", "artifact_content_fts", "artifact_trigram")
+# pg_trgm GIN indexes, also created by raw DDL
+UNMANAGED_INDEX_SUFFIX = "_trgm"
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not (name or "").startswith(UNMANAGED_TABLE_PREFIXES)
+    if type_ == "index":
+        return not (name or "").endswith(UNMANAGED_INDEX_SUFFIX)
+    return True
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -48,6 +68,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -61,6 +82,16 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    if shared_connection is not None:
+        context.configure(
+            connection=shared_connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
@@ -68,7 +99,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,73 @@
+"""Add artifact full-text index
+
+Revision ID: 4b7e2d9c1a3f
+Revises: cfcaf1314dc0
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2d9c1a3f"
+down_revision: Union[str, Sequence[str], None] = "cfcaf1314dc0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FTS5 is SQLite only; other backends keep the LIKE based search
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE artifact_fts USING fts5(
+            title, url, content_summary, content_raw,
+            content='artifact',
+            content_rowid='id'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER artifact_fts_ai AFTER INSERT ON artifact BEGIN
+            INSERT INTO artifact_fts (rowid, title, url, content_summary, content_raw)
+            VALUES (new.id, new.title, new.url, new.content_summary, new.content_raw);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER artifact_fts_ad AFTER DELETE ON artifact BEGIN
+            INSERT INTO artifact_fts (artifact_fts, rowid, title, url, content_summary, content_raw)
+            VALUES ('delete', old.id, old.title, old.url, old.content_summary, old.content_raw);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER artifact_fts_au
+        AFTER UPDATE OF title, url, content_summary, content_raw ON artifact BEGIN
+            INSERT INTO artifact_fts (artifact_fts, rowid, title, url, content_summary, content_raw)
+            VALUES ('delete', old.id, old.title, old.url, old.content_summary, old.content_raw);
+            INSERT INTO artifact_fts (rowid, title, url, content_summary, content_raw)
+            VALUES (new.id, new.title, new.url, new.content_summary, new.content_raw);
+        END
+        """
+    )
+    op.execute("INSERT INTO artifact_fts (artifact_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS artifact_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS artifact_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS artifact_fts_ai")
+    op.execute("DROP TABLE IF EXISTS artifact_fts")
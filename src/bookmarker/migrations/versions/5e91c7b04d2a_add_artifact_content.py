@@ -0,0 +1,246 @@
+"""Move raw content into a compressed, content-addressed table
+
+Revision ID: 5e91c7b04d2a
+Revises: 8d3f5a21c6e0
+Create Date: 2026-10-17 13:05:27.640391
+
+"""
+
+import hashlib
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e91c7b04d2a"
+down_revision: Union[str, Sequence[str], None] = "8d3f5a21c6e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+ZLIB_LEVEL = 6
+
+artifact = sa.table(
+    "artifact",
+    sa.column("id", sa.Integer),
+    sa.column("content_raw", sa.String),
+    sa.column("content_hash", sa.String),
+)
+artifact_content = sa.table(
+    "artifact_content",
+    sa.column("hash", sa.String),
+    sa.column("codec", sa.String),
+    sa.column("size", sa.Integer),
+    sa.column("data", sa.LargeBinary),
+)
+
+FTS_TRIGGERS = ("artifact_fts_ai", "artifact_fts_ad", "artifact_fts_au")
+
+
+def drop_fts() -> None:
+    for trigger in FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS artifact_fts")
+
+
+def iter_batches(query, id_column):
+    """Yield rows of `query` in id order, BATCH_SIZE rows per statement."""
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            query.where(id_column > last_id).order_by(id_column).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    is_sqlite = connection.dialect.name == "sqlite"
+
+    op.create_table(
+        "artifact_content",
+        sa.Column("hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+        sa.Column("codec", sa.Enum("zlib", "zstd", name="contentcodec"), nullable=True),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("hash"),
+    )
+    op.add_column(
+        "artifact",
+        sa.Column("content_hash", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+    seen_hashes: set[str] = set()
+    query = sa.select(artifact.c.id, artifact.c.content_raw).where(
+        artifact.c.content_raw.is_not(None)
+    )
+    for rows in iter_batches(query, artifact.c.id):
+        blobs = []
+        links = []
+        for artifact_id, content in rows:
+            data = content.encode()
+            content_hash = hashlib.sha256(data).hexdigest()
+            links.append({"artifact_id": artifact_id, "content_hash": content_hash})
+            if content_hash not in seen_hashes:
+                seen_hashes.add(content_hash)
+                blobs.append(
+                    {
+                        "hash": content_hash,
+                        "codec": "zlib",
+                        "size": len(data),
+                        "data": zlib.compress(data, ZLIB_LEVEL),
+                    }
+                )
+        if blobs:
+            connection.execute(sa.insert(artifact_content), blobs)
+        connection.execute(
+            sa.update(artifact)
+            .where(artifact.c.id == sa.bindparam("artifact_id"))
+            .values(content_hash=sa.bindparam("content_hash")),
+            links,
+        )
+
+    if is_sqlite:
+        # the external-content index reads artifact.content_raw; replace it with a
+        # standalone one, indexing bodies while they are still uncompressed
+        drop_fts()
+        op.execute(
+            "CREATE VIRTUAL TABLE artifact_fts USING fts5("
+            "title, url, content_summary, content_raw)"
+        )
+        op.execute(
+            """
+            INSERT INTO artifact_fts (rowid, title, url, content_summary, content_raw)
+            SELECT id, title, url, content_summary, content_raw FROM artifact
+            """
+        )
+
+    with op.batch_alter_table("artifact") as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_artifact_content_hash"), ["content_hash"], unique=False
+        )
+        batch_op.create_foreign_key(
+            "fk_artifact_content_hash_artifact_content",
+            "artifact_content",
+            ["content_hash"],
+            ["hash"],
+        )
+        batch_op.drop_column("content_raw")
+
+    if is_sqlite:
+        op.execute(
+            """
+            CREATE TRIGGER artifact_fts_ai AFTER INSERT ON artifact BEGIN
+                INSERT INTO artifact_fts (rowid, title, url, content_summary)
+                VALUES (new.id, new.title, new.url, new.content_summary);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER artifact_fts_ad AFTER DELETE ON artifact BEGIN
+                DELETE FROM artifact_fts WHERE rowid = old.id;
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER artifact_fts_au
+            AFTER UPDATE OF title, url, content_summary ON artifact BEGIN
+                UPDATE artifact_fts
+                SET title = new.title, url = new.url,
+                    content_summary = new.content_summary
+                WHERE rowid = new.id;
+            END
+            """
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    is_sqlite = connection.dialect.name == "sqlite"
+
+    op.add_column(
+        "artifact",
+        sa.Column("content_raw", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+    query = sa.select(
+        artifact.c.id, artifact_content.c.codec, artifact_content.c.data
+    ).join(artifact_content, artifact_content.c.hash == artifact.c.content_hash)
+    for rows in iter_batches(query, artifact.c.id):
+        contents = []
+        for artifact_id, codec, data in rows:
+            if codec == "zstd":
+                from compression import zstd  # Python 3.14+
+
+                data = zstd.decompress(data)
+            else:
+                data = zlib.decompress(data)
+            contents.append({"artifact_id": artifact_id, "content_raw": data.decode()})
+        connection.execute(
+            sa.update(artifact)
+            .where(artifact.c.id == sa.bindparam("artifact_id"))
+            .values(content_raw=sa.bindparam("content_raw")),
+            contents,
+        )
+
+    if is_sqlite:
+        drop_fts()
+
+    with op.batch_alter_table("artifact") as batch_op:
+        batch_op.drop_constraint(
+            "fk_artifact_content_hash_artifact_content", type_="foreignkey"
+        )
+        batch_op.drop_index(batch_op.f("ix_artifact_content_hash"))
+        batch_op.drop_column("content_hash")
+    op.drop_table("artifact_content")
+
+    if is_sqlite:
+        # restore the external-content index of revision 4b7e2d9c1a3f
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE artifact_fts USING fts5(
+                title, url, content_summary, content_raw,
+                content='artifact',
+                content_rowid='id'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER artifact_fts_ai AFTER INSERT ON artifact BEGIN
+                INSERT INTO artifact_fts (rowid, title, url, content_summary, content_raw)
+                VALUES (new.id, new.title, new.url, new.content_summary, new.content_raw);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER artifact_fts_ad AFTER DELETE ON artifact BEGIN
+                INSERT INTO artifact_fts (artifact_fts, rowid, title, url, content_summary, content_raw)
+                VALUES ('delete', old.id, old.title, old.url, old.content_summary, old.content_raw);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER artifact_fts_au
+            AFTER UPDATE OF title, url, content_summary, content_raw ON artifact BEGIN
+                INSERT INTO artifact_fts (artifact_fts, rowid, title, url, content_summary, content_raw)
+                VALUES ('delete', old.id, old.title, old.url, old.content_summary, old.content_raw);
+                INSERT INTO artifact_fts (rowid, title, url, content_summary, content_raw)
+                VALUES (new.id, new.title, new.url, new.content_summary, new.content_raw);
+            END
+            """
+        )
+        op.execute("INSERT INTO artifact_fts (artifact_fts) VALUES ('rebuild')")
@@ -0,0 +1,31 @@
+"""Add keyset pagination indices
+
+Revision ID: 8d3f5a21c6e0
+Revises: 4b7e2d9c1a3f
+Create Date: 2026-10-17 10:41:03.902117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f5a21c6e0"
+down_revision: Union[str, Sequence[str], None] = "4b7e2d9c1a3f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_artifact_created_at_id", "artifact", ["created_at", "id"], unique=False
+    )
+    op.create_index("ix_artifact_title_id", "artifact", ["title", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_artifact_title_id", table_name="artifact")
+    op.drop_index("ix_artifact_created_at_id", table_name="artifact")
@@ -0,0 +1,157 @@
+"""Add unique normalized artifact URL
+
+Revision ID: a3c6f8e1d5b7
+Revises: 5e91c7b04d2a
+Create Date: 2026-10-17 15:22:48.114903
+
+"""
+
+import logging
+from collections import defaultdict
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+try:
+    from bookmarker.core.urls import normalize_url
+except ModuleNotFoundError:  # the alembic command line, from a source checkout
+    from src.bookmarker.core.urls import normalize_url
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c6f8e1d5b7"
+down_revision: Union[str, Sequence[str], None] = "5e91c7b04d2a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BATCH_SIZE = 500
+# filled in from a duplicate when the surviving artifact has no value
+MERGED_COLUMNS = ("notes", "content_hash", "content_summary")
+
+artifact = sa.table(
+    "artifact",
+    sa.column("id", sa.Integer),
+    sa.column("url", sa.String),
+    sa.column("url_normalized", sa.String),
+    *(sa.column(name, sa.String) for name in MERGED_COLUMNS),
+)
+artifact_tag_link = sa.table(
+    "artifacttaglink",
+    sa.column("artifact_id", sa.Integer),
+    sa.column("tag_id", sa.Integer),
+)
+artifact_content = sa.table("artifact_content", sa.column("hash", sa.String))
+
+
+def backfill_url_normalized() -> dict[str, list[int]]:
+    """Set url_normalized on every artifact; return artifact IDs per key."""
+    connection = op.get_bind()
+    ids_by_url: dict[str, list[int]] = defaultdict(list)
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(artifact.c.id, artifact.c.url)
+            .where(artifact.c.id > last_id)
+            .order_by(artifact.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return ids_by_url
+        params = []
+        for artifact_id, url in rows:
+            url_normalized = normalize_url(url)
+            ids_by_url[url_normalized].append(artifact_id)
+            params.append(
+                {"artifact_id": artifact_id, "url_normalized": url_normalized}
+            )
+        connection.execute(
+            sa.update(artifact)
+            .where(artifact.c.id == sa.bindparam("artifact_id"))
+            .values(url_normalized=sa.bindparam("url_normalized")),
+            params,
+        )
+        last_id = rows[-1][0]
+
+
+def merge_duplicates(survivor_id: int, duplicate_ids: list[int]) -> None:
+    """Fold duplicates into the oldest artifact: tags, then missing content."""
+    connection = op.get_bind()
+    columns = [artifact.c[name] for name in MERGED_COLUMNS]
+    survivor = (
+        connection.execute(sa.select(*columns).where(artifact.c.id == survivor_id))
+        .one()
+        ._asdict()
+    )
+    tag_ids = set(
+        connection.execute(
+            sa.select(artifact_tag_link.c.tag_id).where(
+                artifact_tag_link.c.artifact_id == survivor_id
+            )
+        ).scalars()
+    )
+    for duplicate_id in duplicate_ids:
+        duplicate = (
+            connection.execute(sa.select(*columns).where(artifact.c.id == duplicate_id))
+            .one()
+            ._asdict()
+        )
+        for name in MERGED_COLUMNS:
+            if survivor[name] is None:
+                survivor[name] = duplicate[name]
+        for tag_id in connection.execute(
+            sa.select(artifact_tag_link.c.tag_id).where(
+                artifact_tag_link.c.artifact_id == duplicate_id
+            )
+        ).scalars():
+            if tag_id not in tag_ids:
+                tag_ids.add(tag_id)
+                connection.execute(
+                    sa.insert(artifact_tag_link).values(
+                        artifact_id=survivor_id, tag_id=tag_id
+                    )
+                )
+    connection.execute(
+        sa.update(artifact).where(artifact.c.id == survivor_id).values(**survivor)
+    )
+    connection.execute(
+        sa.delete(artifact_tag_link).where(
+            artifact_tag_link.c.artifact_id.in_(duplicate_ids)
+        )
+    )
+    connection.execute(sa.delete(artifact).where(artifact.c.id.in_(duplicate_ids)))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "artifact",
+        sa.Column("url_normalized", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+
+    merged = 0
+    for ids in backfill_url_normalized().values():
+        if len(ids) > 1:
+            merge_duplicates(ids[0], ids[1:])
+            merged += len(ids) - 1
+    if merged:
+        logger.info(f"Merged {merged} artifacts with duplicate URLs.")
+        op.get_bind().execute(
+            sa.delete(artifact_content).where(
+                ~sa.exists().where(artifact.c.content_hash == artifact_content.c.hash)
+            )
+        )
+
+    op.create_index(
+        op.f("ix_artifact_url_normalized"), "artifact", ["url_normalized"], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # merged duplicates are not restored
+    op.drop_index(op.f("ix_artifact_url_normalized"), table_name="artifact")
+    with op.batch_alter_table("artifact", recreate="never") as batch_op:
+        batch_op.drop_column("url_normalized")
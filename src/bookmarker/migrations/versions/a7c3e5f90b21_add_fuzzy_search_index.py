@@ -0,0 +1,159 @@
+"""Add fuzzy search vocabulary, trigram postings and artifact links
+
+Revision ID: a7c3e5f90b21
+Revises: f4a1c9e7b3d2
+Create Date: 2026-10-17 20:11:36.487120
+
+"""
+
+import re
+from collections import defaultdict
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e5f90b21"
+down_revision: Union[str, Sequence[str], None] = "f4a1c9e7b3d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# frozen copy of core.fuzzy.extract_terms and term_grams at this revision
+WORD_PATTERN = re.compile(r"[^\W\d_]{3,}")
+MAX_TERM_LENGTH = 40
+STOPWORDS = frozenset(
+    """
+    about after also and are been but can for from has have how its into more
+    not now one our out that the their then there these they this was were
+    what when which who why will with you your
+    """.split()
+)
+BATCH_SIZE = 500
+
+
+def extract_terms(*texts):
+    terms = {}
+    for text in texts:
+        for word in WORD_PATTERN.findall((text or "").lower()):
+            if word not in STOPWORDS and len(word) <= MAX_TERM_LENGTH:
+                terms[word] = None
+    return list(terms)
+
+
+def term_grams(term):
+    padded = f"^{term}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def index_existing_artifacts() -> None:
+    connection = op.get_bind()
+    artifact = sa.table(
+        "artifact",
+        sa.column("id", sa.Integer),
+        sa.column("title", sa.String),
+        sa.column("content_summary", sa.String),
+    )
+    tag = sa.table("tag", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    link = sa.table(
+        "artifacttaglink",
+        sa.column("artifact_id", sa.Integer),
+        sa.column("tag_id", sa.Integer),
+    )
+    fuzzy_term = sa.table(
+        "fuzzy_term",
+        sa.column("id", sa.Integer),
+        sa.column("term", sa.String),
+        sa.column("length", sa.Integer),
+    )
+    fuzzy_term_gram = sa.table(
+        "fuzzy_term_gram",
+        sa.column("gram", sa.String),
+        sa.column("term_id", sa.Integer),
+    )
+    artifact_fuzzy_term = sa.table(
+        "artifact_fuzzy_term",
+        sa.column("artifact_id", sa.Integer),
+        sa.column("term_id", sa.Integer),
+    )
+
+    tag_names = defaultdict(list)
+    for artifact_id, name in connection.execute(
+        sa.select(link.c.artifact_id, tag.c.name).join(tag, tag.c.id == link.c.tag_id)
+    ):
+        tag_names[artifact_id].append(name)
+
+    term_ids = {}
+    rows = connection.execute(
+        sa.select(artifact.c.id, artifact.c.title, artifact.c.content_summary)
+    ).all()
+    for start in range(0, len(rows), BATCH_SIZE):
+        links = []
+        for artifact_id, title, summary in rows[start : start + BATCH_SIZE]:
+            for term in extract_terms(title, *tag_names[artifact_id], summary):
+                if term not in term_ids:
+                    term_ids[term] = connection.execute(
+                        sa.insert(fuzzy_term)
+                        .values(term=term, length=len(term))
+                        .returning(fuzzy_term.c.id)
+                    ).scalar_one()
+                    connection.execute(
+                        sa.insert(fuzzy_term_gram),
+                        [
+                            {"gram": gram, "term_id": term_ids[term]}
+                            for gram in term_grams(term)
+                        ],
+                    )
+                links.append({"artifact_id": artifact_id, "term_id": term_ids[term]})
+        if links:
+            connection.execute(sa.insert(artifact_fuzzy_term), links)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "fuzzy_term",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("term", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("length", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_fuzzy_term_term"), "fuzzy_term", ["term"], unique=True)
+    op.create_table(
+        "artifact_fuzzy_term",
+        sa.Column("artifact_id", sa.Integer(), nullable=False),
+        sa.Column("term_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["artifact_id"], ["artifact.id"]),
+        sa.ForeignKeyConstraint(["term_id"], ["fuzzy_term.id"]),
+        sa.PrimaryKeyConstraint("artifact_id", "term_id"),
+    )
+    op.create_index(
+        "ix_artifact_fuzzy_term_term_id_artifact_id",
+        "artifact_fuzzy_term",
+        ["term_id", "artifact_id"],
+        unique=False,
+    )
+    op.create_table(
+        "fuzzy_term_gram",
+        sa.Column("gram", sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+        sa.Column("term_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["term_id"], ["fuzzy_term.id"]),
+        sa.PrimaryKeyConstraint("gram", "term_id"),
+    )
+    # ### end Alembic commands ###
+    index_existing_artifacts()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table("fuzzy_term_gram")
+    op.drop_index(
+        "ix_artifact_fuzzy_term_term_id_artifact_id", table_name="artifact_fuzzy_term"
+    )
+    op.drop_table("artifact_fuzzy_term")
+    op.drop_index(op.f("ix_fuzzy_term_term"), table_name="fuzzy_term")
+    op.drop_table("fuzzy_term")
+    # ### end Alembic commands ###
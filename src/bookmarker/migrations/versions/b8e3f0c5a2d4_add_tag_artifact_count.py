@@ -0,0 +1,107 @@
+"""Add unique tag name and tag artifact_count
+
+Revision ID: b8e3f0c5a2d4
+Revises: e2b94d7a1f35
+Create Date: 2026-10-17 17:48:09.631552
+
+"""
+
+import logging
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e3f0c5a2d4"
+down_revision: Union[str, Sequence[str], None] = "e2b94d7a1f35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+tag = sa.table(
+    "tag",
+    sa.column("id", sa.Integer),
+    sa.column("name", sa.String),
+    sa.column("artifact_count", sa.Integer),
+)
+artifact_tag_link = sa.table(
+    "artifacttaglink",
+    sa.column("artifact_id", sa.Integer),
+    sa.column("tag_id", sa.Integer),
+)
+
+
+def merge_duplicate_tags() -> int:
+    """Move links of same-named tags onto the oldest one; return tags removed."""
+    connection = op.get_bind()
+    duplicate_names = connection.execute(
+        sa.select(tag.c.name, sa.func.min(tag.c.id))
+        .group_by(tag.c.name)
+        .having(sa.func.count() > 1)
+    ).all()
+    merged = 0
+    for name, survivor_id in duplicate_names:
+        duplicate_ids = (
+            connection.execute(
+                sa.select(tag.c.id).where(tag.c.name == name, tag.c.id != survivor_id)
+            )
+            .scalars()
+            .all()
+        )
+        survivor_link = artifact_tag_link.alias("survivor_link")
+        connection.execute(
+            sa.insert(artifact_tag_link).from_select(
+                ["artifact_id", "tag_id"],
+                sa.select(artifact_tag_link.c.artifact_id, sa.literal(survivor_id))
+                .where(
+                    artifact_tag_link.c.tag_id.in_(duplicate_ids),
+                    ~sa.exists().where(
+                        survivor_link.c.artifact_id == artifact_tag_link.c.artifact_id,
+                        survivor_link.c.tag_id == survivor_id,
+                    ),
+                )
+                .distinct(),
+            )
+        )
+        connection.execute(
+            sa.delete(artifact_tag_link).where(
+                artifact_tag_link.c.tag_id.in_(duplicate_ids)
+            )
+        )
+        connection.execute(sa.delete(tag).where(tag.c.id.in_(duplicate_ids)))
+        merged += len(duplicate_ids)
+    return merged
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tag",
+        sa.Column("artifact_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    merged = merge_duplicate_tags()
+    if merged:
+        logger.info(f"Merged {merged} tags with duplicate names.")
+    op.get_bind().execute(
+        sa.update(tag).values(
+            artifact_count=sa.select(sa.func.count())
+            .select_from(artifact_tag_link)
+            .where(artifact_tag_link.c.tag_id == tag.c.id)
+            .scalar_subquery()
+        )
+    )
+
+    op.drop_index(op.f("ix_tag_name"), table_name="tag")
+    op.create_index(op.f("ix_tag_name"), "tag", ["name"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # merged duplicates are not restored
+    op.drop_index(op.f("ix_tag_name"), table_name="tag")
+    op.create_index(op.f("ix_tag_name"), "tag", ["name"], unique=False)
+    with op.batch_alter_table("tag", recreate="never") as batch_op:
+        batch_op.drop_column("artifact_count")
@@ -0,0 +1,177 @@
+"""Index raw content separately, without an uncompressed copy
+
+Revision ID: c4f7a9d2b6e8
+Revises: d5b8e2a4c9f1
+Create Date: 2026-10-17 23:40:12.518204
+
+"""
+
+import zlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f7a9d2b6e8"
+down_revision: Union[str, Sequence[str], None] = "d5b8e2a4c9f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+artifact = sa.table(
+    "artifact",
+    sa.column("id", sa.Integer),
+    sa.column("content_hash", sa.String),
+)
+artifact_content = sa.table(
+    "artifact_content",
+    sa.column("rowid", sa.Integer),
+    sa.column("hash", sa.String),
+    sa.column("codec", sa.String),
+    sa.column("data", sa.LargeBinary),
+)
+
+FTS_TRIGGERS = ("artifact_fts_ai", "artifact_fts_ad", "artifact_fts_au")
+FTS_COLUMNS = "title, url, content_summary"
+
+
+def decompress(codec: str, data: bytes) -> str:
+    if codec == "zstd":
+        from compression import zstd  # Python 3.14+
+
+        return zstd.decompress(data).decode()
+    return zlib.decompress(data).decode()
+
+
+def drop_fts() -> None:
+    for trigger in FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS artifact_fts")
+    op.execute("DROP TABLE IF EXISTS artifact_content_fts")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    connection = op.get_bind()
+    if connection.dialect.name != "sqlite":
+        return
+
+    drop_fts()
+    # title, url and summary: external content read back from artifact
+    op.execute(
+        f"""
+        CREATE VIRTUAL TABLE artifact_fts USING fts5(
+            {FTS_COLUMNS}, content='artifact', content_rowid='id'
+        )
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER artifact_fts_ai AFTER INSERT ON artifact BEGIN
+            INSERT INTO artifact_fts (rowid, {FTS_COLUMNS})
+            VALUES (new.id, new.title, new.url, new.content_summary);
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER artifact_fts_ad AFTER DELETE ON artifact BEGIN
+            INSERT INTO artifact_fts (artifact_fts, rowid, {FTS_COLUMNS})
+            VALUES ('delete', old.id, old.title, old.url, old.content_summary);
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER artifact_fts_au
+        AFTER UPDATE OF {FTS_COLUMNS} ON artifact BEGIN
+            INSERT INTO artifact_fts (artifact_fts, rowid, {FTS_COLUMNS})
+            VALUES ('delete', old.id, old.title, old.url, old.content_summary);
+            INSERT INTO artifact_fts (rowid, {FTS_COLUMNS})
+            VALUES (new.id, new.title, new.url, new.content_summary);
+        END
+        """
+    )
+    op.execute("INSERT INTO artifact_fts (artifact_fts) VALUES ('rebuild')")
+
+    # raw content: contentless, one row per artifact_content blob
+    op.execute(
+        "CREATE VIRTUAL TABLE artifact_content_fts USING fts5(content_raw, content='')"
+    )
+    insert_body = sa.text(
+        "INSERT INTO artifact_content_fts (rowid, content_raw) VALUES (:id, :body)"
+    )
+    blobs = connection.execute(
+        sa.select(
+            artifact_content.c.rowid, artifact_content.c.codec, artifact_content.c.data
+        )
+    )
+    for rows in blobs.partitions(BATCH_SIZE):
+        connection.execute(
+            insert_body,
+            [
+                {"id": rowid, "body": decompress(codec, data)}
+                for rowid, codec, data in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    if connection.dialect.name != "sqlite":
+        return
+
+    drop_fts()
+    # restore the standalone index of revision 5e91c7b04d2a
+    op.execute(
+        f"CREATE VIRTUAL TABLE artifact_fts USING fts5({FTS_COLUMNS}, content_raw)"
+    )
+    op.execute(
+        f"""
+        INSERT INTO artifact_fts (rowid, {FTS_COLUMNS})
+        SELECT id, {FTS_COLUMNS} FROM artifact
+        """
+    )
+    set_body = sa.text("UPDATE artifact_fts SET content_raw = :body WHERE rowid = :id")
+    bodies = connection.execute(
+        sa.select(
+            artifact.c.id, artifact_content.c.codec, artifact_content.c.data
+        ).join(artifact_content, artifact_content.c.hash == artifact.c.content_hash)
+    )
+    for rows in bodies.partitions(BATCH_SIZE):
+        connection.execute(
+            set_body,
+            [
+                {"id": artifact_id, "body": decompress(codec, data)}
+                for artifact_id, codec, data in rows
+            ],
+        )
+    op.execute(
+        f"""
+        CREATE TRIGGER artifact_fts_ai AFTER INSERT ON artifact BEGIN
+            INSERT INTO artifact_fts (rowid, {FTS_COLUMNS})
+            VALUES (new.id, new.title, new.url, new.content_summary);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER artifact_fts_ad AFTER DELETE ON artifact BEGIN
+            DELETE FROM artifact_fts WHERE rowid = old.id;
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER artifact_fts_au
+        AFTER UPDATE OF {FTS_COLUMNS} ON artifact BEGIN
+            UPDATE artifact_fts
+            SET title = new.title, url = new.url,
+                content_summary = new.content_summary
+            WHERE rowid = new.id;
+        END
+        """
+    )
@@ -0,0 +1,47 @@
+"""Add artifact page validators
+
+Revision ID: d5b8e2a4c9f1
+Revises: a7c3e5f90b21
+Create Date: 2026-10-17 21:12:40.275318
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5b8e2a4c9f1"
+down_revision: Union[str, Sequence[str], None] = "a7c3e5f90b21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # plain ADD COLUMN: a batch rebuild would drop the artifact search triggers
+    op.add_column(
+        "artifact",
+        sa.Column("http_etag", sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    )
+    op.add_column(
+        "artifact",
+        sa.Column(
+            "http_last_modified", sqlmodel.sql.sqltypes.AutoString(), nullable=True
+        ),
+    )
+    op.add_column(
+        "artifact",
+        sa.Column(
+            "page_hash", sqlmodel.sql.sqltypes.AutoString(length=64), nullable=True
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("artifact", "page_hash")
+    op.drop_column("artifact", "http_last_modified")
+    op.drop_column("artifact", "http_etag")
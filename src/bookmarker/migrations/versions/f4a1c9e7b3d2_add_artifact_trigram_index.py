@@ -0,0 +1,88 @@
+"""Add trigram substring index on artifact title and url
+
+Revision ID: f4a1c9e7b3d2
+Revises: b8e3f0c5a2d4
+Create Date: 2026-10-17 19:02:17.204518
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f4a1c9e7b3d2"
+down_revision: Union[str, Sequence[str], None] = "b8e3f0c5a2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_TRIGGERS = ("artifact_trigram_ai", "artifact_trigram_ad", "artifact_trigram_au")
+PG_TRIGRAM_INDEXES = ("ix_artifact_title_trgm", "ix_artifact_url_trgm")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for column in ("title", "url"):
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_artifact_{column}_trgm "
+                f"ON artifact USING gin ({column} gin_trgm_ops)"
+            )
+        return
+    if dialect != "sqlite":
+        return
+
+    # needs SQLite 3.34+ for the trigram tokenizer
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS artifact_trigram USING fts5(
+            title, url,
+            content='artifact', content_rowid='id', tokenize='trigram'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS artifact_trigram_ai AFTER INSERT ON artifact BEGIN
+            INSERT INTO artifact_trigram (rowid, title, url)
+            VALUES (new.id, new.title, new.url);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS artifact_trigram_ad AFTER DELETE ON artifact BEGIN
+            INSERT INTO artifact_trigram (artifact_trigram, rowid, title, url)
+            VALUES ('delete', old.id, old.title, old.url);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS artifact_trigram_au
+        AFTER UPDATE OF title, url ON artifact BEGIN
+            INSERT INTO artifact_trigram (artifact_trigram, rowid, title, url)
+            VALUES ('delete', old.id, old.title, old.url);
+            INSERT INTO artifact_trigram (rowid, title, url)
+            VALUES (new.id, new.title, new.url);
+        END
+        """
+    )
+    op.execute("INSERT INTO artifact_trigram (artifact_trigram) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for index in PG_TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {index}")
+        return
+    if dialect != "sqlite":
+        return
+
+    for trigger in TRIGRAM_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS artifact_trigram")
@@ -1,8 +1,11 @@
 import logging
+import threading
 from enum import Enum, auto
+from types import TracebackType
+from typing import Sequence
 
 from ..core.database import DatabaseRepository
-from ..core.models import Artifact, ArtifactTypeEnum, Tag
+from ..core.models import Artifact, ArtifactTypeEnum, PageValidators, Tag
 
 logger = logging.getLogger(__name__)
 
@@ -13,19 +16,11 @@ def get_or_create_artifact(
     url: str,
     artifact_type: ArtifactTypeEnum = ArtifactTypeEnum.ARTICLE,
 ) -> Artifact:
-    existing_artifact = repo.get_by_url(url)
-    if existing_artifact is not None:
-        logger.info(
-            f"Artifact with URL '{url}' already exists with ID {existing_artifact.id}."
-        )
-        return existing_artifact
-
-    artifact = Artifact(
-        title=title,
-        url=url,
-        artifact_type=artifact_type,
+    artifact, created = repo.get_or_add(
+        Artifact(title=title, url=url, artifact_type=artifact_type)
     )
-    repo.add(artifact)
+    if not created:
+        logger.info(f"Artifact with URL '{url}' already exists with ID {artifact.id}.")
 
     return artifact
 
@@ -52,6 +47,103 @@ def store_content(
     return artifact
 
 
+DEFAULT_WRITE_BATCH_SIZE = 100
+
+
+class BufferedContentWriter:
+    """Collects content handed over by bulk workers and stores it in batches.
+
+    Each full buffer is written with one `store_content_*_many` transaction, so a
+    bulk run commits once per `batch_size` artifacts instead of once per artifact.
+    Use as a context manager: the remaining buffer is flushed on exit, also when
+    the bulk run fails, so finished work is never lost. A batch that fails to
+    store does not raise; every artifact in it is recorded in `failed` with the
+    error instead.
+    """
+
+    def __init__(
+        self,
+        repo: DatabaseRepository,
+        *,
+        content_type: ContentType = ContentType.RAW,
+        batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+    ) -> None:
+        if content_type not in (ContentType.RAW, ContentType.SUMMARY):
+            raise ValueError(f"Unsupported content type: {content_type}")
+        self._repo = repo
+        self.content_type = content_type
+        self.batch_size = batch_size
+        self.stored_ids: list[int] = []
+        self.missing_ids: list[int] = []
+        self.failed: dict[int, Exception] = {}
+        self._pending: dict[int, str] = {}
+        self._pending_validators: dict[int, PageValidators] = {}
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def put(
+        self,
+        artifact_id: int,
+        content: str,
+        validators: PageValidators | None = None,
+    ) -> None:
+        """Buffer content; validators of its page are stored with raw content."""
+        if validators is not None and self.content_type is not ContentType.RAW:
+            raise ValueError("Page validators can only be stored with raw content.")
+        with self._buffer_lock:
+            self._pending[artifact_id] = content
+            if validators is not None:
+                self._pending_validators[artifact_id] = validators
+            if len(self._pending) < self.batch_size:
+                return
+            batch, validators_batch = self._take()
+        self._write(batch, validators_batch)
+
+    def flush(self) -> None:
+        with self._buffer_lock:
+            batch, validators_batch = self._take()
+        self._write(batch, validators_batch)
+
+    def _take(self) -> tuple[dict[int, str], dict[int, PageValidators]]:
+        batch, self._pending = self._pending, {}
+        validators_batch, self._pending_validators = self._pending_validators, {}
+        return batch, validators_batch
+
+    def _write(
+        self, batch: dict[int, str], validators: dict[int, PageValidators]
+    ) -> None:
+        if not batch:
+            return
+        with self._write_lock:
+            try:
+                stored = set(self._store_many(batch, validators))
+            except Exception as e:
+                logger.exception(f"Failed to store {len(batch)} buffered artifacts.")
+                self.failed.update(dict.fromkeys(batch, e))
+                return
+            self.stored_ids.extend(a_id for a_id in batch if a_id in stored)
+            self.missing_ids.extend(a_id for a_id in batch if a_id not in stored)
+        logger.debug(f"Stored {len(stored)} of {len(batch)} buffered artifacts.")
+
+    def _store_many(
+        self, batch: dict[int, str], validators: dict[int, PageValidators]
+    ) -> Sequence[int]:
+        if self.content_type is ContentType.RAW:
+            return self._repo.store_content_raw_many(batch, validators)
+        return self._repo.store_content_summary_many(batch)
+
+    def __enter__(self) -> "BufferedContentWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.flush()
+
+
 def update_tags(
     repo: DatabaseRepository,
     artifact_id: int,
@@ -62,3 +154,23 @@ def update_tags(
     tag_objs = [Tag(name=tag) for tag in tags]
     artifact = repo.tag(artifact_id, *tag_objs, remove=remove)
     return artifact
+
+
+def update_tags_many(
+    repo: DatabaseRepository,
+    artifact_ids: list[int] | None = None,
+    *,
+    term: str | None = None,
+    tag_name: str | None = None,
+    add: list[str] | None = None,
+    remove: list[str] | None = None,
+) -> int:
+    if artifact_ids is None and term is None and tag_name is None:
+        raise ValueError("Select artifacts by ID, search term or tag.")
+    return repo.tag_many(
+        artifact_ids,
+        term=term,
+        tag_name=tag_name,
+        add=add or (),
+        remove=remove or (),
+    )
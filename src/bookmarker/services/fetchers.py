@@ -1,13 +1,46 @@
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Final
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from multiprocessing import get_context
+from typing import Generator
 
-from ..core.config import get_timeout_multithreading
+import httpx
+from trafilatura.downloads import USER_AGENT
+
+from ..core.config import (
+    get_host_settings,
+    get_max_connections,
+    get_max_workers,
+    get_parse_workers,
+    get_timeout_multithreading,
+)
+from ..core.content import content_hash
 from ..core.database import DatabaseRepository
-from ..core.exceptions import ArtifactNotFoundError, ContentFetchError
-from ..core.fetchers import ContentFetcher, TrafilaturaFetcher, YouTubeFetcher
-from ..core.models import Artifact, ArtifactTypeEnum
-from .base import ContentType, store_content
+from ..core.exceptions import (
+    ArtifactNotFoundError,
+    ContentFetchError,
+    HtmlCacheDisabledError,
+)
+from ..core.fetchers import (
+    AsyncHttpFetcher,
+    ContentFetcher,
+    TrafilaturaFetcher,
+    YouTubeFetcher,
+    extract_content,
+)
+from ..core.html_cache import HtmlCache, get_html_cache
+from ..core.models import Artifact, ArtifactTypeEnum, PageRecord, PageValidators
+from ..core.scheduler import HostScheduler, round_robin
+from .base import BufferedContentWriter, ContentType, store_content
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +50,11 @@ FETCHERS = {
     ArtifactTypeEnum.YOUTUBE: YouTubeFetcher,
 }
 
+# artifact types downloaded on the event loop by `fetch_and_store_content_pooled`
+ASYNC_FETCHERS = {
+    ArtifactTypeEnum.ARTICLE: AsyncHttpFetcher,
+}
+
 
 def fetch_content(artifact_id: int, *, repo: DatabaseRepository) -> str | None:
     artifact = repo.get(artifact_id)
@@ -32,9 +70,24 @@ def fetch_content(artifact_id: int, *, repo: DatabaseRepository) -> str | None:
         raise
 
 
+def stored_validators(artifact: Artifact) -> PageValidators | None:
+    """Validators to re-fetch an artifact with, if its content came from them."""
+    if artifact.content_hash is None:
+        return None
+    validators = PageValidators(
+        artifact.http_etag, artifact.http_last_modified, artifact.page_hash
+    )
+    return validators if any(validators) else None
+
+
 def fetch_and_store_content(
     artifact_id: int, *, repo: DatabaseRepository
 ) -> Artifact | None:
+    """Fetch and store content; returns None if the page has not changed."""
+    artifact = repo.get(artifact_id)
+    if artifact is not None and artifact.artifact_type in ASYNC_FETCHERS:
+        return _refetch_and_store_content(artifact_id, artifact, repo=repo)
+
     content = fetch_content(artifact_id, repo=repo)
     if content is not None:
         artifact = store_content(
@@ -43,31 +96,308 @@ def fetch_and_store_content(
         return artifact
 
 
-def fetch_and_store_content_many(
-    artifact_ids: list[int], *, repo: DatabaseRepository, max_workers: int = 5
+def _refetch_and_store_content(
+    artifact_id: int, artifact: Artifact, *, repo: DatabaseRepository
+) -> Artifact | None:
+    validators = stored_validators(artifact)
+    fetcher: AsyncHttpFetcher = ASYNC_FETCHERS[artifact.artifact_type](
+        html_cache=get_html_cache()
+    )
+    try:
+        page = fetcher.fetch_page(artifact.url, validators)
+    except ContentFetchError:
+        logger.exception(f"Error fetching content for artifact ID {artifact_id}")
+        raise
+    if page.content is None:
+        logger.info(f"Content of artifact ID {artifact_id} is unchanged.")
+        if page.validators != validators:
+            repo.store_page_validators_many({artifact_id: page.validators})
+        return None
+    return repo.store_content_raw(artifact_id, page.content, page.validators)
+
+
+def fetch_and_store_content_pooled(
+    artifact_ids: list[int],
+    *,
+    repo: DatabaseRepository,
+    max_connections: int | None = None,
+    parse_workers: int | None = None,
+    max_workers: int | None = None,
 ) -> dict:
-    results = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_id = {}
-        for a_id in artifact_ids:
-            future = executor.submit(fetch_and_store_content, a_id, repo=repo)
-            future_to_id[future] = a_id
-        try:
-            timeout_multithreading: Final[int] = get_timeout_multithreading()
-            for future in as_completed(future_to_id, timeout=timeout_multithreading):
-                a_id = future_to_id[future]
-                try:
-                    future.result()
+    """Fetch many artifacts concurrently over pooled async HTTP clients.
+
+    Artifacts of a type in ASYNC_FETCHERS go through a pipeline: up to
+    `max_connections` downloads in flight on one event loop, extraction in a
+    pool of `parse_workers` processes, then batched writes. Other types are
+    fetched by their synchronous fetcher in `max_workers` threads. Both paths
+    share the per-host limits of HostScheduler, and every download must finish
+    within TIMEOUT_MULTITHREADING seconds of leaving its host's queue.
+    Results use the status strings "ok", "not_found", "fetch_error" and
+    "exception: ...", plus "unchanged" for pages that match the validators
+    stored with their content; those are neither parsed nor written, apart
+    from refreshed validators.
+    """
+    if max_connections is None:
+        max_connections = get_max_connections()
+    if parse_workers is None:
+        parse_workers = get_parse_workers()
+    if max_workers is None:
+        max_workers = get_max_workers()
+    results: dict[int, str] = {}
+    urls_by_type: dict[ArtifactTypeEnum, dict[int, str]] = {}
+    validators: dict[int, PageValidators] = {}
+    threaded_urls_by_type: dict[ArtifactTypeEnum, dict[int, str]] = {}
+    for a_id in artifact_ids:
+        artifact = repo.get(a_id)
+        if artifact is None:
+            results[a_id] = "not_found"
+        elif artifact.artifact_type in ASYNC_FETCHERS:
+            urls_by_type.setdefault(artifact.artifact_type, {})[a_id] = artifact.url
+            if (artifact_validators := stored_validators(artifact)) is not None:
+                validators[a_id] = artifact_validators
+        else:
+            threaded_urls_by_type.setdefault(artifact.artifact_type, {})[a_id] = (
+                artifact.url
+            )
+
+    url_count = sum(len(urls) for urls in urls_by_type.values())
+    parse_workers = min(parse_workers, url_count)
+    refreshed_validators: dict[int, PageValidators] = {}
+    with (
+        BufferedContentWriter(repo, content_type=ContentType.RAW) as writer,
+        _parse_pool(parse_workers) as parse_executor,
+        ThreadPoolExecutor(max_workers=max_workers) as thread_executor,
+    ):
+        asyncio.run(
+            _fetch_and_store_async(
+                urls_by_type,
+                validators,
+                writer,
+                results,
+                refreshed_validators,
+                max_connections=max_connections,
+                parse_executor=parse_executor,
+                parse_workers=parse_workers,
+            )
+        )
+        if threaded_urls_by_type:
+            asyncio.run(
+                _fetch_and_store_threaded(
+                    threaded_urls_by_type,
+                    writer,
+                    results,
+                    thread_executor=thread_executor,
+                    max_workers=max_workers,
+                )
+            )
+    for a_id in writer.missing_ids:
+        results[a_id] = "not_found"
+    for a_id, e in writer.failed.items():
+        results[a_id] = f"exception: {e}"
+    if refreshed_validators:
+        repo.store_page_validators_many(refreshed_validators)
+    _log_repo_stats(repo)
+    return {a_id: results[a_id] for a_id in artifact_ids if a_id in results}
+
+
+@contextmanager
+def _parse_pool(workers: int) -> Generator[Executor | None]:
+    if workers < 1:
+        yield None
+        return
+    # spawned rather than forked, as forking a process with threads can deadlock
+    pool = ProcessPoolExecutor(workers, mp_context=get_context("spawn"))
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+async def _fetch_and_store_async(
+    urls_by_type: dict[ArtifactTypeEnum, dict[int, str]],
+    validators: dict[int, PageValidators],
+    writer: BufferedContentWriter,
+    results: dict[int, str],
+    refreshed_validators: dict[int, PageValidators],
+    *,
+    max_connections: int,
+    parse_executor: Executor | None,
+    parse_workers: int,
+) -> None:
+    html_cache = get_html_cache()
+    for artifact_type, urls in urls_by_type.items():
+        fetcher = ASYNC_FETCHERS[artifact_type](
+            max_connections=max_connections,
+            # a deadline for each download, not for the batch: a host limited
+            # to a few requests at a time can take a while to get through
+            timeout=get_timeout_multithreading(),
+            parse_executor=parse_executor,
+            parse_workers=parse_workers,
+            host_settings=get_host_settings(),
+            html_cache=html_cache,
+        )
+        async for result in fetcher.fetch_many(urls, validators):
+            a_id = result.key
+            match result.error:
+                case None if result.content is not None:
+                    # full buffers are written off the loop; until then the
+                    # pipeline waits here, which holds back parsing
+                    await asyncio.to_thread(
+                        writer.put, a_id, result.content, result.validators
+                    )
                     results[a_id] = "ok"
-                except ArtifactNotFoundError:
-                    results[a_id] = "not_found"
-                except ContentFetchError:
+                case None:
+                    if result.validators != validators.get(a_id):
+                        refreshed_validators[a_id] = result.validators
+                    results[a_id] = "unchanged"
+                case ContentFetchError():
+                    logger.error(
+                        f"Error fetching content for artifact ID {a_id}",
+                        exc_info=result.error,
+                    )
                     results[a_id] = "fetch_error"
-                except Exception as e:
+                case e:
                     results[a_id] = f"exception: {e}"
-        except TimeoutError:
-            logger.error(
-                "Timeout error. Considering increasing TIMEOUT_MULTITHREADING."
+
+
+async def _fetch_and_store_threaded(
+    urls_by_type: dict[ArtifactTypeEnum, dict[int, str]],
+    writer: BufferedContentWriter,
+    results: dict[int, str],
+    *,
+    thread_executor: Executor,
+    max_workers: int,
+) -> None:
+    loop = asyncio.get_running_loop()
+    scheduler = HostScheduler(get_host_settings())
+    timeout = get_timeout_multithreading()
+    workers = asyncio.Semaphore(max_workers)
+
+    async def fetch(
+        client: httpx.AsyncClient, fetcher: ContentFetcher, a_id: int, url: str
+    ) -> None:
+        # wait for the host first, so busy hosts don't tie up worker threads
+        async with scheduler.slot(client, url), workers:
+            try:
+                # a thread can't be cancelled; on timeout it finishes unobserved
+                async with asyncio.timeout(timeout):
+                    content = await loop.run_in_executor(
+                        thread_executor, fetcher.fetch, url
+                    )
+            except TimeoutError:
+                logger.error(f"Timeout fetching content for artifact ID {a_id}")
+                results[a_id] = "fetch_error"
+                return
+            except ContentFetchError:
+                logger.exception(f"Error fetching content for artifact ID {a_id}")
+                results[a_id] = "fetch_error"
+                return
+            except Exception as e:
+                results[a_id] = f"exception: {e}"
+                return
+        if content is not None:
+            await asyncio.to_thread(writer.put, a_id, content)
+        results[a_id] = "ok"
+
+    # only used for robots.txt lookups; the fetchers download pages themselves
+    async with httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT}, follow_redirects=True
+    ) as client:
+        await asyncio.gather(
+            *(
+                fetch(client, FETCHERS[artifact_type](), a_id, url)
+                for artifact_type, urls in urls_by_type.items()
+                for a_id, url in round_robin(urls)
             )
-            raise
-    return results
+        )
+
+
+# extraction jobs queued per parse worker; bounds the pages held in memory
+REPARSE_JOBS_PER_WORKER = 4
+
+
+def reparse_and_store_content_many(
+    artifact_ids: list[int] | None = None,
+    *,
+    repo: DatabaseRepository,
+    parse_workers: int | None = None,
+    html_cache: HtmlCache | None = None,
+) -> dict:
+    """Extract raw content again from cached pages, without any download.
+
+    Pages are read from the HTML cache by the artifact's page hash and
+    extracted in a pool of `parse_workers` processes. Content that extracts to
+    the same text as before is not written. Statuses are those of `fetch-many`
+    plus "unchanged", "not_cached" for pages missing from the cache and
+    "parse_error".
+
+    Args:
+        artifact_ids (list[int] | None): artifacts to reparse; all if None
+    """
+    if html_cache is None:
+        html_cache = get_html_cache()
+    if html_cache is None:
+        raise HtmlCacheDisabledError("The HTML cache is disabled.")
+    if parse_workers is None:
+        parse_workers = get_parse_workers()
+
+    records = repo.list_pages(artifact_ids)
+    results: dict[int, str] = {}
+    if artifact_ids is not None:
+        listed_ids = {record.id for record in records}
+        for a_id in artifact_ids:
+            if a_id not in listed_ids:
+                results[a_id] = "not_cached" if repo.get(a_id) else "not_found"
+
+    max_pending = max(parse_workers, 1) * REPARSE_JOBS_PER_WORKER
+    pending: dict[Future, PageRecord] = {}
+
+    def collect(return_when: str) -> None:
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            record = pending.pop(future)
+            try:
+                content = future.result()
+            except ContentFetchError:
+                results[record.id] = "parse_error"
+            except Exception as e:
+                results[record.id] = f"exception: {e}"
+            else:
+                if content_hash(content) == record.content_hash:
+                    results[record.id] = "unchanged"
+                else:
+                    writer.put(record.id, content, record.validators)
+                    results[record.id] = "ok"
+
+    with (
+        BufferedContentWriter(repo, content_type=ContentType.RAW) as writer,
+        _parse_pool(min(parse_workers, len(records))) as parse_executor,
+        # PARSE_WORKERS=0 extracts in a thread, as fetch-many does
+        ThreadPoolExecutor(max_workers=1) as thread_executor,
+    ):
+        executor = parse_executor or thread_executor
+        for record in records:
+            page_hash = record.validators.page_hash
+            page = html_cache.get(page_hash) if page_hash is not None else None
+            if page is None:
+                results[record.id] = "not_cached"
+                continue
+            future = executor.submit(extract_content, record.url, page)
+            pending[future] = record
+            if len(pending) >= max_pending:
+                collect(FIRST_COMPLETED)
+        if pending:
+            collect(ALL_COMPLETED)
+    for a_id in writer.missing_ids:
+        results[a_id] = "not_found"
+    for a_id, e in writer.failed.items():
+        results[a_id] = f"exception: {e}"
+    _log_repo_stats(repo)
+    return dict(sorted(results.items()))
+
+
+def _log_repo_stats(repo: DatabaseRepository) -> None:
+    if (pool_stats := repo.pool_stats) is not None:
+        logger.debug(f"Connection pool: {pool_stats}")
+    if (cache_stats := repo.cache_stats) is not None:
+        logger.debug(f"Artifact cache: {cache_stats}")
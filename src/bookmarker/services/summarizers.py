@@ -2,7 +2,7 @@ import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Final
 
-from ..core.config import get_timeout_multithreading
+from ..core.config import get_max_workers, get_timeout_multithreading
 from ..core.database import DatabaseRepository
 from ..core.exceptions import (
     ArtifactNotFoundError,
@@ -12,7 +12,7 @@ from ..core.exceptions import (
 )
 from ..core.models import Artifact
 from ..core.summarizers import ContentSummarizer, get_summarizer
-from .base import ContentType, store_content
+from .base import BufferedContentWriter, ContentType, store_content
 
 logger = logging.getLogger(__name__)
 
@@ -33,8 +33,9 @@ def summarize_content(
             f"Summary already exists for artifact {artifact_id}"
         )
 
+    content_raw = repo.get_content_raw(artifact_id)
     try:
-        summary = summarizer.summarize(artifact.content_raw)
+        summary = summarizer.summarize(content_raw)
         return summary
     except (ContentSummaryError, InvalidAPIKeyError):
         logger.exception(f"Error summarizing content for artifact ID {artifact_id}")
@@ -64,23 +65,32 @@ def summarize_and_store_content_many(
     artifact_ids: list[int],
     *,
     repo: DatabaseRepository,
-    max_workers: int = 5,
+    summarizer: ContentSummarizer | None = None,
+    max_workers: int | None = None,
 ) -> dict:
-    summarizer = get_summarizer()
+    if summarizer is None:
+        summarizer = get_summarizer()
     timeout_multithreading: Final[int] = get_timeout_multithreading()
+    if max_workers is None:
+        max_workers = get_max_workers()
     results = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    with (
+        BufferedContentWriter(repo, content_type=ContentType.SUMMARY) as writer,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
         future_to_id = {}
         for a_id in artifact_ids:
             future = executor.submit(
-                summarize_and_store_content, a_id, repo=repo, summarizer=summarizer
+                summarize_content, a_id, repo=repo, summarizer=summarizer
             )
             future_to_id[future] = a_id
         try:
             for future in as_completed(future_to_id, timeout=timeout_multithreading):
                 a_id = future_to_id[future]
                 try:
-                    future.result()
+                    summary = future.result()
+                    if summary is not None:
+                        writer.put(a_id, summary)
                     results[a_id] = "ok"
                 except ArtifactNotFoundError:
                     results[a_id] = "not_found"
@@ -93,4 +103,13 @@ def summarize_and_store_content_many(
                 "Timeout error. Considering increasing TIMEOUT_MULTITHREADING."
             )
             raise
+    # artifacts deleted while they were being summarized
+    for a_id in writer.missing_ids:
+        results[a_id] = "not_found"
+    for a_id, e in writer.failed.items():
+        results[a_id] = f"exception: {e}"
+    if (pool_stats := repo.pool_stats) is not None:
+        logger.debug(f"Connection pool: {pool_stats}")
+    if (cache_stats := repo.cache_stats) is not None:
+        logger.debug(f"Artifact cache: {cache_stats}")
     return results
@@ -1,4 +1,7 @@
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import pytest
 
@@ -16,3 +19,90 @@ def db_repo():
 @pytest.fixture(autouse=True, scope="session")
 def set_env():
     os.environ["BOOKMARKER_ENV"] = "dev"
+
+
+@pytest.fixture(autouse=True)
+def html_cache_dir(tmp_path, monkeypatch):
+    # fetches write downloaded pages to the cache; keep them out of ~/.bookmarker
+    cache_dir = tmp_path / "html_cache"
+    monkeypatch.setenv("HTML_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+class StandInServer:
+    """Local HTTP/1.1 server with keep-alive, serving pages from a dict."""
+
+    def __init__(self):
+        self.pages: dict[str, tuple[int, str]] = {}
+        # extra response headers by path; an ETag also answers If-None-Match
+        self.page_headers: dict[str, dict[str, str]] = {}
+        self.request_headers: list[dict[str, str]] = []
+        self.connections = 0
+        self.requests = 0
+        self.active: dict[str, int] = {}
+        self.max_active: dict[str, int] = {}
+        self.delay = 0.0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                host = self.headers.get("Host", "")
+                with server._lock:
+                    server.requests += 1
+                    server.request_headers.append(dict(self.headers))
+                    server.active[host] = server.active.get(host, 0) + 1
+                    server.max_active[host] = max(
+                        server.max_active.get(host, 0), server.active[host]
+                    )
+                time.sleep(server.delay)
+                with server._lock:
+                    server.active[host] -= 1
+                status, body = server.pages.get(self.path, (404, "Not Found"))
+                headers = server.page_headers.get(self.path, {})
+                etag = headers.get("ETag")
+                if etag is not None and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, ""
+                payload = body.encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        # clients may hang up mid-response, e.g. when a test times them out
+        self._httpd.handle_error = lambda request, client_address: None
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def url(self, path: str, host: str | None = None) -> str:
+        address, port = self._httpd.server_address[:2]
+        return f"http://{host or address}:{port}{path}"
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    server = StandInServer()
+    server.start()
+    yield server
+    server.stop()
@@ -1,17 +1,21 @@
+import json
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from typer.testing import CliRunner
 
+from src.bookmarker.cli.helpers import complete_tag
 from src.bookmarker.cli.main import app
 from src.bookmarker.core.database import DatabaseRepository
 from src.bookmarker.core.exceptions import (
     ContentFetchError,
     ContentSummaryError,
     ContentSummaryExistsWarning,
+    HtmlCacheDisabledError,
     InvalidAPIKeyError,
     InvalidContentError,
 )
+from src.bookmarker.core.importers import ImportRecord
 
 runner = CliRunner()
 
@@ -101,6 +105,79 @@ def test_list_artifacts(add_artifact, add_another_artifact):
     assert "https://example2.com" in result.output
 
 
+def test_list_and_search_show_all_by_default(db_setup):
+    db_setup.create_db_and_tables()
+    db_setup.bulk_add(
+        ImportRecord(title=f"Bulk Article {i}", url=f"https://example.com/{i}")
+        for i in range(60)
+    )
+
+    result = runner.invoke(app, ["list"], env={"COLUMNS": "200"})
+    assert result.exit_code == 0
+    assert "Bulk Article 59" in result.output
+    assert "More results available." not in result.output
+
+    result = runner.invoke(app, ["search", "Bulk"])
+    assert result.exit_code == 0
+    assert "Found 60 artifacts." in result.output
+
+
+def test_list_artifacts_paginated(add_artifact, add_another_artifact):
+    result = runner.invoke(app, ["list", "--limit", "1", "--sort=-created"])
+
+    assert result.exit_code == 0
+    assert "Test Article 2" in result.output
+    assert "More results available." in result.output
+    cursor = result.output.split("--after ")[1].split("`")[0]
+
+    result = runner.invoke(
+        app, ["list", "--limit", "1", "--sort=-created", "--after", cursor]
+    )
+
+    assert result.exit_code == 0
+    assert "Test Article 2" not in result.output
+    assert "Test Article" in result.output
+    assert "More results available." not in result.output
+
+
+def test_list_artifacts_invalid_cursor(add_artifact):
+    result = runner.invoke(app, ["list", "--after", "bogus"])
+
+    assert result.exit_code == 1
+    assert "Invalid cursor" in result.output
+
+
+def test_list_artifacts_rank_sort_rejected():
+    result = runner.invoke(app, ["list", "--sort", "rank"])
+
+    assert result.exit_code == 1
+    assert "only available for search" in result.output
+
+
+def test_list_artifacts_by_tag_expression(add_artifact, add_another_artifact):
+    runner.invoke(app, ["tag-many", "1", "2", "--add", "python"])
+    runner.invoke(app, ["tag", "2", "draft"])
+
+    result = runner.invoke(app, ["list", "--tag", "python & !draft"])
+    assert result.exit_code == 0
+    assert "example.com" in result.output
+    assert "example2.com" not in result.output
+
+    result = runner.invoke(app, ["list", "--tag", "python &"])
+    assert result.exit_code == 1
+    assert "Invalid tag expression" in result.output
+
+
+def test_help_does_not_open_database(monkeypatch):
+    get_repo = Mock(side_effect=AssertionError("database opened"))
+    monkeypatch.setattr("src.bookmarker.cli.helpers.get_repo", get_repo)
+
+    result = runner.invoke(app, ["list", "--help"])
+
+    assert result.exit_code == 0
+    get_repo.assert_not_called()
+
+
 def test_list_artifacts_empty():
     result = runner.invoke(app, ["list"])
 
@@ -117,6 +194,16 @@ def test_fetch_content(mock_fetch_store_func, add_artifact, db_setup):
     mock_fetch_store_func.assert_called_once_with(1, repo=db_setup)
 
 
+@patch("src.bookmarker.services.fetchers.fetch_and_store_content")
+def test_fetch_content_unchanged(mock_fetch_store_func, add_artifact):
+    mock_fetch_store_func.return_value = None
+
+    result = runner.invoke(app, ["fetch", "1"])
+
+    assert result.exit_code == 0
+    assert "Content unchanged for artifact ID 1." in result.output
+
+
 def test_fetch_content_not_found():
     result = runner.invoke(app, ["fetch", "99"])
 
@@ -144,7 +231,7 @@ def test_fetch_content_not_implemented_error(mock_fetch_store_func, add_artifact
     assert "This fetcher is on the feature roadmap." in result.output
 
 
-@patch("src.bookmarker.services.fetchers.fetch_and_store_content_many")
+@patch("src.bookmarker.services.fetchers.fetch_and_store_content_pooled")
 def test_fetch_content_many(mock_fetch_store_func, add_artifact, db_setup):
     mock_fetch_store_func.return_value = {1: "ok", 2: "ok", 3: "ok"}
 
@@ -157,7 +244,7 @@ def test_fetch_content_many(mock_fetch_store_func, add_artifact, db_setup):
     mock_fetch_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
 
 
-@patch("src.bookmarker.services.fetchers.fetch_and_store_content_many")
+@patch("src.bookmarker.services.fetchers.fetch_and_store_content_pooled")
 def test_fetch_content_many_not_found(mock_fetch_store_func, add_artifact, db_setup):
     mock_fetch_store_func.return_value = {1: "ok", 2: "not_found", 3: "ok"}
 
@@ -170,7 +257,18 @@ def test_fetch_content_many_not_found(mock_fetch_store_func, add_artifact, db_se
     mock_fetch_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
 
 
-@patch("src.bookmarker.services.fetchers.fetch_and_store_content_many")
+@patch("src.bookmarker.services.fetchers.fetch_and_store_content_pooled")
+def test_fetch_content_many_unchanged(mock_fetch_store_func, add_artifact, db_setup):
+    mock_fetch_store_func.return_value = {1: "unchanged", 2: "ok"}
+
+    result = runner.invoke(app, ["fetch-many", "1", "2"])
+
+    assert result.exit_code == 0
+    assert "Artifact 1 is unchanged." in result.output
+    assert "Fetched artifact 2 successfully." in result.output
+
+
+@patch("src.bookmarker.services.fetchers.fetch_and_store_content_pooled")
 def test_fetch_content_many_error(mock_fetch_store_func, add_artifact, db_setup):
     mock_fetch_store_func.return_value = {
         1: "ok",
@@ -187,15 +285,44 @@ def test_fetch_content_many_error(mock_fetch_store_func, add_artifact, db_setup)
     mock_fetch_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
 
 
-@patch("src.bookmarker.services.fetchers.fetch_and_store_content_many")
-def test_fetch_content_many_timeout(mock_fetch_store_func, add_artifact, db_setup):
-    mock_fetch_store_func.side_effect = TimeoutError
+@patch("src.bookmarker.services.fetchers.reparse_and_store_content_many")
+def test_reparse(mock_reparse_func, add_artifact, db_setup):
+    mock_reparse_func.return_value = {
+        1: "ok",
+        2: "unchanged",
+        3: "not_cached",
+        4: "parse_error",
+    }
 
-    result = runner.invoke(app, ["fetch-many", "1", "2", "3"])
+    result = runner.invoke(app, ["reparse", "1", "2", "3", "4"])
+
+    assert result.exit_code == 0
+    assert "Reparsed artifact 1." in result.output
+    assert "Artifact 2 is unchanged." in result.output
+    assert "No cached page for artifact 3." in result.output
+    assert "Failed to reparse artifact 4: parse_error" in result.output
+    mock_reparse_func.assert_called_once_with([1, 2, 3, 4], repo=db_setup)
+
+
+@patch("src.bookmarker.services.fetchers.reparse_and_store_content_many")
+def test_reparse_all(mock_reparse_func, db_setup):
+    mock_reparse_func.return_value = {}
+
+    result = runner.invoke(app, ["reparse"])
+
+    assert result.exit_code == 0
+    assert "No cached pages to reparse." in result.output
+    mock_reparse_func.assert_called_once_with(None, repo=db_setup)
+
+
+@patch("src.bookmarker.services.fetchers.reparse_and_store_content_many")
+def test_reparse_cache_disabled(mock_reparse_func, db_setup):
+    mock_reparse_func.side_effect = HtmlCacheDisabledError
+
+    result = runner.invoke(app, ["reparse"])
 
     assert result.exit_code == 1
-    assert "Exceeded time limit for bulk fetching." in result.output
-    mock_fetch_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
+    assert "The HTML cache is disabled." in result.output
 
 
 @patch("src.bookmarker.cli.summarizers.generate_panel")
@@ -211,7 +338,9 @@ def test_summarize_content(
     assert result.exit_code == 0
     assert "Content summarized for artifact ID 1." in result.output
     assert "<Panel>" in result.output
-    mock_summarize_store_func.assert_called_once_with(1, repo=db_setup, refresh=False)
+    mock_summarize_store_func.assert_called_once_with(
+        1, repo=db_setup, summarizer=None, refresh=False
+    )
 
 
 def test_summarize_content_not_found():
@@ -231,7 +360,9 @@ def test_summarize_content_summary_exists_warning(
 
     assert result.exit_code == 0
     assert "Artifact with ID 1 already has summary." in result.output
-    mock_summarize_store_func.assert_called_once_with(1, repo=db_setup, refresh=False)
+    mock_summarize_store_func.assert_called_once_with(
+        1, repo=db_setup, summarizer=None, refresh=False
+    )
 
 
 @patch("src.bookmarker.services.summarizers.summarize_and_store_content")
@@ -244,7 +375,9 @@ def test_summarize_content_invalid_content_error(
 
     assert result.exit_code == 1
     assert "Artifact with ID 1 has no raw content yet." in result.output
-    mock_summarize_store_func.assert_called_once_with(1, repo=db_setup, refresh=False)
+    mock_summarize_store_func.assert_called_once_with(
+        1, repo=db_setup, summarizer=None, refresh=False
+    )
 
 
 @patch("src.bookmarker.services.summarizers.summarize_and_store_content")
@@ -257,7 +390,9 @@ def test_summarize_content_invalid_key_error(
 
     assert result.exit_code == 1
     assert "Invalid API key" in result.output
-    mock_summarize_store_func.assert_called_once_with(1, repo=db_setup, refresh=False)
+    mock_summarize_store_func.assert_called_once_with(
+        1, repo=db_setup, summarizer=None, refresh=False
+    )
 
 
 @patch("src.bookmarker.services.summarizers.summarize_and_store_content")
@@ -270,7 +405,9 @@ def test_summarize_content_summarize_error(
 
     assert result.exit_code == 1
     assert "Error summarizing content for artifact ID 1." in result.output
-    mock_summarize_store_func.assert_called_once_with(1, repo=db_setup, refresh=False)
+    mock_summarize_store_func.assert_called_once_with(
+        1, repo=db_setup, summarizer=None, refresh=False
+    )
 
 
 @patch("src.bookmarker.services.summarizers.summarize_and_store_content_many")
@@ -283,7 +420,9 @@ def test_summarize_content_many(mock_summarize_store_func, db_setup):
     assert "Summarized artifact 1 successfully." in result.output
     assert "Summarized artifact 2 successfully." in result.output
     assert "Summarized artifact 3 successfully." in result.output
-    mock_summarize_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
+    mock_summarize_store_func.assert_called_once_with(
+        [1, 2, 3], repo=db_setup, summarizer=None
+    )
 
 
 @patch("src.bookmarker.services.summarizers.summarize_and_store_content_many")
@@ -296,7 +435,9 @@ def test_summarize_content_many_not_found(mock_summarize_store_func, db_setup):
     assert "Summarized artifact 1 successfully." in result.output
     assert "Artifact 2 not found." in result.output
     assert "Summarized artifact 3 successfully." in result.output
-    mock_summarize_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
+    mock_summarize_store_func.assert_called_once_with(
+        [1, 2, 3], repo=db_setup, summarizer=None
+    )
 
 
 @patch("src.bookmarker.services.summarizers.summarize_and_store_content_many")
@@ -313,7 +454,9 @@ def test_summarize_content_many_error(mock_summarize_store_func, db_setup):
     assert "Summarized artifact 1 successfully." in result.output
     assert "Failed to summarize artifact 2: summarize_error" in result.output
     assert "Failed to summarize artifact 3: exception: other" in result.output
-    mock_summarize_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
+    mock_summarize_store_func.assert_called_once_with(
+        [1, 2, 3], repo=db_setup, summarizer=None
+    )
 
 
 @patch("src.bookmarker.services.summarizers.summarize_and_store_content_many")
@@ -329,7 +472,9 @@ def test_summarize_content_many_timeout(mock_summarize_store_func, db_setup):
 
     assert result.exit_code == 1
     assert "Exceeded time limit for bulk summarizing." in result.output
-    mock_summarize_store_func.assert_called_once_with([1, 2, 3], repo=db_setup)
+    mock_summarize_store_func.assert_called_once_with(
+        [1, 2, 3], repo=db_setup, summarizer=None
+    )
 
 
 @patch("src.bookmarker.cli.helpers.get_repo")
@@ -338,7 +483,7 @@ def test_show_artifact(mock_get_repo):
         id=1,
         title="Test Article",
         url="https://example.com",
-        content_raw="Test content",
+        content_hash="e3b0c442",
         content_summary="Test summary.",
     )
     mock_repo = Mock()
@@ -369,7 +514,7 @@ def test_show_artifact_not_summarized(mock_get_repo):
         id=1,
         title="Test Article",
         url="https://example.com",
-        content_raw="Test content",
+        content_hash="e3b0c442",
         content_summary=None,
     )
     mock_repo = Mock()
@@ -407,6 +552,31 @@ def test_search_artifact(add_artifact, add_another_artifact):
     assert "No artifacts found matching the search criteria." in result.output
 
 
+def test_search_artifact_paginated(add_artifact, add_another_artifact):
+    result = runner.invoke(app, ["search", "Test", "--limit", "1", "--sort", "title"])
+
+    assert result.exit_code == 0
+    assert "Showing 1 artifact; more match." in result.output
+    assert "More results available." in result.output
+    assert "bookmarker search Test --sort=title --after" in result.output
+
+
+def test_search_artifact_fuzzy(add_artifact, add_another_artifact):
+    result = runner.invoke(app, ["search", "Artcle", "--fuzzy"])
+    assert result.exit_code == 0
+    assert "Found 2 artifacts." in result.output
+    assert "**article**" in result.output
+
+    result = runner.invoke(app, ["search", "Artcle", "--fuzzy", "--limit", "1"])
+    assert result.exit_code == 0
+    assert "Showing 1 artifact; more match." in result.output
+    assert "Showing the 1 closest matches" in result.output
+
+    result = runner.invoke(app, ["search", "Artcle", "--fuzzy", "--sort", "title"])
+    assert result.exit_code == 1
+    assert "--after and --sort do not apply" in result.output
+
+
 def test_search_artifact_by_tag(add_artifact):
     runner.invoke(app, ["tag", "1", "python"])
 
@@ -419,9 +589,17 @@ def test_search_artifact_by_tag(add_artifact):
     assert result.exit_code == 0
     assert "No artifacts found matching the search criteria." in result.output
 
+    result = runner.invoke(app, ["search", "Test", "--tag", "!python | bogus-tag"])
+    assert result.exit_code == 0
+    assert "No artifacts found matching the search criteria." in result.output
+
+    result = runner.invoke(app, ["search", "Test", "--tag", "(python"])
+    assert result.exit_code == 1
+    assert "Invalid tag expression" in result.output
+
 
 @patch("src.bookmarker.cli.base.generate_panel")
-@patch("src.bookmarker.cli.base.update_tags")
+@patch("src.bookmarker.services.base.update_tags")
 @patch("src.bookmarker.cli.helpers.get_repo")
 def test_tag_artifact(mock_get_repo, mock_update_tags, mock_generate_panel):
     mock_artifact = MagicMock(id=1)
@@ -445,3 +623,144 @@ def test_tag_artifact_not_found():
 
     assert result.exit_code == 1
     assert "Artifact with ID 99 not found." in result.output
+
+
+def test_tag_artifacts_many(add_artifact, add_another_artifact):
+    result = runner.invoke(
+        app, ["tag-many", "1", "2", "--add", "python", "--add", "Data Eng"]
+    )
+
+    assert result.exit_code == 0
+    assert "Updated tags on 2 artifacts." in result.output
+
+    result = runner.invoke(
+        app,
+        ["tag-many", "--tag", "python", "--search", "example2", "--remove", "python"],
+    )
+    assert "Updated tags on 1 artifacts." in result.output
+
+    result = runner.invoke(app, ["search", "", "--tag", "python"])
+    assert "Test Article 2" not in result.output
+    assert "#data-eng" in result.output
+
+
+def test_list_tags(add_artifact, add_another_artifact):
+    runner.invoke(app, ["tag-many", "1", "2", "--add", "python"])
+    runner.invoke(app, ["tag", "2", "pytest"])
+
+    result = runner.invoke(app, ["tags"])
+    assert result.exit_code == 0
+    assert "python" in result.output
+    assert "2" in result.output
+
+    result = runner.invoke(app, ["tags", "pyte"])
+    assert "pytest" in result.output
+    assert "python" not in result.output
+
+
+def test_list_tags_empty():
+    result = runner.invoke(app, ["tags"])
+
+    assert result.exit_code == 0
+    assert "No tags found." in result.output
+
+
+def test_complete_tag(add_artifact, add_another_artifact):
+    runner.invoke(app, ["tag-many", "1", "2", "--add", "python", "--add", "perf"])
+
+    assert complete_tag("py") == [("python", "2 artifacts")]
+    assert complete_tag("python & !p") == [
+        ("python & !perf", "2 artifacts"),
+        ("python & !python", "2 artifacts"),
+    ]
+
+
+def test_tag_artifacts_many_requires_selection():
+    result = runner.invoke(app, ["tag-many", "--add", "python"])
+
+    assert result.exit_code == 1
+    assert "Select artifacts" in result.output
+
+
+def test_tag_artifacts_many_requires_tags():
+    result = runner.invoke(app, ["tag-many", "1"])
+
+    assert result.exit_code == 1
+    assert "--add or --remove" in result.output
+
+
+def test_import_bookmarks(tmp_path, add_artifact):
+    path = tmp_path / "bookmarks.jsonl"
+    path.write_text(
+        '{"url": "https://example.com/", "title": "Duplicate"}\n'
+        '{"url": "https://new.example.com", "title": "New", "tags": ["python"]}\n'
+    )
+
+    result = runner.invoke(app, ["import", str(path)])
+
+    assert result.exit_code == 0
+    assert "Imported 1 artifacts." in result.output
+    assert "Skipped 1 URLs that already exist." in result.output
+
+    result = runner.invoke(app, ["search", "", "--tag", "python"])
+    assert "New" in result.output
+
+
+def test_import_bookmarks_format_option(tmp_path):
+    path = tmp_path / "bookmarks.txt"
+    path.write_text("url,title\nhttps://example.com,Example\n")
+
+    result = runner.invoke(app, ["import", str(path)])
+    assert result.exit_code == 1
+    assert "pass --format" in result.output
+
+    result = runner.invoke(app, ["import", str(path), "--format", "csv"])
+    assert result.exit_code == 0
+    assert "Imported 1 artifacts." in result.output
+
+
+def test_import_bookmarks_invalid_file(tmp_path):
+    path = tmp_path / "bookmarks.csv"
+    path.write_text("title,link\nExample,https://example.com\n")
+
+    result = runner.invoke(app, ["import", str(path)])
+
+    assert result.exit_code == 1
+    assert "needs a header row" in result.output
+
+
+def test_export_artifacts(tmp_path, add_artifact, add_another_artifact):
+    path = tmp_path / "export.jsonl"
+
+    result = runner.invoke(app, ["export", str(path), "--no-content"])
+
+    assert result.exit_code == 0
+    assert "Exported 2 artifacts" in result.output
+    assert "--since" in result.output
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["title"] for row in rows] == ["Test Article", "Test Article 2"]
+    assert "content_raw" not in rows[0]
+
+
+def test_export_artifacts_since(tmp_path, add_artifact):
+    path = tmp_path / "export.jsonl"
+
+    result = runner.invoke(app, ["export", str(path), "--since", "2999-01-01"])
+
+    assert result.exit_code == 0
+    assert "Exported 0 artifacts" in result.output
+    assert path.read_text() == ""
+
+
+def test_export_artifacts_stdout(add_artifact):
+    result = runner.invoke(app, ["export", "-"])
+
+    assert result.exit_code == 0
+    assert json.loads(result.output)["url"] == "https://example.com"
+
+
+def test_export_artifacts_parquet_stdout():
+    result = runner.invoke(app, ["export", "-", "--format", "parquet"])
+
+    assert result.exit_code == 1
+    assert "Only JSONL" in result.output
@@ -0,0 +1,97 @@
+import socket
+import threading
+
+import pytest
+from rich.console import Console
+
+from src.bookmarker.cli.client import daemon_running, forward, get_socket_path
+from src.bookmarker.cli.daemon import CommandServer
+from src.bookmarker.cli.helpers import AppConfig
+from src.bookmarker.core.database import DatabaseRepository
+
+
+@pytest.fixture
+def socket_path(tmp_path, monkeypatch):
+    path = tmp_path / "d.sock"
+    monkeypatch.setenv("BOOKMARKER_SOCKET", str(path))
+    return path
+
+
+@pytest.fixture
+def daemon(tmp_path, socket_path, monkeypatch):
+    repo = DatabaseRepository(f"sqlite:///{tmp_path / 'test.db'}")
+    repo.create_db_and_tables()
+    # forwarded commands must use the daemon's repository, never open their own
+    monkeypatch.setattr(
+        "src.bookmarker.cli.helpers.get_repo",
+        lambda: pytest.fail("forwarded command opened a repository"),
+    )
+    config = AppConfig(console=Console(), error_console=Console(stderr=True))
+    config.repo = repo
+    server = CommandServer(socket_path, config)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+    repo._engine.dispose()
+
+
+def test_get_socket_path(monkeypatch):
+    monkeypatch.delenv("BOOKMARKER_SOCKET", raising=False)
+    monkeypatch.setenv("BOOKMARKER_ENV", "dev")
+
+    assert get_socket_path().name == "daemon-dev.sock"
+
+
+def test_forward_without_daemon(socket_path):
+    assert not daemon_running(socket_path)
+    assert forward(["list"]) is None
+
+
+def test_forward_skips_local_commands(daemon):
+    assert forward(["init"]) is None
+    assert forward(["serve"]) is None
+    assert forward([]) is None
+
+
+def test_forward_runs_command_on_daemon(daemon, socket_path, capsys):
+    assert daemon_running(socket_path)
+
+    exit_code = forward(["add", "Test Article", "https://example.com", "--no-auto"])
+    assert exit_code == 0
+    assert "Artifact added with ID 1" in capsys.readouterr().out
+
+    assert forward(["show", "1"]) == 0
+    assert "Test Article" in capsys.readouterr().out
+
+    assert forward(["show", "99"]) == 1
+    assert "Artifact with ID 99 not found." in capsys.readouterr().err
+
+
+def test_daemon_rejects_local_commands(daemon):
+    response = daemon.run({"argv": ["init"]})
+
+    assert response["exit_code"] == 2
+    assert "not served" in response["stderr"]
+
+
+def test_daemon_socket_is_owner_only(daemon, socket_path):
+    assert socket_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_daemon_reports_usage_errors(daemon, capsys):
+    assert forward(["show", "not-an-id"]) == 2
+    assert "Invalid value" in capsys.readouterr().err
+
+
+def test_forward_times_out_on_hung_daemon(socket_path, monkeypatch, capsys):
+    monkeypatch.setenv("BOOKMARKER_DAEMON_TIMEOUT", "0.1")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as hung:
+        hung.bind(str(socket_path))
+        hung.listen()  # accepts connections but never answers
+
+        assert forward(["list"]) == 1
+
+    assert "did not answer in time" in capsys.readouterr().err
@@ -1,8 +1,10 @@
 from unittest.mock import Mock, patch
 
 import pytest
+import typer
 
 from src.bookmarker.cli.helpers import app_callback
+from src.bookmarker.core.exceptions import SchemaMigrationError
 
 
 @patch("src.bookmarker.cli.helpers.get_repo")
@@ -11,5 +13,31 @@ def test_app_callback_runtime_error(mock_get_repo):
     mock_ctx = Mock()
     mock_ctx.invoked_subcommand == "not init"
 
+    app_callback(mock_ctx)
     with pytest.raises(RuntimeError):
-        app_callback(mock_ctx)
+        mock_ctx.obj.repo
+
+
+@patch("src.bookmarker.cli.helpers.get_repo")
+def test_app_callback_opens_repo_lazily(mock_get_repo):
+    mock_ctx = Mock()
+
+    app_callback(mock_ctx)
+    mock_get_repo.assert_not_called()
+
+    assert mock_ctx.obj.repo is mock_ctx.obj.repo
+    mock_get_repo.assert_called_once()
+    mock_get_repo.return_value.ensure_schema.assert_called_once()
+
+
+@patch("src.bookmarker.cli.helpers.get_repo")
+def test_app_callback_exits_when_schema_upgrade_fails(mock_get_repo):
+    mock_get_repo.return_value.ensure_schema.side_effect = SchemaMigrationError(
+        "Could not upgrade database schema old"
+    )
+    mock_ctx = Mock()
+
+    app_callback(mock_ctx)
+    with pytest.raises(typer.Exit) as exc_info:
+        mock_ctx.obj.repo
+    assert exc_info.value.exit_code == 1
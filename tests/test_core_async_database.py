@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from src.bookmarker.core.async_database import (
+    AsyncDatabaseRepository,
+    async_database_url,
+)
+from src.bookmarker.core.exceptions import ArtifactNotFoundError
+from src.bookmarker.core.models import Artifact, Tag, TagCount
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture
+def run_async_repo(tmp_path):
+    """Run a coroutine function against a fresh file-backed async repository."""
+
+    def run(test):
+        async def main():
+            async with AsyncDatabaseRepository(
+                f"sqlite:///{tmp_path / 'test.db'}"
+            ) as repo:
+                await repo.create_db_and_tables()
+                return await test(repo)
+
+        return asyncio.run(main())
+
+    return run
+
+
+def make_article(title="Python Tips", url="https://example.com/python"):
+    return Artifact(title=title, url=url, tags=[Tag(name="python")])
+
+
+@pytest.mark.parametrize(
+    "database_url, expected",
+    [
+        ("sqlite:///test.db", "sqlite+aiosqlite:///test.db"),
+        ("sqlite+pysqlite:///test.db", "sqlite+aiosqlite:///test.db"),
+        ("postgres://user@host/db", "postgresql+asyncpg://user@host/db"),
+        ("postgresql+psycopg://user@host/db", "postgresql+asyncpg://user@host/db"),
+    ],
+)
+def test_async_database_url(database_url, expected):
+    assert async_database_url(database_url).render_as_string() == expected
+
+
+def test_async_database_url_unsupported_backend():
+    with pytest.raises(ValueError, match="No async driver"):
+        async_database_url("mysql://user@host/db")
+
+
+def test_async_repo_uses_async_driver(run_async_repo):
+    async def test(repo):
+        return repo._engine.dialect.driver, repo.is_sqlite
+
+    assert run_async_repo(test) == ("aiosqlite", True)
+
+
+def test_async_repo_applies_sqlite_pragmas(run_async_repo):
+    async def test(repo):
+        async with repo._engine.connect() as connection:
+            return (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+
+    assert run_async_repo(test) == "wal"
+
+
+def test_async_add_get_and_delete(run_async_repo):
+    async def test(repo):
+        artifact = make_article()
+        await repo.add(artifact)
+        by_id = await repo.get(artifact.id)
+        by_url = await repo.get_by_url("https://example.com/python/")
+        await repo.delete(artifact.id)
+        return by_id, by_url, await repo.get(artifact.id)
+
+    by_id, by_url, deleted = run_async_repo(test)
+
+    assert by_id.title == "Python Tips"
+    assert [tag.name for tag in by_id.tags] == ["python"]
+    assert by_url.id == by_id.id
+    assert deleted is None
+
+
+def test_async_list_and_iterate(run_async_repo):
+    async def test(repo):
+        for i in range(5):
+            await repo.add(make_article(f"Article {i}", f"https://example.com/{i}"))
+        items = [item async for item in repo.iter_list_items(batch_size=2)]
+        return await repo.list(), await repo.list_items(), items
+
+    artifacts, items, iterated = run_async_repo(test)
+
+    assert len(artifacts) == 5
+    assert [item.title for item in iterated] == [item.title for item in items]
+
+
+def test_async_search(run_async_repo):
+    async def test(repo):
+        await repo.add(make_article())
+        await repo.add(Artifact(title="Cloud Costs", url="https://example.com/cloud"))
+        hits = [hit async for hit in repo.iter_search("python")]
+        return await repo.search("cloud"), hits
+
+    artifacts, hits = run_async_repo(test)
+
+    assert [artifact.title for artifact in artifacts] == ["Cloud Costs"]
+    assert [hit.artifact.title for hit in hits] == ["Python Tips"]
+
+
+def test_async_store_content(run_async_repo):
+    async def test(repo):
+        artifact = make_article()
+        await repo.add(artifact)
+        await repo.store_content_raw(artifact.id, "raw body")
+        await repo.store_content_summary_many({artifact.id: "short summary"})
+        return await repo.get_content_raw(artifact.id), await repo.get(artifact.id)
+
+    content_raw, artifact = run_async_repo(test)
+
+    assert content_raw == "raw body"
+    assert artifact.content_summary == "short summary"
+
+
+def test_async_tag(run_async_repo):
+    async def test(repo):
+        artifact = make_article()
+        await repo.add(artifact)
+        tagged = await repo.tag(artifact.id, Tag(name="perf"))
+        return tagged, await repo.list_tags()
+
+    tagged, tags = run_async_repo(test)
+
+    assert sorted(tag.name for tag in tagged.tags) == ["perf", "python"]
+    assert tags == [TagCount("perf", 1), TagCount("python", 1)]
+
+
+def test_async_tag_missing_artifact(run_async_repo):
+    async def test(repo):
+        await repo.tag(999, Tag(name="perf"))
+
+    with pytest.raises(ArtifactNotFoundError):
+        run_async_repo(test)
+
+
+def test_async_calls_run_concurrently(run_async_repo):
+    async def test(repo):
+        await asyncio.gather(
+            *(
+                repo.add(make_article(f"Article {i}", f"https://example.com/{i}"))
+                for i in range(10)
+            )
+        )
+        return await repo.list_items()
+
+    assert len(run_async_repo(test)) == 10
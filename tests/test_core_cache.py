@@ -0,0 +1,131 @@
+from datetime import datetime
+
+import pytest
+
+from src.bookmarker.core.cache import ArtifactCache, CacheStats
+from src.bookmarker.core.models import Artifact
+
+UPDATED_AT = datetime(2025, 1, 1)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ArtifactCache(maxsize=2, ttl=10, clock=clock)
+
+
+def make_artifact(artifact_id):
+    return Artifact(
+        id=artifact_id,
+        title=f"Article {artifact_id}",
+        url=f"https://example.com/{artifact_id}",
+        url_normalized=f"example.com/{artifact_id}",
+        updated_at=UPDATED_AT,
+    )
+
+
+def test_cache_hit_and_miss(cache):
+    artifact = make_artifact(1)
+    cache.put(artifact)
+
+    assert cache.get(1) == (artifact, True)
+    assert cache.get(2) == (None, False)
+    assert cache.stats == CacheStats(hits=1, misses=1)
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_cache_get_id_by_url(cache):
+    cache.put(make_artifact(1))
+
+    assert cache.get_id("example.com/1") == 1
+    assert cache.get_id("example.com/2") is None
+    assert cache.stats.misses == 1
+
+
+def test_cache_evicts_least_recently_used(cache):
+    for artifact_id in (1, 2):
+        cache.put(make_artifact(artifact_id))
+    cache.get(1)
+
+    cache.put(make_artifact(3))
+
+    assert len(cache) == 2
+    assert cache.get(2) == (None, False)
+    assert cache.get_id("example.com/2") is None
+    assert cache.get(1)[0] is not None
+    assert cache.stats.evictions == 1
+
+
+def test_cache_entries_go_stale_after_ttl(cache, clock):
+    artifact = make_artifact(1)
+    cache.put(artifact)
+    clock.now = 11
+
+    assert cache.get(1) == (artifact, False)
+    assert cache.stats == CacheStats()
+
+
+def test_cache_revalidate_renews_unchanged_entry(cache, clock):
+    artifact = make_artifact(1)
+    cache.put(artifact)
+    clock.now = 11
+
+    assert cache.revalidate(1, UPDATED_AT).model_dump() == artifact.model_dump()
+    cached, is_fresh = cache.get(1)
+    assert is_fresh
+    assert cached.model_dump() == artifact.model_dump()
+    assert cache.stats == CacheStats(hits=1, revalidations=1)
+
+
+def test_cache_hands_out_copies(cache):
+    artifact = make_artifact(1)
+    cache.put(artifact)
+    artifact.title = "Changed by the caller"
+
+    cached, _ = cache.get(1)
+    cached.title = "Changed again"
+
+    assert cached is not artifact
+    assert cache.get(1)[0].title == "Article 1"
+
+
+@pytest.mark.parametrize(
+    "updated_at, exists", [(datetime(2025, 1, 2), True), (None, False)]
+)
+def test_cache_revalidate_drops_changed_entry(cache, clock, updated_at, exists):
+    cache.put(make_artifact(1))
+    clock.now = 11
+
+    assert cache.revalidate(1, updated_at, exists=exists) is None
+    assert len(cache) == 0
+    assert cache.get_id("example.com/1") is None
+
+
+def test_cache_invalidate_and_clear(cache):
+    for artifact_id in (1, 2):
+        cache.put(make_artifact(artifact_id))
+
+    cache.invalidate([1, 99])
+    assert cache.get(1) == (None, False)
+    assert len(cache) == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get_id("example.com/2") is None
+
+
+def test_cache_size_must_be_positive():
+    with pytest.raises(ValueError, match="at least 1"):
+        ArtifactCache(maxsize=0, ttl=10)
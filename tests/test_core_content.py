@@ -0,0 +1,48 @@
+import pytest
+
+from src.bookmarker.core.content import (
+    compress,
+    content_hash,
+    decompress,
+    pack_content,
+    unpack_content,
+    zstd,
+)
+from src.bookmarker.core.models import ContentCodec
+
+
+def test_content_hash_is_stable():
+    assert content_hash("body") == content_hash("body")
+    assert content_hash("body") != content_hash("Body")
+    assert len(content_hash("body")) == 64
+
+
+def test_zlib_round_trip():
+    content = "# Heading\n\nUnicode survives: café ☕ " * 50
+
+    data = compress(content, ContentCodec.ZLIB)
+
+    assert len(data) < len(content.encode())
+    assert decompress(data, ContentCodec.ZLIB) == content
+
+
+@pytest.mark.skipif(zstd is None, reason="zstd requires Python 3.14+")
+def test_zstd_round_trip():
+    data = compress("body " * 50, ContentCodec.ZSTD)
+
+    assert decompress(data, ContentCodec.ZSTD) == "body " * 50
+
+
+@pytest.mark.skipif(zstd is not None, reason="zstd is available")
+def test_zstd_unavailable():
+    with pytest.raises(ValueError):
+        compress("body", ContentCodec.ZSTD)
+
+
+def test_pack_content():
+    blob = pack_content("café", ContentCodec.ZLIB)
+
+    assert blob.hash == content_hash("café")
+    assert blob.codec == ContentCodec.ZLIB
+    assert blob.size == 5
+    assert unpack_content(blob) == "café"
@@ -0,0 +1,70 @@
+import io
+import json
+import sys
+from datetime import datetime
+
+import pytest
+
+from src.bookmarker.core.exceptions import MissingDependencyError
+from src.bookmarker.core.exporters import ExportResult, write_jsonl, write_parquet
+from src.bookmarker.core.models import ArtifactTypeEnum
+
+ROWS = [
+    {
+        "id": 1,
+        "title": "Café",
+        "url": "https://example.com/a",
+        "artifact_type": ArtifactTypeEnum.ARTICLE,
+        "notes": None,
+        "created_at": datetime(2025, 1, 1, 8, 0),
+        "updated_at": datetime(2025, 1, 3, 8, 0),
+        "tags": ["python"],
+    },
+    {
+        "id": 2,
+        "title": "B",
+        "url": "https://example.com/b",
+        "artifact_type": ArtifactTypeEnum.YOUTUBE,
+        "notes": "Watch later",
+        "created_at": datetime(2025, 1, 2, 8, 0),
+        "updated_at": datetime(2025, 1, 2, 9, 0),
+        "tags": [],
+    },
+]
+
+
+def test_write_jsonl():
+    file = io.StringIO()
+
+    result = write_jsonl(iter(ROWS), file)
+
+    assert result == ExportResult(count=2, last_updated_at=datetime(2025, 1, 3, 8, 0))
+    lines = file.getvalue().splitlines()
+    assert "Café" in lines[0]
+    first = json.loads(lines[0])
+    assert first["artifact_type"] == "article"
+    assert first["created_at"] == "2025-01-01T08:00:00"
+    assert json.loads(lines[1])["notes"] == "Watch later"
+
+
+def test_write_jsonl_empty():
+    assert write_jsonl([], io.StringIO()) == ExportResult(0, None)
+
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "export.parquet"
+
+    result = write_parquet(ROWS, path, include_content=False, row_group_size=1)
+
+    assert result.count == 2
+    table = pq.read_table(path)
+    assert table.num_rows == 2
+    assert table.column("tags").to_pylist() == [["python"], []]
+
+
+def test_write_parquet_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(MissingDependencyError):
+        write_parquet(ROWS, tmp_path / "export.parquet")
@@ -1,13 +1,23 @@
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from unittest.mock import patch
 
+import httpx
 import pytest
+from trafilatura.downloads import USER_AGENT
 
+from src.bookmarker.core.config import HostSettings
 from src.bookmarker.core.exceptions import ContentFetchError
 from src.bookmarker.core.fetchers import (
+    AsyncHttpFetcher,
     ContentFetcher,
     TrafilaturaFetcher,
     YouTubeFetcher,
+    decode_page,
 )
+from src.bookmarker.core.models import PageValidators
 
 
 def test_contentfetcher_is_abstract():
@@ -57,3 +67,235 @@ def test_youtubefetcher_not_implemented_error():
 
     with pytest.raises(NotImplementedError):
         fetcher.fetch("https://example.com")
+
+
+ARTICLE_HTML = (
+    "<html><head><title>Pooling</title></head><body><article><h1>Pooling</h1>"
+    + "<p>Reusing connections saves a handshake for every request to a host.</p>" * 5
+    + "</article></body></html>"
+)
+
+
+# a single stand-in host, so per-host politeness would serialize most tests
+NO_HOST_LIMITS = HostSettings(max_per_host=100, delay=0)
+
+
+def fetch_all(fetcher, urls, validators=None):
+    async def main():
+        return {
+            result.key: result async for result in fetcher.fetch_many(urls, validators)
+        }
+
+    return asyncio.run(main())
+
+
+def test_asynchttpfetcher_fetch_many(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    fetcher = AsyncHttpFetcher()
+
+    results = fetch_all(
+        fetcher, {1: http_server.url("/ok"), 2: http_server.url("/missing")}
+    )
+
+    assert results[1].error is None
+    assert "Reusing connections saves a handshake" in results[1].content
+    assert isinstance(results[2].error, ContentFetchError)
+    assert "Failed to get content from URL" in str(results[2].error)
+
+
+def test_asynchttpfetcher_reuses_connections(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    fetcher = AsyncHttpFetcher(max_connections=2, host_settings=NO_HOST_LIMITS)
+
+    results = fetch_all(fetcher, {i: http_server.url("/ok") for i in range(20)})
+
+    assert all(result.error is None for result in results.values())
+    assert http_server.requests == 20
+    assert http_server.connections <= 2
+
+
+def test_asynchttpfetcher_keeps_downloads_in_flight(http_server):
+    http_server.pages["/slow"] = (200, ARTICLE_HTML)
+    http_server.delay = 0.2
+    fetcher = AsyncHttpFetcher(max_connections=50, host_settings=NO_HOST_LIMITS)
+
+    started = time.perf_counter()
+    results = fetch_all(fetcher, {i: http_server.url("/slow") for i in range(50)})
+
+    assert len(results) == 50
+    # one after the other, 50 requests would take 10 seconds
+    assert time.perf_counter() - started < 5
+
+
+def test_asynchttpfetcher_fetch(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+
+    content = AsyncHttpFetcher().fetch(http_server.url("/ok"))
+
+    assert "Reusing connections saves a handshake" in content
+
+
+def test_asynchttpfetcher_http2_needs_h2(monkeypatch):
+    monkeypatch.setattr("src.bookmarker.core.fetchers.find_spec", lambda name: None)
+
+    assert AsyncHttpFetcher().http2 is False
+    assert AsyncHttpFetcher(http2=True).http2 is True
+
+
+def test_asynchttpfetcher_max_connections_must_be_positive():
+    with pytest.raises(ValueError, match="at least 1"):
+        AsyncHttpFetcher(max_connections=0)
+
+
+def test_asynchttpfetcher_parses_in_process_pool(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.pages["/empty"] = (200, "<html><body></body></html>")
+
+    with ProcessPoolExecutor(2, mp_context=get_context("spawn")) as executor:
+        fetcher = AsyncHttpFetcher(parse_executor=executor, parse_workers=2)
+        results = fetch_all(
+            fetcher, {1: http_server.url("/ok"), 2: http_server.url("/empty")}
+        )
+
+    assert "Reusing connections saves a handshake" in results[1].content
+    assert "Failed to parse content from URL" in str(results[2].error)
+
+
+def test_asynchttpfetcher_backpressure(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    fetcher = AsyncHttpFetcher(
+        max_connections=2,
+        parse_workers=1,
+        queue_size=1,
+        host_settings=NO_HOST_LIMITS,
+    )
+
+    async def main():
+        results = fetcher.fetch_many({i: http_server.url("/ok") for i in range(30)})
+        await anext(results)
+        # a stalled consumer stops the downloads once the queues are full
+        await asyncio.sleep(0.5)
+        requests_while_stalled = http_server.requests
+        remaining = [result async for result in results]
+        return requests_while_stalled, len(remaining)
+
+    requests_while_stalled, remaining = asyncio.run(main())
+
+    assert requests_while_stalled < 10
+    assert remaining == 29
+
+
+def get_page(fetcher, url, validators=None):
+    async def main():
+        async with fetcher._client() as client:
+            return await fetcher.get_page_async(client, url, validators)
+
+    return asyncio.run(main())
+
+
+def test_asynchttpfetcher_get_page_not_modified(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.page_headers["/ok"] = {
+        "ETag": '"v1"',
+        "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    fetcher = AsyncHttpFetcher()
+
+    first = get_page(fetcher, http_server.url("/ok"))
+    second = get_page(fetcher, http_server.url("/ok"), first.validators)
+
+    assert first.content == ARTICLE_HTML
+    assert first.validators.etag == '"v1"'
+    assert first.validators.page_hash is not None
+    assert second.unchanged
+    assert second.validators == first.validators
+    assert http_server.request_headers[1]["If-None-Match"] == '"v1"'
+    assert (
+        http_server.request_headers[1]["If-Modified-Since"]
+        == "Wed, 01 Jan 2025 00:00:00 GMT"
+    )
+
+
+def test_asynchttpfetcher_sends_trafilatura_user_agent(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+
+    get_page(AsyncHttpFetcher(), http_server.url("/ok"))
+
+    assert http_server.request_headers[0]["User-Agent"] == USER_AGENT
+
+
+def test_asynchttpfetcher_decodes_meta_charset():
+    html = '<html><head><meta charset="windows-1252"></head><p>Café – naïve</p>'
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(
+            200,
+            content=html.encode("cp1252"),
+            headers={"Content-Type": "text/html"},
+        )
+    )
+    fetcher = AsyncHttpFetcher(transport=transport)
+
+    page = get_page(fetcher, "https://example.com/")
+
+    assert page.content == html
+
+
+@pytest.mark.parametrize(
+    "data, declared, expected",
+    [
+        ("Café".encode(), "iso-8859-1", "Café"),
+        ("Café".encode("latin-1"), "iso-8859-1", "Café"),
+        (
+            '<meta charset="koi8-r">Мир'.encode("koi8-r"),
+            None,
+            '<meta charset="koi8-r">Мир',
+        ),
+        (
+            '<meta charset="koi8-r">Мир'.encode("koi8-r"),
+            "bogus",
+            '<meta charset="koi8-r">Мир',
+        ),
+    ],
+)
+def test_decode_page(data, declared, expected):
+    assert decode_page(data, declared) == expected
+
+
+def test_asynchttpfetcher_get_page_unchanged_hash(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    fetcher = AsyncHttpFetcher()
+
+    first = get_page(fetcher, http_server.url("/ok"))
+    second = get_page(fetcher, http_server.url("/ok"), first.validators)
+    http_server.pages["/ok"] = (200, ARTICLE_HTML.replace("Pooling", "Pools"))
+    third = get_page(fetcher, http_server.url("/ok"), first.validators)
+
+    assert first.validators == PageValidators(page_hash=first.validators.page_hash)
+    assert second.unchanged
+    assert not third.unchanged
+    assert third.validators.page_hash != first.validators.page_hash
+
+
+def test_asynchttpfetcher_fetch_many_skips_unchanged_pages(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.page_headers["/ok"] = {"ETag": '"v1"'}
+    fetcher = AsyncHttpFetcher(host_settings=NO_HOST_LIMITS)
+    urls = {1: http_server.url("/ok"), 2: http_server.url("/ok")}
+
+    results = fetch_all(fetcher, urls, {1: PageValidators(etag='"v1"')})
+
+    assert results[1].unchanged and results[1].content is None
+    assert results[2].validators.etag == '"v1"'
+    assert "Reusing connections saves a handshake" in results[2].content
+
+
+def test_asynchttpfetcher_fetch_page(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.page_headers["/ok"] = {"ETag": '"v1"'}
+    fetcher = AsyncHttpFetcher()
+
+    page = fetcher.fetch_page(http_server.url("/ok"))
+    unchanged = fetcher.fetch_page(http_server.url("/ok"), page.validators)
+
+    assert "Reusing connections saves a handshake" in page.content
+    assert unchanged.unchanged
@@ -0,0 +1,52 @@
+import pytest
+
+from src.bookmarker.core.fuzzy import (
+    edit_distance,
+    extract_terms,
+    max_edit_distance,
+    min_shared_grams,
+    term_grams,
+)
+
+
+def test_extract_terms():
+    terms = extract_terms("Tuning Postgres 16: the VACUUM guide", None, "postgres, io")
+
+    assert terms == ["tuning", "postgres", "vacuum", "guide"]
+
+
+def test_term_grams():
+    assert term_grams("vacuum") == {"^va", "vac", "acu", "cuu", "uum", "um$"}
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ("postgres", "postgres", 0),
+        ("postgress", "postgres", 1),
+        ("kubernets", "kubernetes", 1),
+        ("kuberentes", "kubernetes", 1),
+        ("pyhton", "python", 1),
+        ("databsaes", "databases", 1),
+        ("postgres", "progress", 3),
+        ("go", "rust", 3),
+    ],
+)
+def test_edit_distance(a, b, expected):
+    assert edit_distance(a, b, limit=2) == min(expected, 3)
+
+
+@pytest.mark.parametrize("term, expected", [("api", 0), ("pyton", 1), ("kubernets", 2)])
+def test_max_edit_distance(term, expected):
+    assert max_edit_distance(term) == expected
+
+
+@pytest.mark.parametrize(
+    "word, typo",
+    [("kubernetes", "kuberentes"), ("python", "pyhton"), ("postgres", "postgress")],
+)
+def test_min_shared_grams_keeps_close_words(word, typo):
+    distance = edit_distance(word, typo, limit=2)
+    shared = len(term_grams(word) & term_grams(typo))
+
+    assert shared >= min_shared_grams(typo, distance)
@@ -0,0 +1,63 @@
+import os
+
+import pytest
+
+from src.bookmarker.core.content import content_hash
+from src.bookmarker.core.html_cache import HtmlCache, get_html_cache
+
+PAGE = "<html><body>" + "<p>Cached page body.</p>" * 200 + "</body></html>"
+
+
+def make_page(i):
+    # random hex compresses to about 2.3 kB, so three pages overflow 6 kB
+    return f"<html><body>{os.urandom(2000).hex()}</body></html><!-- {i} -->"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HtmlCache(tmp_path / "cache", max_bytes=1024 * 1024)
+
+
+def test_html_cache_round_trip(cache):
+    page_hash = cache.put(PAGE)
+
+    assert page_hash == content_hash(PAGE)
+    assert page_hash in cache
+    assert cache.get(page_hash) == PAGE
+    assert cache.get("0" * 64) is None
+
+
+def test_html_cache_is_content_addressed_and_compressed(cache):
+    cache.put(PAGE)
+    cache.put(PAGE)
+
+    files = [path for path in cache.directory.rglob("*") if path.is_file()]
+    assert len(files) == 1
+    assert files[0].parent.name == content_hash(PAGE)[:2]
+    assert files[0].stat().st_size < len(PAGE)
+
+
+def test_html_cache_evicts_least_recently_used(tmp_path):
+    cache = HtmlCache(tmp_path / "cache", max_bytes=6_000)
+    first, second = cache.put(make_page(1)), cache.put(make_page(2))
+    # reading the first page makes the second the least recently used
+    os.utime(cache._find(second)[0], (0, 0))
+    cache.get(first)
+
+    third = cache.put(make_page(3))
+
+    assert second not in cache
+    assert first in cache
+    assert third in cache
+
+
+def test_html_cache_size_must_be_positive(tmp_path):
+    with pytest.raises(ValueError, match="at least 1"):
+        HtmlCache(tmp_path, max_bytes=0)
+
+
+def test_get_html_cache_from_settings(html_cache_dir, monkeypatch):
+    assert get_html_cache().directory == html_cache_dir
+
+    monkeypatch.setenv("HTML_CACHE_SIZE_MB", "0")
+    assert get_html_cache() is None
@@ -0,0 +1,129 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+
+from src.bookmarker.core.exceptions import InvalidImportError
+from src.bookmarker.core.importers import (
+    ImportFormat,
+    ImportRecord,
+    detect_format,
+    iter_import_records,
+    make_record,
+    parse_csv,
+    parse_html,
+    parse_jsonl,
+    parse_timestamp,
+)
+
+BOOKMARKS_HTML = """<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">
+<TITLE>Bookmarks</TITLE>
+<H1>Bookmarks</H1>
+<DL><p>
+    <DT><H3 ADD_DATE="1600000000">Reading</H3>
+    <DL><p>
+        <DT><A HREF="https://example.com/a" ADD_DATE="1600000000" TAGS="Python,Data Eng">Article &amp; A</A>
+        <DT><A HREF="https://example.com/b">Article B</A>
+        <DT><A HREF="">Empty</A>
+    </DL><p>
+</DL><p>
+"""
+
+
+def test_parse_html():
+    records = list(parse_html(io.StringIO(BOOKMARKS_HTML)))
+
+    assert records == [
+        ImportRecord(
+            title="Article & A",
+            url="https://example.com/a",
+            tags=("python", "data-eng"),
+            created_at=datetime(2020, 9, 13, 12, 26, 40, tzinfo=timezone.utc),
+        ),
+        ImportRecord(title="Article B", url="https://example.com/b"),
+    ]
+
+
+def test_parse_html_streams_in_chunks(monkeypatch):
+    monkeypatch.setattr("src.bookmarker.core.importers.HTML_CHUNK_SIZE", 16)
+
+    records = list(parse_html(io.StringIO(BOOKMARKS_HTML)))
+
+    assert [r.title for r in records] == ["Article & A", "Article B"]
+
+
+def test_parse_csv_pocket_export():
+    file = io.StringIO(
+        "title,url,time_added,tags,status\n"
+        "Article A,https://example.com/a,1600000000,python|ai,unread\n"
+        ",https://example.com/b,,,archive\n"
+        "No URL,,,,unread\n"
+    )
+
+    records = list(parse_csv(file))
+
+    assert records[0].tags == ("python", "ai")
+    assert records[0].created_at.year == 2020
+    assert records[1].title == "https://example.com/b"
+    assert len(records) == 2
+
+
+def test_parse_csv_requires_url_column():
+    with pytest.raises(InvalidImportError):
+        list(parse_csv(io.StringIO("title,link\nA,https://example.com\n")))
+
+
+def test_parse_jsonl():
+    file = io.StringIO(
+        '{"url": "https://example.com/a", "title": "A", "tags": ["x", "y"],'
+        ' "notes": "Read later", "created_at": "2024-01-02T03:04:05"}\n'
+        "\n"
+        "not json\n"
+        '["https://example.com/list"]\n'
+        '{"url": "https://example.com/b", "tags": "x, z"}\n'
+    )
+
+    records = list(parse_jsonl(file))
+
+    assert [r.url for r in records] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert records[0].tags == ("x", "y")
+    assert records[0].notes == "Read later"
+    assert records[0].created_at == datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert records[1].tags == ("x", "z")
+
+
+def test_make_record_limits_lengths():
+    record = make_record(
+        "https://example.com", title="t" * 300, tags=["a" * 30, "A" * 30, " "]
+    )
+
+    assert len(record.title) == 200
+    assert record.tags == ("a" * 20,)
+
+
+@pytest.mark.parametrize("value", [None, "", "yesterday"])
+def test_parse_timestamp_invalid(value):
+    assert parse_timestamp(value) is None
+
+
+def test_detect_format(tmp_path):
+    assert detect_format(tmp_path / "bookmarks.HTML") == ImportFormat.HTML
+    assert detect_format(tmp_path / "pocket.csv") == ImportFormat.CSV
+    assert detect_format(tmp_path / "export.ndjson") == ImportFormat.JSONL
+    with pytest.raises(InvalidImportError):
+        detect_format(tmp_path / "export.txt")
+
+
+def test_iter_import_records(tmp_path):
+    path = tmp_path / "export.txt"
+    path.write_text('﻿{"url": "https://example.com/a"}\n', encoding="utf-8")
+
+    records = list(iter_import_records(path, ImportFormat.JSONL))
+
+    assert records == [
+        ImportRecord(title="https://example.com/a", url="https://example.com/a")
+    ]
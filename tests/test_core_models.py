@@ -62,7 +62,7 @@ def test_create_artifact_model(add_article):
     assert artifact.artifact_type == ArtifactTypeEnum.ARTICLE
     assert artifact.notes == "This seems interesting"
     assert len(artifact.tags) == 2
-    assert artifact.content_raw is None
+    assert artifact.content_hash is None
     assert artifact.content_summary is None
     assert artifact.created_at is not None
     assert artifact.updated_at is None
@@ -129,5 +129,5 @@ def test_artifact_with_optional_fields_none(session):
     save_to_db(artifact, session)
 
     assert artifact.notes is None
-    assert artifact.content_raw is None
+    assert artifact.content_hash is None
     assert artifact.content_summary is None
@@ -0,0 +1,45 @@
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from src.bookmarker.core.exceptions import InvalidCursorError
+from src.bookmarker.core.pagination import (
+    SortKey,
+    cursor_for,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+@pytest.mark.parametrize(
+    "sort, value",
+    [
+        (SortKey.ID, 7),
+        (SortKey.TITLE_DESC, "Some title"),
+        (SortKey.CREATED, datetime(2025, 9, 22, 8, 12, 26, 254864)),
+        (SortKey.RANK, -3.25),
+    ],
+)
+def test_cursor_roundtrip(sort, value):
+    cursor = encode_cursor(sort, value, 7)
+
+    assert decode_cursor(sort, cursor) == (value, 7)
+
+
+@pytest.mark.parametrize("cursor", ["", "garbage", encode_cursor(SortKey.ID, 1, 1)])
+def test_decode_cursor_invalid(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(SortKey.TITLE, cursor)
+
+
+def test_sort_key_properties():
+    assert SortKey.CREATED_DESC.descending is True
+    assert SortKey.CREATED_DESC.field == "created_at"
+    assert SortKey.TITLE.descending is False
+
+
+def test_cursor_for_search_hit_without_rank():
+    hit = Mock(artifact=Mock(id=4), rank=None)
+
+    assert decode_cursor(SortKey.RANK, cursor_for(SortKey.RANK, hit)) == (4, 4)
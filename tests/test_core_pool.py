@@ -0,0 +1,65 @@
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import exc
+
+from src.bookmarker.core.pool import InstrumentedQueuePool, PoolStats
+
+
+@pytest.fixture
+def pool():
+    return InstrumentedQueuePool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        pool_size=1,
+        max_overflow=0,
+        timeout=0.1,
+    )
+
+
+def test_pool_stats_record_checkouts(pool):
+    for _ in range(3):
+        pool.connect().close()
+
+    stats = pool.stats.snapshot()
+    assert stats.checkouts == 3
+    assert stats.timeouts == 0
+    assert stats.max_wait >= stats.mean_wait >= 0
+
+
+def test_pool_stats_record_timeouts(pool):
+    held = pool.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    stats = pool.stats.snapshot()
+    assert stats.checkouts == 1
+    assert stats.timeouts == 1
+    assert stats.max_wait >= 0.1
+    held.close()
+
+
+def test_pool_stats_record_wait_for_released_connection(pool):
+    held = pool.connect()
+    timer = threading.Timer(0.05, held.close)
+    timer.start()
+
+    pool.connect().close()
+    timer.join()
+
+    stats = pool.stats.snapshot()
+    assert stats.checkouts == 2
+    assert stats.max_wait >= 0.05
+
+
+def test_pool_stats_survive_recreate(pool):
+    pool.connect().close()
+
+    recreated = pool.recreate()
+
+    assert recreated.stats is pool.stats
+
+
+def test_pool_stats_mean_wait_empty():
+    assert PoolStats().mean_wait == 0.0
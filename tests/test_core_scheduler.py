@@ -0,0 +1,102 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.bookmarker.core.config import HostSettings
+from src.bookmarker.core.fetchers import AsyncHttpFetcher
+from src.bookmarker.core.scheduler import HostScheduler, host_of, round_robin
+
+ARTICLE_HTML = (
+    "<html><body><article><h1>Politeness</h1>"
+    + "<p>Spreading requests over hosts keeps every site responsive.</p>" * 5
+    + "</article></body></html>"
+)
+
+
+def test_host_of():
+    assert host_of("https://Example.com:8080/a?b=1") == "example.com:8080"
+
+
+def test_round_robin_interleaves_hosts():
+    urls = {
+        1: "https://a.com/1",
+        2: "https://a.com/2",
+        3: "https://a.com/3",
+        4: "https://b.com/1",
+        5: "https://c.com/1",
+        6: "https://b.com/2",
+    }
+
+    assert [key for key, _ in round_robin(urls)] == [1, 4, 5, 2, 6, 3]
+
+
+def test_scheduler_spaces_requests_to_a_host():
+    scheduler = HostScheduler(HostSettings(max_per_host=5, delay=0.1))
+    started = []
+
+    async def request(url):
+        async with scheduler.slot(None, url):
+            started.append((host_of(url), time.perf_counter()))
+
+    async def main():
+        await asyncio.gather(
+            *(request(f"https://a.com/{i}") for i in range(3)),
+            request("https://b.com/1"),
+        )
+
+    asyncio.run(main())
+
+    a_starts = [at for host, at in started if host == "a.com"]
+    gaps = [later - earlier for earlier, later in zip(a_starts, a_starts[1:])]
+    assert len(gaps) == 2
+    assert all(gap >= 0.09 for gap in gaps)
+    # another host is not held back by the first one's delay
+    assert started[1][0] == "b.com"
+
+
+def test_scheduler_caps_requests_per_host(http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.delay = 0.1
+    fetcher = AsyncHttpFetcher(
+        max_connections=4, host_settings=HostSettings(max_per_host=1, delay=0)
+    )
+    urls = {
+        i: http_server.url("/ok", host="127.0.0.1" if i % 2 else "localhost")
+        for i in range(8)
+    }
+
+    async def main():
+        return [result async for result in fetcher.fetch_many(urls)]
+
+    results = asyncio.run(main())
+
+    assert all(result.error is None for result in results)
+    assert len(http_server.max_active) == 2
+    assert set(http_server.max_active.values()) == {1}
+
+
+@pytest.mark.parametrize(
+    "robots, expected",
+    [((200, "User-agent: *\nCrawl-delay: 2\n"), 2.0), (None, 0.5)],
+)
+def test_scheduler_reads_robots_crawl_delay(http_server, robots, expected):
+    if robots is not None:
+        http_server.pages["/robots.txt"] = robots
+    scheduler = HostScheduler(HostSettings(delay=0.5, respect_robots=True))
+
+    async def main():
+        url = http_server.url("/article")
+        async with httpx.AsyncClient() as client:
+            first = await scheduler.host_delay(client, url)
+            return first, await scheduler.host_delay(client, url)
+
+    assert asyncio.run(main()) == (expected, expected)
+    # cached after the first lookup
+    assert http_server.requests == 1
+
+
+def test_scheduler_max_per_host_must_be_positive():
+    with pytest.raises(ValueError, match="at least 1"):
+        HostScheduler(HostSettings(max_per_host=0))
@@ -0,0 +1,55 @@
+import pytest
+
+from src.bookmarker.core.exceptions import InvalidTagExpressionError
+from src.bookmarker.core.tagexpr import (
+    TagAnd,
+    TagName,
+    TagNot,
+    TagOr,
+    compile_tag_expression,
+    parse_tag_expression,
+)
+
+
+def test_parse_single_tag():
+    assert parse_tag_expression("python") == TagName("python")
+    assert parse_tag_expression("  python  ") == TagName("python")
+
+
+def test_parse_cleans_names():
+    assert parse_tag_expression("Python & Data-Eng") == TagAnd(
+        (TagName("python"), TagName("data-eng"))
+    )
+
+
+def test_parse_precedence():
+    assert parse_tag_expression("python & (perf | db) & !draft") == TagAnd(
+        (
+            TagName("python"),
+            TagOr((TagName("perf"), TagName("db"))),
+            TagNot(TagName("draft")),
+        )
+    )
+    assert parse_tag_expression("a | b & c") == TagOr(
+        (TagName("a"), TagAnd((TagName("b"), TagName("c"))))
+    )
+    assert parse_tag_expression("!!a") == TagNot(TagNot(TagName("a")))
+
+
+@pytest.mark.parametrize(
+    "expression", ["", "   ", "a &", "& a", "(a | b", "a | b)", "a b", "!", "()"]
+)
+def test_parse_invalid(expression):
+    with pytest.raises(InvalidTagExpressionError):
+        parse_tag_expression(expression)
+
+
+def test_compile_uses_set_operations():
+    expression = parse_tag_expression("python & (perf | db) & !draft")
+    query = compile_tag_expression(expression)
+    sql = str(query.compile(compile_kwargs={"literal_binds": True}))
+
+    assert "INTERSECT" in sql
+    assert "UNION" in sql
+    assert "EXCEPT" in sql
+    assert "EXISTS" not in sql
@@ -0,0 +1,39 @@
+import pytest
+
+from src.bookmarker.core.urls import normalize_url
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com/post",
+        "http://example.com/post",
+        "https://Example.COM/post/",
+        "https://example.com:443/post",
+        "https://example.com/post#comments",
+        "https://example.com/post?utm_source=rss&utm_medium=feed",
+        "https://example.com/post?fbclid=abc",
+        "  https://example.com/post  ",
+        "example.com/post",
+    ],
+)
+def test_normalize_url_equivalent(url):
+    assert normalize_url(url) == "example.com/post"
+
+
+def test_normalize_url_keeps_meaningful_parts():
+    assert normalize_url("https://example.com/Post") == "example.com/Post"
+    assert normalize_url("https://example.com:8080/post") == "example.com:8080/post"
+    assert normalize_url("https://www.example.com/post") == "www.example.com/post"
+
+
+def test_normalize_url_sorts_query():
+    assert (
+        normalize_url("https://example.com/watch?v=1&list=2&utm_campaign=x")
+        == "example.com/watch?list=2&v=1"
+    )
+
+
+def test_normalize_url_root():
+    assert normalize_url("https://example.com/") == "example.com"
+    assert normalize_url("https://example.com") == "example.com"
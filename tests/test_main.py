@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+
+# cumulative import time of `python -m bookmarker ...`, in microseconds; generous
+# enough for slow CI machines but far below the cost of the eager import graph
+IMPORT_BUDGET_US = {"--help": 750_000, "show": 1_500_000}
+
+
+@pytest.fixture
+def run_cli(tmp_path):
+    (tmp_path / ".env").write_text(f"DATABASE_URL=sqlite:///{tmp_path / 'test.db'}\n")
+    env = {
+        **os.environ,
+        "BOOKMARKER_ENV": "dev",
+        "BOOKMARKER_SOCKET": str(tmp_path / "no-daemon.sock"),
+        "PYTHONPATH": str(ROOT),
+    }
+
+    def run(*args: str, importtime: bool = False) -> subprocess.CompletedProcess:
+        options = ["-X", "importtime"] if importtime else []
+        result = subprocess.run(
+            [sys.executable, *options, "-m", "src.bookmarker", *args],
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        return result
+
+    return run
+
+
+def parse_importtime(stderr: str) -> tuple[set[str], int]:
+    """Return the imported module names and the total import time in µs."""
+    modules = set()
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            total += int(cumulative)
+    return modules, total
+
+
+def test_help_import_budget(run_cli):
+    modules, total = parse_importtime(run_cli("--help", importtime=True).stderr)
+
+    assert "src.bookmarker.cli.main" in modules
+    assert not {"sqlalchemy", "sqlmodel", "trafilatura", "pydantic_ai"} & modules
+    assert total < IMPORT_BUDGET_US["--help"]
+
+
+def test_show_import_budget(run_cli):
+    run_cli("add", "Test Article", "https://example.com", "--no-auto")
+
+    result = run_cli("show", "1", importtime=True)
+    modules, total = parse_importtime(result.stderr)
+
+    assert "Test Article" in result.stdout
+    assert "sqlmodel" in modules
+    assert not {"trafilatura", "pydantic_ai"} & modules
+    assert total < IMPORT_BUDGET_US["show"]
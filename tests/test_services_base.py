@@ -2,12 +2,15 @@ from unittest.mock import Mock
 
 import pytest
 
+from src.bookmarker.core.models import PageValidators
 from src.bookmarker.services.base import (
+    BufferedContentWriter,
     ContentType,
     Tag,
     get_or_create_artifact,
     store_content,
     update_tags,
+    update_tags_many,
 )
 
 
@@ -42,12 +45,21 @@ def test_add_existing_artifact(db_repo, add_article):
     assert len(db_repo.list()) == 1
 
 
+def test_get_artifact_normalized_url(db_repo, add_article):
+    artifact = get_or_create_artifact(
+        db_repo, title="Mirror", url="http://example.com/?utm_source=feed"
+    )
+
+    assert artifact.id == add_article.id
+    assert len(db_repo.list()) == 1
+
+
 def test_store_content_raw(db_repo, add_article):
     artifact = add_article
     updated_artifact = store_content(db_repo, artifact.id, "#Test header")
 
     assert updated_artifact.id == artifact.id
-    assert updated_artifact.content_raw == "#Test header"
+    assert db_repo.get_content_raw(updated_artifact.id) == "#Test header"
 
 
 def test_store_content_summary(db_repo, add_article):
@@ -81,3 +93,72 @@ def test_update_tags_adds_tags():
     assert called_args[0] == 1
     assert all(isinstance(t, Tag) for t in called_args[1:])
     assert called_kwargs["remove"] is False
+
+
+def test_update_tags_many():
+    mock_repo = Mock()
+    mock_repo.tag_many.return_value = 2
+
+    result = update_tags_many(mock_repo, [1, 2], add=["python"])
+
+    assert result == 2
+    mock_repo.tag_many.assert_called_once_with(
+        [1, 2], term=None, tag_name=None, add=["python"], remove=()
+    )
+
+
+def test_update_tags_many_requires_selection():
+    with pytest.raises(ValueError):
+        update_tags_many(Mock(), add=["python"])
+
+
+def test_buffered_content_writer_batches(db_repo, add_article):
+    mock_repo = Mock(wraps=db_repo)
+
+    with BufferedContentWriter(mock_repo, batch_size=2) as writer:
+        writer.put(add_article.id, "#Test header")
+        mock_repo.store_content_raw_many.assert_not_called()
+        writer.put(99, "#Missing")
+        mock_repo.store_content_raw_many.assert_called_once()
+        writer.put(98, "#Missing too")
+
+    assert mock_repo.store_content_raw_many.call_count == 2
+    assert writer.stored_ids == [add_article.id]
+    assert writer.missing_ids == [99, 98]
+    assert db_repo.get_content_raw(add_article.id) == "#Test header"
+
+
+def test_buffered_content_writer_failed_batch(db_repo, add_article):
+    mock_repo = Mock(wraps=db_repo)
+    mock_repo.store_content_raw_many.side_effect = ValueError("disk full")
+
+    with BufferedContentWriter(mock_repo, batch_size=2) as writer:
+        writer.put(add_article.id, "#Test header")
+        writer.put(99, "#Missing")
+        writer.put(98, "#Flushed on exit")
+
+    assert list(writer.failed) == [add_article.id, 99, 98]
+    assert writer.stored_ids == []
+    assert writer.missing_ids == []
+
+
+def test_buffered_content_writer_flushes_on_error(db_repo, add_article):
+    with pytest.raises(TimeoutError):
+        with BufferedContentWriter(db_repo, content_type=ContentType.SUMMARY) as writer:
+            writer.put(add_article.id, "Test summary")
+            raise TimeoutError
+
+    assert db_repo.get(add_article.id).content_summary == "Test summary"
+
+
+def test_buffered_content_writer_summary_rejects_validators(db_repo, add_article):
+    with BufferedContentWriter(db_repo, content_type=ContentType.SUMMARY) as writer:
+        with pytest.raises(ValueError):
+            writer.put(add_article.id, "Test summary", PageValidators(etag='"v1"'))
+
+    assert writer.failed == {}
+
+
+def test_buffered_content_writer_bad_type(db_repo):
+    with pytest.raises(ValueError):
+        BufferedContentWriter(db_repo, content_type="bad type")  # ty: ignore[invalid-argument-type]
@@ -1,8 +1,14 @@
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, create_autospec, patch
 
 import pytest
 
 import src.bookmarker.services.fetchers as core
+from src.bookmarker.core.config import HostSettings
+from src.bookmarker.core.exceptions import HtmlCacheDisabledError
+from src.bookmarker.core.html_cache import get_html_cache
 from src.bookmarker.core.models import ArtifactTypeEnum
 from src.bookmarker.services.base import get_or_create_artifact
 from src.bookmarker.services.fetchers import (
@@ -11,8 +17,10 @@ from src.bookmarker.services.fetchers import (
     ContentFetchError,
     ContentType,
     fetch_and_store_content,
-    fetch_and_store_content_many,
+    fetch_and_store_content_pooled,
     fetch_content,
+    reparse_and_store_content_many,
+    stored_validators,
 )
 
 
@@ -74,70 +82,331 @@ def test_fetch_and_store_content(mock_fetch_content, mock_store_content, db_repo
     assert result is mock_artifact
 
 
-@patch("src.bookmarker.services.fetchers.fetch_and_store_content")
-def test_fetch_and_store_content_many(mock_fetch_store, db_repo):
-    results = fetch_and_store_content_many([1, 2, 3], repo=db_repo, max_workers=2)
+@pytest.fixture
+def add_many_videos(db_repo, monkeypatch):
+    monkeypatch.setattr(core, "get_host_settings", lambda: HostSettings(delay=0))
+    return [
+        get_or_create_artifact(
+            db_repo,
+            title=f"Test Video {i}",
+            url=f"https://youtube.com/watch?v={i}",
+            artifact_type=ArtifactTypeEnum.YOUTUBE,
+        )
+        for i in range(1, 4)
+    ]
+
+
+def mock_video_fetcher(monkeypatch, fetch):
+    mock_fetcher = create_autospec(FETCHERS[ArtifactTypeEnum.YOUTUBE], instance=True)
+    mock_fetcher.fetch.side_effect = fetch
+    monkeypatch.setitem(
+        FETCHERS, ArtifactTypeEnum.YOUTUBE, Mock(return_value=mock_fetcher)
+    )
+    return mock_fetcher
+
 
-    assert all(v == "ok" for v in results.values())
-    assert set(results.keys()) == {1, 2, 3}
-    assert mock_fetch_store.call_count == 3
+def test_fetch_and_store_content_pooled_threaded(db_repo, add_many_videos, monkeypatch):
+    mock_fetcher = mock_video_fetcher(monkeypatch, lambda url: f"Content of {url}")
+    mock_repo = Mock(wraps=db_repo)
+    video_ids = [v.id for v in add_many_videos]
 
+    results = fetch_and_store_content_pooled(video_ids, repo=mock_repo, max_workers=2)
 
-def test_fetch_and_store_content_many_not_found(monkeypatch, db_repo):
-    def mock_fetch_store(artifact_id, repo):
-        if artifact_id == 2:
-            raise ArtifactNotFoundError
+    assert results == dict.fromkeys(video_ids, "ok")
+    assert [db_repo.get_content_raw(v.id) for v in add_many_videos] == [
+        f"Content of {v.url}" for v in add_many_videos
+    ]
+    assert mock_fetcher.fetch.call_count == 3
+    mock_repo.store_content_raw_many.assert_called_once()
+    mock_repo.store_content_raw.assert_not_called()
+
+
+def test_fetch_and_store_content_pooled_threaded_respects_host_limit(
+    db_repo, add_many_videos, monkeypatch
+):
+    monkeypatch.setattr(
+        core, "get_host_settings", lambda: HostSettings(max_per_host=1, delay=0)
+    )
+    running = []
+    overlaps = []
+
+    def fetch(url):
+        running.append(url)
+        overlaps.append(len(running))
+        time.sleep(0.05)
+        running.remove(url)
         return None
 
-    monkeypatch.setattr(core, "fetch_and_store_content", mock_fetch_store)
+    mock_video_fetcher(monkeypatch, fetch)
+
+    results = fetch_and_store_content_pooled(
+        [v.id for v in add_many_videos], repo=db_repo, max_workers=3
+    )
 
-    results = fetch_and_store_content_many([1, 2, 3], repo=db_repo)
+    assert set(results.values()) == {"ok"}
+    assert max(overlaps) == 1
 
-    assert results[1] == "ok"
-    assert results[2] == "not_found"
-    assert results[3] == "ok"
 
+@pytest.mark.parametrize(
+    "error, status",
+    [
+        (ContentFetchError, "fetch_error"),
+        (ValueError("Something happened"), "exception: Something happened"),
+    ],
+)
+def test_fetch_and_store_content_pooled_threaded_errors(
+    db_repo, add_many_videos, monkeypatch, error, status
+):
+    first, failing, last = add_many_videos
 
-def test_fetch_and_store_content_many_fetch_error(monkeypatch, db_repo):
-    def mock_fetch_store(artifact_id, repo):
-        if artifact_id == 2:
-            raise ContentFetchError
+    def fetch(url):
+        if url == failing.url:
+            raise error
         return None
 
-    monkeypatch.setattr(core, "fetch_and_store_content", mock_fetch_store)
+    mock_video_fetcher(monkeypatch, fetch)
 
-    results = fetch_and_store_content_many([1, 2, 3], repo=db_repo)
+    results = fetch_and_store_content_pooled(
+        [first.id, failing.id, last.id, 99], repo=db_repo
+    )
+
+    assert results == {
+        first.id: "ok",
+        failing.id: status,
+        last.id: "ok",
+        99: "not_found",
+    }
 
-    assert results[1] == "ok"
-    assert results[2] == "fetch_error"
-    assert results[3] == "ok"
 
+def test_fetch_and_store_content_pooled_threaded_timeout(
+    db_repo, add_many_videos, monkeypatch, caplog
+):
+    fast, slow, _ = add_many_videos
 
-def test_fetch_and_store_content_many_other_exception(monkeypatch, db_repo):
-    def mock_fetch_store(artifact_id, repo):
-        if artifact_id == 2:
-            raise ValueError("Something happened")
+    def fetch(url):
+        if url == slow.url:
+            time.sleep(0.5)
         return None
 
-    monkeypatch.setattr(core, "fetch_and_store_content", mock_fetch_store)
+    mock_video_fetcher(monkeypatch, fetch)
+    monkeypatch.setattr(core, "get_timeout_multithreading", lambda: 0.1)
+
+    results = fetch_and_store_content_pooled([fast.id, slow.id], repo=db_repo)
+
+    assert results == {fast.id: "ok", slow.id: "fetch_error"}
+    assert f"Timeout fetching content for artifact ID {slow.id}" in caplog.text
 
-    results = fetch_and_store_content_many([1, 2, 3], repo=db_repo)
 
-    assert results[1] == "ok"
-    assert results[2].startswith("exception:")
-    assert results[3] == "ok"
+ARTICLE_HTML = (
+    "<html><body><article><h1>Pooled</h1>"
+    + "<p>Downloads share one event loop and a pool of keep-alive connections.</p>" * 5
+    + "</article></body></html>"
+)
+
 
+def test_fetch_and_store_content_pooled(db_repo, http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    ok, missing = (
+        get_or_create_artifact(
+            db_repo, title=f"Article {path}", url=http_server.url(path)
+        )
+        for path in ("/ok", "/missing")
+    )
+
+    results = fetch_and_store_content_pooled(
+        [ok.id, missing.id, 99], repo=db_repo, max_connections=10
+    )
 
-@patch("src.bookmarker.services.fetchers.fetch_and_store_content")
-def test_fetch_and_store_content_many_timeout(
-    mock_fetch_store, monkeypatch, db_repo, caplog
+    assert results == {ok.id: "ok", missing.id: "fetch_error", 99: "not_found"}
+    assert "one event loop" in db_repo.get_content_raw(ok.id)
+    assert db_repo.get_content_raw(missing.id) is None
+
+
+def test_fetch_and_store_content_pooled_batches_writes(db_repo, http_server):
+    artifact_ids = [
+        get_or_create_artifact(
+            db_repo, title=f"Article {i}", url=http_server.url(f"/ok?page={i}")
+        ).id
+        for i in range(3)
+    ]
+    http_server.pages.update({f"/ok?page={i}": (200, ARTICLE_HTML) for i in range(3)})
+    mock_repo = Mock(wraps=db_repo)
+
+    results = fetch_and_store_content_pooled(artifact_ids, repo=mock_repo)
+
+    assert set(results.values()) == {"ok"}
+    mock_repo.store_content_raw_many.assert_called_once()
+
+
+def test_fetch_and_store_content_pooled_mixed_types(db_repo, http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    article = get_or_create_artifact(db_repo, title="Ok", url=http_server.url("/ok"))
+    video = get_or_create_artifact(
+        db_repo,
+        title="Video",
+        url="https://youtube.com/watch?v=1",
+        artifact_type=ArtifactTypeEnum.YOUTUBE,
+    )
+
+    results = fetch_and_store_content_pooled([video.id, article.id], repo=db_repo)
+
+    assert results == {
+        video.id: "exception: YouTube fetcher is not implemented yet. "
+        "Cannot fetch content.",
+        article.id: "ok",
+    }
+
+
+def test_fetch_and_store_content_pooled_timeout(db_repo, http_server, monkeypatch):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.pages["/slow"] = (200, ARTICLE_HTML)
+    fast, slow = (
+        get_or_create_artifact(db_repo, title=path, url=http_server.url(path))
+        for path in ("/ok", "/slow")
+    )
+    monkeypatch.setattr(core, "get_timeout_multithreading", lambda: 0.5)
+    monkeypatch.setattr(
+        core,
+        "get_host_settings",
+        lambda: HostSettings(max_per_host=1, delay=0.3),
+    )
+    http_server.delay = 0.2
+
+    # the second request to the host waits 0.3s for its turn, then takes 0.2s:
+    # within the deadline, as the wait doesn't count
+    results = fetch_and_store_content_pooled([fast.id, slow.id], repo=db_repo)
+    assert results == {fast.id: "ok", slow.id: "ok"}
+
+    http_server.delay = 1
+    results = fetch_and_store_content_pooled([slow.id], repo=db_repo)
+    assert results == {slow.id: "fetch_error"}
+
+
+def test_fetch_and_store_content_pooled_sizes_parse_pool(
+    db_repo, http_server, monkeypatch
 ):
-    mock_as_completed = Mock()
-    mock_as_completed.side_effect = TimeoutError
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    artifact = get_or_create_artifact(db_repo, title="Ok", url=http_server.url("/ok"))
+    mock_pool = Mock(
+        side_effect=lambda workers, mp_context: ThreadPoolExecutor(workers)
+    )
+    monkeypatch.setattr(core, "ProcessPoolExecutor", mock_pool)
+
+    results = fetch_and_store_content_pooled(
+        [artifact.id], repo=db_repo, parse_workers=4
+    )
+
+    assert results == {artifact.id: "ok"}
+    assert mock_pool.call_args.args == (1,)
+
+
+def test_fetch_and_store_content_refetch_unchanged(db_repo, http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.page_headers["/ok"] = {"ETag": '"v1"'}
+    artifact = get_or_create_artifact(db_repo, title="Ok", url=http_server.url("/ok"))
+
+    fetched = fetch_and_store_content(artifact.id, repo=db_repo)
+    refetched = fetch_and_store_content(artifact.id, repo=db_repo)
+
+    assert fetched.http_etag == '"v1"'
+    assert refetched is None
+    assert db_repo.get(artifact.id).updated_at == fetched.updated_at
+    assert http_server.request_headers[1]["If-None-Match"] == '"v1"'
+
+
+def test_fetch_and_store_content_refetch_changed(db_repo, http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    artifact = get_or_create_artifact(db_repo, title="Ok", url=http_server.url("/ok"))
+    fetched = fetch_and_store_content(artifact.id, repo=db_repo)
+    http_server.pages["/ok"] = (200, ARTICLE_HTML.replace("Pooled", "Pipelined"))
+
+    refetched = fetch_and_store_content(artifact.id, repo=db_repo)
+
+    assert refetched.page_hash != fetched.page_hash
+    assert "Pipelined" in db_repo.get_content_raw(artifact.id)
+
+
+def test_fetch_and_store_content_pooled_skips_unchanged(db_repo, http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    http_server.page_headers["/ok"] = {"ETag": '"v1"'}
+    artifact = get_or_create_artifact(db_repo, title="Ok", url=http_server.url("/ok"))
+    fetch_and_store_content_pooled([artifact.id], repo=db_repo)
+    mock_repo = Mock(wraps=db_repo)
+
+    results = fetch_and_store_content_pooled([artifact.id], repo=mock_repo)
+
+    assert results == {artifact.id: "unchanged"}
+    mock_repo.store_content_raw_many.assert_not_called()
+    mock_repo.store_page_validators_many.assert_not_called()
+
+
+@pytest.fixture
+def fetched_article(db_repo, http_server):
+    http_server.pages["/ok"] = (200, ARTICLE_HTML)
+    artifact = get_or_create_artifact(db_repo, title="Ok", url=http_server.url("/ok"))
+    return fetch_and_store_content(artifact.id, repo=db_repo)
+
+
+def test_fetch_caches_downloaded_page(fetched_article):
+    cache = get_html_cache()
+
+    assert cache.get(fetched_article.page_hash) == ARTICLE_HTML
+
+
+def test_reparse_and_store_content_many(db_repo, http_server, fetched_article):
+    original = db_repo.get_content_raw(fetched_article.id)
+    db_repo.store_content_raw(
+        fetched_article.id, "Stale extraction", stored_validators(fetched_article)
+    )
+    other = get_or_create_artifact(db_repo, title="Other", url="https://example.com")
+    requests_before = http_server.requests
+
+    results = reparse_and_store_content_many(
+        [fetched_article.id, other.id, 99], repo=db_repo, parse_workers=2
+    )
+
+    assert results == {
+        fetched_article.id: "ok",
+        other.id: "not_cached",
+        99: "not_found",
+    }
+    assert db_repo.get_content_raw(fetched_article.id) == original
+    assert http_server.requests == requests_before
+
+
+def test_reparse_and_store_content_many_without_parse_workers(db_repo, fetched_article):
+    original = db_repo.get_content_raw(fetched_article.id)
+    db_repo.store_content_raw(
+        fetched_article.id, "Stale extraction", stored_validators(fetched_article)
+    )
+
+    results = reparse_and_store_content_many(repo=db_repo, parse_workers=0)
+
+    assert results == {fetched_article.id: "ok"}
+    assert db_repo.get_content_raw(fetched_article.id) == original
+
+
+def test_reparse_and_store_content_many_unchanged(db_repo, fetched_article):
+    mock_repo = Mock(wraps=db_repo)
+
+    results = reparse_and_store_content_many(repo=mock_repo)
+
+    assert results == {fetched_article.id: "unchanged"}
+    mock_repo.store_content_raw_many.assert_not_called()
+
+
+def test_reparse_and_store_content_many_evicted_page(
+    db_repo, fetched_article, html_cache_dir
+):
+    shutil.rmtree(html_cache_dir)
+
+    results = reparse_and_store_content_many(repo=db_repo)
+
+    assert results == {fetched_article.id: "not_cached"}
 
-    monkeypatch.setattr(core, "as_completed", mock_as_completed)
 
-    with pytest.raises(TimeoutError):
-        fetch_and_store_content_many([1, 2, 3], repo=db_repo)
+def test_reparse_and_store_content_many_cache_disabled(db_repo, monkeypatch):
+    monkeypatch.setenv("HTML_CACHE_SIZE_MB", "0")
 
-    assert "Timeout error" in caplog.text
+    with pytest.raises(HtmlCacheDisabledError):
+        reparse_and_store_content_many(repo=db_repo)
@@ -26,10 +26,9 @@ def add_article(db_repo):
     return artifact
 
 
-def test_summarize_content(db_repo, add_article, monkeypatch):
+def test_summarize_content(db_repo, add_article):
     artifact = add_article
-    artifact.content_raw = "This is article content."
-    monkeypatch.setattr(db_repo, "get", lambda x: artifact)
+    db_repo.store_content_raw(artifact.id, "This is article content.")
 
     mock_summarizer = Mock()
     mock_summarizer.summarize.return_value = "This is a summary."
@@ -51,7 +50,7 @@ def test_summarize_content_summary_exists():
     mock_repo = Mock()
     mock_artifact = Mock(
         id=1,
-        content_raw="This is article content.",
+        content_hash="e3b0c442",
         content_summary="This is a summary.",
     )
     mock_repo.get.return_value = mock_artifact
@@ -93,13 +92,15 @@ def test_summarize_and_store_content(
     assert result is mock_artifact
 
 
-@patch("src.bookmarker.services.summarizers.summarize_and_store_content")
-def test_summarize_and_store_content_many(mock_summarize_store, db_repo):
+@patch("src.bookmarker.services.summarizers.summarize_content")
+def test_summarize_and_store_content_many(mock_summarize, db_repo, add_article):
+    mock_summarize.return_value = "This is a summary."
+
     results = summarize_and_store_content_many([1, 2, 3], repo=db_repo, max_workers=2)
 
-    assert all(v == "ok" for v in results.values())
-    assert set(results.keys()) == {1, 2, 3}
-    assert mock_summarize_store.call_count == 3
+    assert results == {1: "ok", 2: "not_found", 3: "not_found"}
+    assert mock_summarize.call_count == 3
+    assert db_repo.get(1).content_summary == "This is a summary."
 
 
 def test_summarize_and_store_content_many_not_found(monkeypatch, db_repo):
@@ -108,7 +109,7 @@ def test_summarize_and_store_content_many_not_found(monkeypatch, db_repo):
             raise ArtifactNotFoundError
         return None
 
-    monkeypatch.setattr(core, "summarize_and_store_content", mock_summarize_store)
+    monkeypatch.setattr(core, "summarize_content", mock_summarize_store)
 
     results = summarize_and_store_content_many([1, 2, 3], repo=db_repo)
 
@@ -123,7 +124,7 @@ def test_summarize_and_store_content_many_summarize_error(monkeypatch, db_repo):
             raise ContentSummaryError
         return None
 
-    monkeypatch.setattr(core, "summarize_and_store_content", mock_summarize_store)
+    monkeypatch.setattr(core, "summarize_content", mock_summarize_store)
 
     results = summarize_and_store_content_many([1, 2, 3], repo=db_repo)
 
@@ -138,7 +139,7 @@ def test_summarize_and_store_content_many_other_exception(monkeypatch, db_repo):
             raise ValueError("Something happened")
         return None
 
-    monkeypatch.setattr(core, "summarize_and_store_content", mock_summarize_store)
+    monkeypatch.setattr(core, "summarize_content", mock_summarize_store)
 
     results = summarize_and_store_content_many([1, 2, 3], repo=db_repo)
 
@@ -147,7 +148,23 @@ def test_summarize_and_store_content_many_other_exception(monkeypatch, db_repo):
     assert results[3] == "ok"
 
 
-@patch("src.bookmarker.services.summarizers.summarize_and_store_content")
+@patch("src.bookmarker.services.summarizers.summarize_content")
+def test_summarize_and_store_content_many_write_error(
+    mock_summarize, monkeypatch, db_repo, add_article
+):
+    mock_summarize.return_value = "This is a summary."
+
+    def fail_store(contents):
+        raise ValueError("disk full")
+
+    monkeypatch.setattr(db_repo, "store_content_summary_many", fail_store)
+
+    results = summarize_and_store_content_many([1, 2], repo=db_repo)
+
+    assert results == {1: "exception: disk full", 2: "exception: disk full"}
+
+
+@patch("src.bookmarker.services.summarizers.summarize_content")
 def test_summarize_and_store_content_many_timeout(
     mock_summarize_store, monkeypatch, db_repo, caplog
 ):